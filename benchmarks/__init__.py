@@ -0,0 +1,4 @@
+"""
+Micro-benchmarks for the emulators, run with e.g. ``python -m benchmarks.command_index_benchmark``
+from the root of the repository.
+"""
@@ -0,0 +1,78 @@
+"""
+Compares how fast requests are matched to commands of the mercuryitc stream interface by lewis'
+linear scan over the bound commands and by :class:`CommandIndex`.
+
+Also checks that both dispatch every request to the same command.
+"""
+
+import argparse
+from timeit import timeit
+
+from emulator_utils.command_index import CommandIndex
+from lewis_emulators.mercuryitc import SimulatedMercuryitc
+from lewis_emulators.mercuryitc.interfaces.stream_interface import MercuryitcInterface
+
+# A representative IOC poll cycle, with and without the ISOBUS prefix, plus one unknown command
+REQUESTS = [
+    b"READ:SYS:CAT",
+    b"READ:DEV:MB0.T0:TEMP",
+    b"READ:DEV:MB0.T0:TEMP:SIG:TEMP",
+    b"READ:DEV:MB0.T0:TEMP:SIG:RES",
+    b"READ:DEV:MB0.T0:TEMP:LOOP:TSET",
+    b"READ:DEV:MB0.T0:TEMP:LOOP:P",
+    b"READ:DEV:MB0.T0:TEMP:LOOP:I",
+    b"READ:DEV:MB0.T0:TEMP:LOOP:D",
+    b"READ:DEV:MB0.T0:TEMP:LOOP:PIDT",
+    b"READ:DEV:MB0.T0:TEMP:LOOP:HSET",
+    b"READ:DEV:MB0.T0:TEMP:LOOP:FAUT",
+    b"READ:DEV:MB1.H0:HTR:SIG:POWR",
+    b"READ:DEV:MB1.H0:HTR:SIG:VOLT",
+    b"READ:DEV:MB1.H0:HTR:SIG:CURR",
+    b"READ:DEV:DB1.A0:AUX:SIG:PERC",
+    b"READ:DEV:DB5.P0:PRES:SIG:PRES",
+    b"READ:DEV:DB8.L0:LVL:SIG:HEL:LEV",
+    b"@1READ:DEV:DB8.L0:LVL:SIG:NIT:LEV",
+    b"@1READ:DEV:MB0.T0:TEMP:CAL:FILE",
+    b"SET:DEV:MB0.T0:TEMP:LOOP:TSET:1.5K",
+    b"SET:DEV:MB0.T0:TEMP:LOOP:P:10.0",
+    b"@1SET:DEV:MB0.T0:TEMP:LOOP:ENAB:ON",
+    b"READ:DEV:MB0.T0:TEMP:UNKNOWN",
+]
+
+
+def linear_match(commands, request):
+    return next((command for command in commands if command.can_process(request)), None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--repeats", type=int, default=2000, help="Passes over all requests.")
+    arguments = parser.parse_args()
+
+    interface = MercuryitcInterface()
+    interface.device = SimulatedMercuryitc()
+    index = interface.bound_commands[0]
+    commands = index.commands
+    rebuilt = CommandIndex(commands)
+
+    for request in REQUESTS:
+        linear = linear_match(commands, request)
+        indexed = rebuilt.find(request)
+        assert (indexed and indexed[0]) is linear, "Dispatch differs for {}".format(request)
+
+    linear_time = timeit(
+        lambda: [linear_match(commands, request) for request in REQUESTS], number=arguments.repeats
+    )
+    indexed_time = timeit(
+        lambda: [index.can_process(request) for request in REQUESTS], number=arguments.repeats
+    )
+
+    matches = arguments.repeats * len(REQUESTS)
+    print("{} commands, {} requests per pass".format(len(commands), len(REQUESTS)))
+    print("linear scan:   {:>10.0f} matches/s".format(matches / linear_time))
+    print("command index: {:>10.0f} matches/s".format(matches / indexed_time))
+    print("speed-up:      {:>10.1f}x".format(linear_time / indexed_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+Measures how many requests per second an emulator sustains and how long they take.
+
+The chosen devices are started in this process by a
+:class:`~emulator_utils.device_host.DeviceHost`, one after another. Each one is sent a
+canned mix of representative IOC requests over TCP from a number of concurrent clients. Every
+client sends a request and waits for the complete reply before sending the next one, as an IOC
+does. The requests per second, reply latency percentiles and the jitter of the simulation cycles
+are printed and, with ``--output``, written as JSON so that results of different commits can be
+compared, e.g.::
+
+    python -m benchmarks.emulator_throughput -c 4 -d 5 -o before.json
+    python -m benchmarks.emulator_throughput eurotherm_modbus fins -c 4 -d 5 -o after.json
+"""
+
+import argparse
+import json
+import platform
+import socket
+import struct
+import subprocess
+import threading
+import time
+from typing import Callable, NamedTuple
+
+from lewis.core.devices import DeviceRegistry
+
+from emulator_utils.checksums import crc16
+from emulator_utils.device_host import DeviceHost, create_simulation
+
+
+class Exchange(NamedTuple):
+    """
+    A request and a test for whether the reply to it has been received completely.
+    """
+
+    request: bytes
+    reply_complete: Callable[[bytes], bool]
+
+
+def terminated(terminator: bytes) -> Callable[[bytes], bool]:
+    return lambda reply: reply.endswith(terminator)
+
+
+def fixed_length(length: int) -> Callable[[bytes], bool]:
+    return lambda reply: len(reply) >= length
+
+
+def length_prefixed(offset: int, size: int, byteorder: str, extra: int) -> Callable[[bytes], bool]:
+    """
+    :param offset: where the length field starts in the reply
+    :param size: the number of bytes of the length field
+    :param byteorder: the byte order of the length field
+    :param extra: the number of bytes of the reply that the length does not count
+    """
+
+    def reply_complete(reply: bytes) -> bool:
+        if len(reply) < offset + size:
+            return False
+        return len(reply) >= extra + int.from_bytes(reply[offset : offset + size], byteorder)
+
+    return reply_complete
+
+
+def bisync_reply_complete(reply: bytes) -> bool:
+    # A eurotherm read reply ends with ETX and a checksum character
+    end = reply.find(b"\x03")
+    return end != -1 and len(reply) >= end + 2
+
+
+def eurotherm_bisync(mnemonic: bytes) -> Exchange:
+    return Exchange(b"\x040011" + mnemonic + b"\x05", bisync_reply_complete)
+
+
+def modbus_rtu_read(address: int, registers: int) -> Exchange:
+    request = struct.pack(">BBHH", 1, 3, address, registers)
+    return Exchange(request + crc16(request), fixed_length(5 + 2 * registers))
+
+
+def modbus_tcp_read(address: int, words: int) -> Exchange:
+    request = struct.pack(">HHHBBHH", 1, 0, 6, 1, 3, address, words)
+    return Exchange(request, length_prefixed(4, 2, "big", 6))
+
+
+def fins_read(address: int, words: int) -> Exchange:
+    request = bytes((0x80, 0x00, 0x02, 0x00, 58, 0x00, 0x00, 0x01, 0x00, 0x07))
+    request += b"\x01\x01\x82" + struct.pack(">HBH", address, 0, words)
+    return Exchange(request, fixed_length(14 + 2 * words))
+
+
+def anc350_get(address: int, axis: int) -> Exchange:
+    # length, opcode (get), address, index (axis), correlation number
+    request = struct.pack("<5i", 16, 1, address, axis, 7)
+    return Exchange(request, length_prefixed(0, 4, "little", 4))
+
+
+def mercury(command: bytes) -> Exchange:
+    return Exchange(command + b"\n", terminated(b"\n"))
+
+
+# The device to load, the protocol to serve and the requests to send, for every benchmark
+BENCHMARKS = {
+    "eurotherm": (
+        "eurotherm",
+        "stream",
+        [eurotherm_bisync(mnemonic) for mnemonic in (b"PV", b"SL", b"SP", b"OP", b"XP", b"TI")],
+    ),
+    "eurotherm_modbus": (
+        "eurotherm",
+        "eurotherm_modbus",
+        [
+            modbus_rtu_read(1, 1),
+            modbus_rtu_read(2, 1),
+            modbus_rtu_read(1, 3),
+            modbus_rtu_read(6, 4),
+            modbus_rtu_read(1025, 1),
+        ],
+    ),
+    "mercuryitc": (
+        "mercuryitc",
+        None,
+        [
+            mercury(b"READ:DEV:MB0.T0:TEMP:SIG:TEMP"),
+            mercury(b"READ:DEV:MB0.T0:TEMP:LOOP:TSET"),
+            mercury(b"READ:DEV:MB0.T0:TEMP:LOOP:P"),
+            mercury(b"READ:DEV:MB1.H0:HTR:SIG:POWR"),
+            mercury(b"READ:DEV:DB5.P0:PRES:SIG:PRES"),
+            mercury(b"@1READ:DEV:DB8.L0:LVL:SIG:NIT:LEV"),
+        ],
+    ),
+    "fins": (
+        "fins",
+        None,
+        [fins_read(19500, 1), fins_read(19704, 2), fins_read(19876, 2), fins_read(19500, 497)],
+    ),
+    "tpg300": (
+        "tpgx00",
+        "tpg300",
+        [
+            Exchange(b"PA1\r\n", terminated(b"\r\n")),
+            Exchange(b"\x05", terminated(b"\r\n")),
+            Exchange(b"UNI\r\n", terminated(b"\r\n")),
+            Exchange(b"\x05", terminated(b"\r\n")),
+        ],
+    ),
+    "attocube_anc350": (
+        "attocube_anc350",
+        None,
+        [anc350_get(0x0415, 0), anc350_get(0x0404, 0), anc350_get(0x0400, 1)],
+    ),
+    "skf_chopper": (
+        "skf_chopper",
+        None,
+        [modbus_tcp_read(353, 2), modbus_tcp_read(345, 2), modbus_tcp_read(905, 20)],
+    ),
+}
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+class Client(threading.Thread):
+    """
+    Replays the requests of a benchmark one after another over its own connection.
+    """
+
+    def __init__(self, port: int, exchanges: list[Exchange], timeout: float) -> None:
+        super().__init__(daemon=True)
+        self.latencies = []
+        self.failures = 0
+        self.running = True
+        self.measuring = False
+        self._connection = socket.create_connection(("127.0.0.1", port), timeout=timeout)
+        self._connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._exchanges = exchanges
+
+    def run(self) -> None:
+        position = 0
+        with self._connection:
+            while self.running:
+                exchange = self._exchanges[position]
+                position = (position + 1) % len(self._exchanges)
+
+                start = time.perf_counter()
+                try:
+                    self._connection.sendall(exchange.request)
+                    reply = b""
+                    while not exchange.reply_complete(reply):
+                        received = self._connection.recv(65536)
+                        if not received:
+                            raise ConnectionError("The emulator closed the connection")
+                        reply += received
+                except OSError:
+                    self.failures += 1
+                    return
+                if self.measuring:
+                    self.latencies.append(time.perf_counter() - start)
+
+
+def connect(port: int, exchanges: list[Exchange], timeout: float) -> Client:
+    deadline = time.monotonic() + 10.0
+    while True:
+        try:
+            return Client(port, exchanges, timeout)
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def run_benchmark(
+    registry: DeviceRegistry, name: str, arguments: argparse.Namespace
+) -> dict[str, object]:
+    device, protocol, exchanges = BENCHMARKS[name]
+    port = free_port()
+    simulation = create_simulation(
+        registry,
+        {
+            "name": name,
+            "device": device,
+            "protocols": {protocol: {"bind_address": "127.0.0.1", "port": port}},
+            "cycle_delay": arguments.cycle_delay,
+        },
+    )
+    host = DeviceHost([simulation], io_timeout=arguments.io_timeout)
+    host_thread = threading.Thread(target=host.run, daemon=True)
+    host_thread.start()
+
+    clients = [connect(port, exchanges, arguments.timeout) for _ in range(arguments.concurrency)]
+    try:
+        for client in clients:
+            client.start()
+        time.sleep(arguments.warmup)
+
+        simulation.reset_statistics()
+        for client in clients:
+            client.measuring = True
+        start = time.perf_counter()
+        time.sleep(arguments.duration)
+        for client in clients:
+            client.measuring = False
+        elapsed = time.perf_counter() - start
+        statistics = simulation.statistics
+    finally:
+        for client in clients:
+            client.running = False
+        for client in clients:
+            client.join(arguments.timeout + 1.0)
+        host.stop()
+        host_thread.join()
+
+    latencies = sorted(latency for client in clients for latency in client.latencies)
+    return {
+        "device": device,
+        "protocol": protocol or "default",
+        "requests": len(latencies),
+        "failures": sum(client.failures for client in clients),
+        "requests_per_second": len(latencies) / elapsed,
+        "latency_ms": {
+            "mean": 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+            "p50": 1000 * percentile(latencies, 0.5),
+            "p90": 1000 * percentile(latencies, 0.9),
+            "p99": 1000 * percentile(latencies, 0.99),
+            "max": 1000 * latencies[-1] if latencies else 0.0,
+        },
+        "cycles": statistics["cycles"],
+        "cycle_jitter_ms": statistics["cycle_jitter"],
+        "cycle_time_ms": statistics["cycle_time"],
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        help="Benchmarks to run, all of them if none are given: {}.".format(", ".join(BENCHMARKS)),
+    )
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=1, help="Number of concurrent clients."
+    )
+    parser.add_argument(
+        "-d", "--duration", type=float, default=3.0, help="Seconds to measure each device for."
+    )
+    parser.add_argument(
+        "-w", "--warmup", type=float, default=0.5, help="Seconds to run before measuring."
+    )
+    parser.add_argument(
+        "--cycle-delay", type=float, default=0.1, help="Seconds between simulation cycles."
+    )
+    parser.add_argument(
+        "--io-timeout",
+        type=float,
+        default=0.01,
+        help="Longest time in seconds the host waits for network traffic per iteration.",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=5.0, help="Seconds to wait for a reply before failing."
+    )
+    parser.add_argument("-o", "--output", help="File to write the results to as JSON.")
+    arguments = parser.parse_args()
+    unknown = [name for name in arguments.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error("Unknown benchmarks: {}".format(", ".join(unknown)))
+
+    registry = DeviceRegistry("lewis_emulators")
+    results = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "settings": {
+            "concurrency": arguments.concurrency,
+            "duration": arguments.duration,
+            "warmup": arguments.warmup,
+            "cycle_delay": arguments.cycle_delay,
+            "io_timeout": arguments.io_timeout,
+        },
+        "benchmarks": {},
+    }
+
+    for name in arguments.benchmarks or BENCHMARKS:
+        result = run_benchmark(registry, name, arguments)
+        results["benchmarks"][name] = result
+        print(
+            "{:<17} {:>8.0f} requests/s, latency p50 {:>6.3f} ms, p99 {:>6.3f} ms, "
+            "cycle jitter p99 {:>6.3f} ms{}".format(
+                name,
+                result["requests_per_second"],
+                result["latency_ms"]["p50"],
+                result["latency_ms"]["p99"],
+                result["cycle_jitter_ms"]["p99_ms"],
+                ", {} failed".format(result["failures"]) if result["failures"] else "",
+            )
+        )
+
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
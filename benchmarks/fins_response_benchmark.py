@@ -0,0 +1,94 @@
+"""
+Measures how many responses per second the FINS PLC emulator builds for memory area reads of one
+word, two words and the whole helium recovery memory map, compared with building the same
+responses field by field as the response builder used to.
+"""
+
+import argparse
+import struct
+from timeit import timeit
+
+from lewis.utils.byte_conversions import int_to_raw_bytes
+
+from lewis_emulators.fins.device import SimulatedFinsPLC
+from lewis_emulators.fins.interfaces.response_utilities import FinsResponseBuilder
+from lewis_emulators.fins.interfaces.stream_interface import FinsPLCStreamInterface
+
+# FINS frame header of a command from the IOC to the helium recovery PLC
+HEADER = bytes(
+    (0x80, 0x00, 0x02, 0x00, SimulatedFinsPLC.HELIUM_RECOVERY_NODE, 0x00, 0x00, 0x01, 0x00, 0x07)
+)
+
+# Memory area reads of DM words: (start address, number of words)
+READS = {
+    "1 word": (19500, 1),
+    "2 words": (19704, 2),
+    "bulk (whole map)": (19500, 497),
+}
+
+
+def memory_area_read(memory_start_address, number_of_words):
+    return HEADER + b"\x01\x01\x82" + struct.pack(">HBH", memory_start_address, 0, number_of_words)
+
+
+def field_by_field_response(device, command, memory_start_address, number_of_words):
+    """
+    Builds a memory area read response one field at a time, as the builder did before it packed
+    the header into a preallocated buffer.
+    """
+    response = bytearray()
+    for value in (0xC1, 0x00, 0x02, command[6], command[7], command[8], device.network_address):
+        response += int_to_raw_bytes(value, 1, False)
+    for value in (SimulatedFinsPLC.HELIUM_RECOVERY_NODE, device.unit_address, command[9]):
+        response += int_to_raw_bytes(value, 1, False)
+    response += int_to_raw_bytes(0x0101, 2, False)
+    response += int_to_raw_bytes(0x0000, 2, False)
+    response += device.read_dm_words(memory_start_address, number_of_words)
+    return bytes(response)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--repeats", type=int, default=20000, help="Responses to build.")
+    arguments = parser.parse_args()
+
+    interface = FinsPLCStreamInterface()
+    interface.device = SimulatedFinsPLC()
+    interface.do_log = False
+    builder = FinsResponseBuilder()
+
+    for name, (address, words) in READS.items():
+        command = memory_area_read(address, words)
+        reply = interface.any_command(command)
+        assert reply == field_by_field_response(interface.device, command, address, words)
+        assert reply[14:] == interface.device.read_dm_words(address, words)
+
+        def struct_packed():
+            builder.reset().add_fins_frame_header(
+                interface.device.network_address,
+                interface.device.unit_address,
+                command[6],
+                command[7],
+                command[8],
+                command[9],
+            ).add_fins_command_and_error_codes().add_bytes(
+                interface.device.read_dm_words(address, words)
+            ).build()
+
+        repeats = arguments.repeats
+        old = repeats / timeit(
+            lambda: field_by_field_response(interface.device, command, address, words),
+            number=repeats,
+        )
+        new = repeats / timeit(struct_packed, number=repeats)
+        full = repeats / timeit(lambda: interface.any_command(command), number=repeats)
+        print(
+            "{:<17} ({:>3} words): field by field {:>8.0f} responses/s, struct packed {:>8.0f} "
+            "responses/s ({:.1f}x), whole command {:>8.0f} commands/s".format(
+                name, words, old, new, new / old, full
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,16 @@
+"""
+Transfers data between a COM port and a TCP port.
+
+Whatever is available on one end is forwarded to the other as one block, as soon as it arrives.
+On POSIX systems both ends are waited on with a selector in a single thread. On Windows, where
+serial ports can not be selected on, each end is read by a thread that blocks until data
+arrives. The bytes per second forwarded in each direction and how long forwarding took are
+reported at a regular interval.
+"""
+
 import argparse
+import os
+import selectors
 import socket
 import sys
 import threading
@@ -6,14 +18,181 @@ import time
 
 import serial
 
+# Most bytes read from the TCP connection at once
+TCP_BLOCK_SIZE = 65536
+
+
+class TransferStatistics:
+    """
+    Counts the bytes forwarded in one direction and how long it took to forward them.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.bytes = 0
+        self.blocks = 0
+        self._lock = threading.Lock()
+        self._interval_bytes = 0
+        self._interval_blocks = 0
+        self._interval_latency = 0.0
+        self._interval_max_latency = 0.0
+
+    def record(self, size: int, latency: float) -> None:
+        """
+        :param size: the number of bytes forwarded
+        :param latency: how long it took to write them to the other end in seconds
+        """
+        with self._lock:
+            self.bytes += size
+            self.blocks += 1
+            self._interval_bytes += size
+            self._interval_blocks += 1
+            self._interval_latency += latency
+            self._interval_max_latency = max(self._interval_max_latency, latency)
+
+    def report(self, elapsed: float) -> str:
+        """
+        Describes the transfers since the last report and starts a new interval.
+
+        :param elapsed: the time since the last report in seconds
+        :return: the description
+        """
+        with self._lock:
+            blocks = self._interval_blocks
+            mean_latency = self._interval_latency / blocks if blocks else 0.0
+            report = (
+                "{}: {:.0f} bytes/s in {} blocks, latency mean {:.3f} ms, max {:.3f} ms".format(
+                    self.name,
+                    self._interval_bytes / elapsed if elapsed > 0 else 0.0,
+                    blocks,
+                    mean_latency * 1000,
+                    self._interval_max_latency * 1000,
+                )
+            )
+            self._interval_bytes = 0
+            self._interval_blocks = 0
+            self._interval_latency = 0.0
+            self._interval_max_latency = 0.0
+        return report
+
+
+class Bridge:
+    """
+    Forwards data between a serial port and a TCP connection until either of them is closed.
+
+    :param serial_conn: the serial port
+    :param tcp_conn: the TCP connection
+    :param verbose: whether to print all data that is forwarded
+    """
+
+    def __init__(
+        self, serial_conn: serial.Serial, tcp_conn: socket.socket, verbose: bool = False
+    ) -> None:
+        self.serial_conn = serial_conn
+        self.tcp_conn = tcp_conn
+        self.verbose = verbose
+        self.serial_to_tcp = TransferStatistics("serial -> tcp")
+        self.tcp_to_serial = TransferStatistics("tcp -> serial")
+        self._closed = threading.Event()
+
+    def forward_serial(self, blocking: bool) -> None:
+        """
+        Forwards everything waiting on the serial port to the TCP connection.
+
+        :param blocking: whether to wait for data if there is none
+        """
+        waiting = self.serial_conn.in_waiting
+        if not waiting and not blocking:
+            return
+        data = self.serial_conn.read(waiting or 1)
+        if blocking:
+            data += self.serial_conn.read(self.serial_conn.in_waiting)
+        if not data:
+            return
+
+        start = time.perf_counter()
+        self.tcp_conn.sendall(data)
+        self.serial_to_tcp.record(len(data), time.perf_counter() - start)
+        if self.verbose:
+            print("Data on serial: " + str(data))
+
+    def forward_tcp(self) -> None:
+        """
+        Forwards a block of data from the TCP connection to the serial port, waiting for it if
+        there is none.
+        """
+        data = self.tcp_conn.recv(TCP_BLOCK_SIZE)
+        if not data:
+            raise ConnectionError("The TCP connection was closed.")
+
+        start = time.perf_counter()
+        self.serial_conn.write(data)
+        self.tcp_to_serial.record(len(data), time.perf_counter() - start)
+        if self.verbose:
+            print("Data on tcp: " + str(data))
 
-def listen_to_tcp(tcp_conn: socket.socket, serial_conn: serial.Serial) -> None:
-    while True:
-        tcp_data = tcp_conn.recv(1024)
-        if len(data) > 0:
-            serial_conn.writelines([tcp_data])
-            print("Data on tcp: " + str(tcp_data))
-        time.sleep(0.001)
+    def print_statistics(self, elapsed: float) -> None:
+        print(self.serial_to_tcp.report(elapsed))
+        print(self.tcp_to_serial.report(elapsed))
+
+    def run(self, stats_interval: float | None) -> None:
+        """
+        Forwards data until either end is closed.
+
+        :param stats_interval: seconds between statistics reports, None not to report them
+        """
+        if os.name == "posix":
+            self._run_selector(stats_interval)
+        else:
+            self._run_threads(stats_interval)
+
+    def _run_selector(self, stats_interval: float | None) -> None:
+        self.serial_conn.timeout = 0
+        with selectors.DefaultSelector() as selector:
+            selector.register(
+                self.serial_conn.fileno(),
+                selectors.EVENT_READ,
+                lambda: self.forward_serial(blocking=False),
+            )
+            selector.register(self.tcp_conn, selectors.EVENT_READ, self.forward_tcp)
+
+            last_report = time.perf_counter()
+            while True:
+                timeout = None
+                if stats_interval is not None:
+                    timeout = max(0.0, last_report + stats_interval - time.perf_counter())
+
+                for key, _ in selector.select(timeout):
+                    key.data()
+
+                now = time.perf_counter()
+                if stats_interval is not None and now - last_report >= stats_interval:
+                    self.print_statistics(now - last_report)
+                    last_report = now
+
+    def _run_threads(self, stats_interval: float | None) -> None:
+        self.serial_conn.timeout = None
+        errors = []
+
+        def forward(forward_block):
+            try:
+                while not self._closed.is_set():
+                    forward_block()
+            except Exception as e:
+                errors.append(e)
+                self._closed.set()
+
+        for forward_block in (lambda: self.forward_serial(blocking=True), self.forward_tcp):
+            threading.Thread(target=forward, args=(forward_block,), daemon=True).start()
+
+        last_report = time.perf_counter()
+        while not self._closed.wait(stats_interval):
+            now = time.perf_counter()
+            self.print_statistics(now - last_report)
+            last_report = now
+
+        if errors:
+            raise errors[0]
 
 
 if __name__ == "__main__":
@@ -23,13 +202,24 @@ if __name__ == "__main__":
     parser.add_argument("tcp_port", help="The port to send TCP messages to. (e.g. 57677)", type=int)
     parser.add_argument("com_port", help="The COM port to send serial messages to. (e.g. COM2)")
     parser.add_argument(
-        "-b", "--baud", help="The baud rate to communicate on the COM port.", default=9600
+        "-b", "--baud", help="The baud rate to communicate on the COM port.", type=int, default=9600
+    )
+    parser.add_argument(
+        "-s",
+        "--stats-interval",
+        help="Seconds between reports of the data rates, 0 not to report them.",
+        type=float,
+        default=10.0,
+    )
+    parser.add_argument(
+        "-v", "--verbose", help="Print all data that is transferred.", action="store_true"
     )
 
     args = parser.parse_args()
 
     try:
         tcp_conn = socket.create_connection(("localhost", args.tcp_port))
+        tcp_conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
     except Exception as e:
         print("Failed to connect to tcp port: " + str(e))
         sys.exit()
@@ -40,23 +230,15 @@ if __name__ == "__main__":
         print("Failed to connect to serial port: " + str(e))
         sys.exit()
 
-    listen_thread = threading.Thread(target=listen_to_tcp, args=(tcp_conn, serial_conn))
-    listen_thread.daemon = True
-    listen_thread.start()
-
     print("Listening on " + str(args.com_port) + " and localhost:" + str(args.tcp_port))
     print("Press Ctrl+C to stop")
 
     try:
-        while True:
-            if serial_conn.in_waiting:
-                data = serial_conn.read()
-                print("Data on serial: " + str(data))
-                tcp_conn.sendall(data)
-
-            time.sleep(0.001)
+        Bridge(serial_conn, tcp_conn, args.verbose).run(args.stats_interval or None)
     except (KeyboardInterrupt, SystemExit):
         pass
+    except (ConnectionError, OSError, serial.SerialException) as e:
+        print("Stopped transferring data: " + str(e))
     finally:
         tcp_conn.close()
         serial_conn.close()
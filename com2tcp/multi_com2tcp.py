@@ -0,0 +1,476 @@
+"""
+Transfers data between any number of serial ports or pseudo-terminals and TCP ports, from one
+process on Linux.
+
+The channels are listed in a file, one per line, as the serial end, the TCP end and optionally
+the baud rate of a serial port::
+
+    # serial end          TCP end             baud
+    pty:/tmp/ttyEUROTHERM localhost:57677
+    pty:/tmp/ttyMERCURY   localhost:57678
+    /dev/ttyS0            localhost:57679     19200
+
+A ``pty:`` serial end creates a pseudo-terminal and links its device to the given path, so a
+serial-only IOC can open that path as if it were a serial port. Any other path is opened as a
+serial port.
+
+All channels are served by one selector loop, which also makes the TCP connections without
+waiting for them. If a TCP connection can not be made or is closed, the channel keeps trying to
+reconnect and drops the serial data that arrives in the meantime. Data is also dropped when more
+than ``MAX_PENDING`` bytes are waiting for one end of a channel to accept them. Bytes/s, blocks,
+forwarding latency and dropped bytes are reported per channel at a regular interval, so that a
+saturated link stands out.
+"""
+
+import argparse
+import errno
+import os
+import pty
+import selectors
+import socket
+import time
+import tty
+
+import serial
+
+from com2tcp import TransferStatistics
+
+# Most bytes read from either end at once
+BLOCK_SIZE = 65536
+
+# Seconds between attempts to connect a channel to its TCP port
+RECONNECT_INTERVAL = 2.0
+
+# Seconds to wait for a connection to the TCP port to be made
+CONNECT_TIMEOUT = 1.0
+
+# Most bytes kept waiting for either end of a channel to become writable
+MAX_PENDING = 1024 * 1024
+
+
+class PtyEnd:
+    """
+    A pseudo-terminal whose device is linked to a path for the IOC to open.
+
+    The bridge keeps the device open itself, so that the pseudo-terminal does not hang up
+    whenever the IOC closes it.
+
+    :param link: the path to link the device of the pseudo-terminal to
+    """
+
+    def __init__(self, link: str) -> None:
+        self.name = link
+        self._fd, self._device_fd = pty.openpty()
+        tty.setraw(self._fd)
+        tty.setraw(self._device_fd)
+        os.set_blocking(self._fd, False)
+
+        if os.path.islink(link):
+            os.remove(link)
+        os.symlink(os.ttyname(self._device_fd), link)
+        self._link = link
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def read(self) -> bytes:
+        try:
+            return os.read(self._fd, BLOCK_SIZE)
+        except BlockingIOError:
+            return b""
+
+    def write(self, data: bytes) -> int:
+        try:
+            return os.write(self._fd, data)
+        except BlockingIOError:
+            return 0
+
+    def close(self) -> None:
+        if os.path.islink(self._link):
+            os.remove(self._link)
+        os.close(self._fd)
+        os.close(self._device_fd)
+
+
+class SerialEnd:
+    """
+    A serial port.
+
+    :param path: the device of the serial port
+    :param baud: the baud rate to communicate at
+    """
+
+    def __init__(self, path: str, baud: int) -> None:
+        self.name = path
+        self._serial = serial.Serial(path, baud, timeout=0, write_timeout=0)
+
+    def fileno(self) -> int:
+        return self._serial.fileno()
+
+    def read(self) -> bytes:
+        return self._serial.read(self._serial.in_waiting or 1)
+
+    def write(self, data: bytes) -> int:
+        try:
+            return self._serial.write(data) or 0
+        except serial.SerialTimeoutException:
+            return 0
+
+    def close(self) -> None:
+        self._serial.close()
+
+
+class Channel:
+    """
+    Forwards data between a serial end and a TCP port.
+
+    :param serial_end: the serial port or pseudo-terminal
+    :param address: host and port of the TCP end
+    """
+
+    def __init__(self, serial_end: PtyEnd | SerialEnd, address: tuple[str, int]) -> None:
+        self.serial_end = serial_end
+        self.address = address
+        self.name = "{} <-> {}:{}".format(serial_end.name, *address)
+        self.tcp_conn = None
+        # The socket whose connection to the TCP port is being made
+        self.connecting = None
+        self.connects = 0
+        self.dropped = 0
+        self.serial_to_tcp = TransferStatistics("serial -> tcp")
+        self.tcp_to_serial = TransferStatistics("tcp -> serial")
+        self.next_connect = 0.0
+        # Data waiting for each end to become writable, with the time it was read
+        self._to_serial = bytearray()
+        self._to_tcp = bytearray()
+        self._to_serial_since = 0.0
+        self._to_tcp_since = 0.0
+
+    def connect(self) -> None:
+        """
+        Starts connecting to the TCP port. The connection is made once the socket in
+        ``connecting`` becomes writable, see :meth:`finish_connect`.
+        """
+        try:
+            family, kind, proto, _, address = socket.getaddrinfo(
+                *self.address, type=socket.SOCK_STREAM
+            )[0]
+            conn = socket.socket(family, kind, proto)
+        except OSError as e:
+            self._connect_failed(str(e))
+            return
+
+        conn.setblocking(False)
+        error = conn.connect_ex(address)
+        if error not in (0, errno.EINPROGRESS):
+            conn.close()
+            self._connect_failed(os.strerror(error))
+            return
+
+        self.connecting = conn
+        self.next_connect = time.monotonic() + CONNECT_TIMEOUT
+
+    def finish_connect(self) -> None:
+        """
+        Completes the connection to the TCP port once the connecting socket is writable.
+        """
+        conn, self.connecting = self.connecting, None
+        error = conn.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if error:
+            conn.close()
+            self._connect_failed(os.strerror(error))
+            return
+
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.tcp_conn = conn
+        self.connects += 1
+        print("{}: connected".format(self.name))
+
+    def abandon_connect(self) -> None:
+        self.connecting.close()
+        self.connecting = None
+        self._connect_failed("timed out")
+
+    def _connect_failed(self, reason: str) -> None:
+        print("{}: could not connect: {}".format(self.name, reason))
+        self.next_connect = time.monotonic() + RECONNECT_INTERVAL
+
+    def disconnect(self, reason: str) -> None:
+        print("{}: disconnected: {}".format(self.name, reason))
+        self.tcp_conn.close()
+        self.tcp_conn = None
+        self.dropped += len(self._to_tcp)
+        self._to_tcp.clear()
+        self.next_connect = time.monotonic() + RECONNECT_INTERVAL
+
+    def wants_to_write_serial(self) -> bool:
+        return bool(self._to_serial)
+
+    def wants_to_write_tcp(self) -> bool:
+        return bool(self._to_tcp)
+
+    def forward_serial(self) -> None:
+        """
+        Forwards the data available on the serial end to the TCP end.
+        """
+        data = self.serial_end.read()
+        if not data:
+            return
+        if self.tcp_conn is None:
+            self.dropped += len(data)
+            return
+
+        if not self._to_tcp:
+            self._to_tcp_since = time.perf_counter()
+        self._queue(self._to_tcp, data)
+        self.flush_tcp()
+
+    def forward_tcp(self) -> None:
+        """
+        Forwards the data available on the TCP end to the serial end.
+        """
+        try:
+            data = self.tcp_conn.recv(BLOCK_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self.disconnect(str(e))
+            return
+        if not data:
+            self.disconnect("closed by the server")
+            return
+
+        if not self._to_serial:
+            self._to_serial_since = time.perf_counter()
+        self._queue(self._to_serial, data)
+        self.flush_serial()
+
+    def _queue(self, pending: bytearray, data: bytes) -> None:
+        """
+        Adds data to the data waiting for an end, dropping what does not fit in ``MAX_PENDING``.
+        """
+        room = MAX_PENDING - len(pending)
+        if len(data) > room:
+            self.dropped += len(data) - room
+            data = data[:room]
+        pending += data
+
+    def flush_tcp(self) -> None:
+        try:
+            sent = self.tcp_conn.send(self._to_tcp)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self.disconnect(str(e))
+            return
+        self._flushed(self._to_tcp, sent, self._to_tcp_since, self.serial_to_tcp)
+        self._to_tcp_since = time.perf_counter()
+
+    def flush_serial(self) -> None:
+        written = self.serial_end.write(self._to_serial)
+        self._flushed(self._to_serial, written, self._to_serial_since, self.tcp_to_serial)
+        self._to_serial_since = time.perf_counter()
+
+    @staticmethod
+    def _flushed(
+        pending: bytearray, written: int, since: float, statistics: TransferStatistics
+    ) -> None:
+        if written:
+            del pending[:written]
+            statistics.record(written, time.perf_counter() - since)
+
+    def report(self, elapsed: float) -> str:
+        state = "connected" if self.tcp_conn is not None else "disconnected"
+        return "{} ({}, {} connects, {} bytes dropped)\n    {}\n    {}".format(
+            self.name,
+            state,
+            self.connects,
+            self.dropped,
+            self.serial_to_tcp.report(elapsed),
+            self.tcp_to_serial.report(elapsed),
+        )
+
+    def close(self) -> None:
+        if self.tcp_conn is not None:
+            self.tcp_conn.close()
+        if self.connecting is not None:
+            self.connecting.close()
+        self.serial_end.close()
+
+
+class MultiBridge:
+    """
+    Serves all channels from a single selector loop.
+
+    :param channels: the channels to serve
+    """
+
+    def __init__(self, channels: list[Channel]) -> None:
+        self.channels = channels
+        self._selector = selectors.DefaultSelector()
+        # The TCP socket each channel is registered with the selector for
+        self._sockets = {}
+
+    def _register(self, fileobj, events: int, channel: Channel) -> None:
+        try:
+            key = self._selector.get_key(fileobj)
+        except KeyError:
+            self._selector.register(fileobj, events, channel)
+        else:
+            if key.events != events:
+                self._selector.modify(fileobj, events, channel)
+
+    def _update(self, channel: Channel) -> None:
+        """
+        Waits for each end of a channel to become readable, and writable if it has data waiting.
+        """
+        events = selectors.EVENT_READ
+        if channel.wants_to_write_serial():
+            events |= selectors.EVENT_WRITE
+        self._register(channel.serial_end, events, channel)
+
+        registered = self._sockets.get(channel)
+        if registered is not None and registered not in (channel.tcp_conn, channel.connecting):
+            self._selector.unregister(registered)
+            del self._sockets[channel]
+
+        if channel.tcp_conn is not None:
+            events = selectors.EVENT_READ
+            if channel.wants_to_write_tcp():
+                events |= selectors.EVENT_WRITE
+            self._register(channel.tcp_conn, events, channel)
+            self._sockets[channel] = channel.tcp_conn
+        elif channel.connecting is not None:
+            self._register(channel.connecting, selectors.EVENT_WRITE, channel)
+            self._sockets[channel] = channel.connecting
+
+    def _dispatch(self, fileobj, mask: int, channel: Channel) -> None:
+        if fileobj is channel.serial_end:
+            if mask & selectors.EVENT_WRITE:
+                channel.flush_serial()
+            if mask & selectors.EVENT_READ:
+                channel.forward_serial()
+        elif fileobj is channel.tcp_conn:
+            if mask & selectors.EVENT_WRITE:
+                channel.flush_tcp()
+            if mask & selectors.EVENT_READ and fileobj is channel.tcp_conn:
+                channel.forward_tcp()
+        elif fileobj is channel.connecting:
+            channel.finish_connect()
+        self._update(channel)
+
+    def run(self, stats_interval: float | None) -> None:
+        """
+        Forwards data on all channels until interrupted.
+
+        :param stats_interval: seconds between statistics reports, None not to report them
+        """
+        for channel in self.channels:
+            self._update(channel)
+
+        last_report = time.perf_counter()
+        while True:
+            now = time.monotonic()
+            for channel in self.channels:
+                if channel.tcp_conn is None and now >= channel.next_connect:
+                    if channel.connecting is None:
+                        channel.connect()
+                    else:
+                        channel.abandon_connect()
+                    self._update(channel)
+
+            deadlines = [
+                channel.next_connect - now for channel in self.channels if channel.tcp_conn is None
+            ]
+            if stats_interval is not None:
+                deadlines.append(last_report + stats_interval - time.perf_counter())
+            timeout = max(0.0, min(deadlines)) if deadlines else None
+
+            for key, mask in self._selector.select(timeout):
+                self._dispatch(key.fileobj, mask, key.data)
+
+            elapsed = time.perf_counter() - last_report
+            if stats_interval is not None and elapsed >= stats_interval:
+                for channel in self.channels:
+                    print(channel.report(elapsed))
+                last_report = time.perf_counter()
+
+    def close(self) -> None:
+        self._selector.close()
+
+
+def parse_channels(lines: list[str]) -> list[tuple[str, tuple[str, int], int]]:
+    """
+    :param lines: the lines of the channel table
+    :return: the serial end, TCP address and baud rate of every channel
+    """
+    channels = []
+    for number, line in enumerate(lines, start=1):
+        fields = line.split("#", 1)[0].split()
+        if not fields:
+            continue
+        if len(fields) not in (2, 3):
+            raise ValueError(
+                "Line {}: expected a serial end, a TCP end and a baud rate".format(number)
+            )
+        host, _, port = fields[1].rpartition(":")
+        try:
+            channels.append(
+                (
+                    fields[0],
+                    (host or "localhost", int(port)),
+                    int(fields[2]) if len(fields) == 3 else 9600,
+                )
+            )
+        except ValueError:
+            raise ValueError("Line {}: could not read {}".format(number, line.strip()))
+    return channels
+
+
+def open_serial_end(path: str, baud: int) -> PtyEnd | SerialEnd:
+    if path.startswith("pty:"):
+        return PtyEnd(path[len("pty:") :])
+    return SerialEnd(path, baud)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Transfers data between serial ports or pseudo-terminals and TCP ports, "
+        "see the module docstring for the format of the channel table."
+    )
+    parser.add_argument("channels", help="File listing the channels, one per line.")
+    parser.add_argument(
+        "-s",
+        "--stats-interval",
+        help="Seconds between reports of the data rates, 0 not to report them.",
+        type=float,
+        default=10.0,
+    )
+    args = parser.parse_args()
+
+    with open(args.channels) as channel_file:
+        table = parse_channels(channel_file.readlines())
+
+    channels = []
+    try:
+        for path, address, baud in table:
+            channels.append(Channel(open_serial_end(path, baud), address))
+            print("{} -> {}:{}".format(path, *address))
+
+        print("Press Ctrl+C to stop")
+        bridge = MultiBridge(channels)
+        try:
+            bridge.run(args.stats_interval or None)
+        finally:
+            bridge.close()
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        if e.errno != errno.EINTR:
+            raise
+    finally:
+        for channel in channels:
+            try:
+                channel.close()
+            except OSError:
+                pass
@@ -0,0 +1,5 @@
+"""
+Helpers shared between several of the emulators in :mod:`lewis_emulators`.
+
+They are kept outside that package because lewis treats every package in it as a device.
+"""
@@ -0,0 +1,54 @@
+"""
+Checksums used by serial (RTU-style) protocols.
+"""
+
+
+def _make_crc16_modbus_table() -> tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+# CRC of every possible byte value, reflected polynomial 0xA001 (CRC-16/MODBUS)
+_CRC16_MODBUS_TABLE = _make_crc16_modbus_table()
+
+
+def crc16_value(data: bytes) -> int:
+    """
+    CRC-16/MODBUS as used by Modbus RTU frames, computed a byte at a time from a lookup table.
+
+    :param data: the data to checksum
+    :return: the checksum as an integer
+    """
+    crc = 0xFFFF
+    table = _CRC16_MODBUS_TABLE
+    for b in data:
+        crc = (crc >> 8) ^ table[(crc ^ b) & 0xFF]
+    return crc
+
+
+def crc16(data: bytes) -> bytes:
+    """
+    CRC-16/MODBUS in the byte order it is sent on the wire (low byte first).
+
+    Running this over a whole frame including its trailing checksum gives ``b"\\x00\\x00"`` if
+    the checksum is correct.
+
+    :param data: the data to checksum
+    :return: the two checksum bytes
+    """
+    crc = crc16_value(data)
+    return bytes((crc & 0xFF, crc >> 8))
+
+
+def crc16_matches(data: bytes, expected: bytes) -> bool:
+    """
+    :param data: the data to checksum
+    :param expected: the two checksum bytes that were received with the data
+    :return: true if the checksum of data is equal to expected, false otherwise
+    """
+    return crc16(data) == expected
@@ -0,0 +1,287 @@
+"""
+Prefix-indexed dispatch for stream interfaces with large command tables.
+
+Lewis tries every bound command of a :class:`~lewis.adapters.stream.StreamInterface` one after
+another for every request it receives, so the cost of a request grows with the number of commands.
+:class:`CommandIndex` groups the commands by the literal text their patterns start with
+(e.g. ``READ:DEV:``, ``SET:DEV:``, with and without the ISOBUS ``@1`` prefix) in a trie. A request
+only has to walk the trie to find the commands that can possibly match it, and those candidates are
+tried with a single combined regular expression instead of one Python-level attempt per command.
+
+The first matching command in the original order still wins, so dispatch behaves exactly as it
+does without the index. To use it, add :class:`IndexedCommandsMixin` in front of
+``StreamInterface`` in the bases of an interface.
+"""
+
+import re
+from typing import Any, Iterable
+
+from lewis.adapters.stream import Func
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# Flags that can be carried into a combined expression as a scoped "(?flags:...)" group
+_SCOPED_FLAGS = {re.IGNORECASE: "i", re.MULTILINE: "m", re.DOTALL: "s", re.VERBOSE: "x"}
+
+# Commands are grouped by at most this many alternative prefixes each (optional parts double it)
+_MAX_PREFIXES = 16
+
+
+def _literal_bytes(items: Iterable[tuple[Any, Any]]) -> bytes | None:
+    """
+    :return: the bytes matched by a parsed (sub)pattern if it only contains literals, else None
+    """
+    literal = bytearray()
+    for op, av in items:
+        if op is not sre_parse.LITERAL:
+            return None
+        literal.append(av)
+    return bytes(literal)
+
+
+def literal_prefixes(matcher: Any) -> set[bytes]:
+    """
+    Works out the literal text any request matched by a pattern has to start with.
+
+    Optional literal groups such as ``(?:@1)?`` produce one prefix with and one without the
+    optional text. Case-insensitive patterns and matchers that are not regular expressions
+    are given the empty prefix, which means they are candidates for every request.
+
+    :param matcher: the :class:`~lewis.adapters.stream.PatternMatcher` of a command
+    :return: the set of prefixes
+    """
+    compiled = getattr(matcher, "compiled_pattern", None)
+    if compiled is None or compiled.flags & re.IGNORECASE:
+        return {b""}
+
+    prefixes = {b""}
+    for op, av in sre_parse.parse(compiled.pattern, compiled.flags):
+        if op is sre_parse.LITERAL:
+            prefixes = {prefix + bytes((av,)) for prefix in prefixes}
+        elif op is sre_parse.AT and av in (sre_parse.AT_BEGINNING, sre_parse.AT_BEGINNING_STRING):
+            continue
+        elif op is sre_parse.MAX_REPEAT and av[0] == 0 and av[1] == 1:
+            optional = _literal_bytes(av[2])
+            if optional is None or 2 * len(prefixes) > _MAX_PREFIXES:
+                break
+            prefixes |= {prefix + optional for prefix in prefixes}
+        else:
+            break
+
+    return prefixes
+
+
+def _uses_group_references(items: Iterable[tuple[Any, Any]]) -> bool:
+    for op, av in items:
+        if op in (sre_parse.GROUPREF, sre_parse.GROUPREF_EXISTS):
+            return True
+        children = av if isinstance(av, (list, tuple)) else ()
+        for child in children:
+            if isinstance(child, sre_parse.SubPattern) and _uses_group_references(child):
+                return True
+            if isinstance(child, list) and any(
+                isinstance(branch, sre_parse.SubPattern) and _uses_group_references(branch)
+                for branch in child
+            ):
+                return True
+    return False
+
+
+def _combinable_pattern(command: Func) -> bytes | None:
+    """
+    :return: the pattern of a command in a form that can be embedded in a combined expression,
+        or None if it has to be matched on its own
+    """
+    compiled = getattr(command.matcher, "compiled_pattern", None)
+    if compiled is None or compiled.groupindex or compiled.flags & ~sum(_SCOPED_FLAGS):
+        return None
+
+    scoped_flags = "".join(
+        letter for flag, letter in _SCOPED_FLAGS.items() if compiled.flags & flag
+    ).encode()
+    pattern = b"(?%s:%s)" % (scoped_flags, compiled.pattern) if scoped_flags else compiled.pattern
+
+    try:
+        re.compile(b"(?:" + pattern + b")")
+    except re.error:
+        return None
+
+    if _uses_group_references(sre_parse.parse(compiled.pattern, compiled.flags)):
+        return None
+
+    return pattern
+
+
+class _CombinedCommands:
+    """
+    Several consecutive commands matched with one alternation, each command in its own group.
+    """
+
+    def __init__(self, commands: list[tuple[Func, bytes]]) -> None:
+        self._commands = {}
+        alternatives = []
+        group = 1
+        for command, pattern in commands:
+            self._commands[group] = (command, command.matcher.compiled_pattern.groups)
+            alternatives.append(b"(" + pattern + b")")
+            group += 1 + command.matcher.compiled_pattern.groups
+
+        self._expression = re.compile(b"|".join(alternatives))
+
+    def match(self, request: bytes) -> tuple[Func, tuple] | None:
+        match = self._expression.match(request)
+        if match is None:
+            return None
+        command, group_count = self._commands[match.lastindex]
+        return command, match.groups()[match.lastindex : match.lastindex + group_count]
+
+
+class _SingleCommand:
+    """
+    A command that could not be combined with others, matched through its own matcher.
+    """
+
+    def __init__(self, command: Func) -> None:
+        self._command = command
+
+    def match(self, request: bytes) -> tuple[Func, tuple] | None:
+        arguments = self._command.matcher.match(request)
+        return None if arguments is None else (self._command, arguments)
+
+
+class _Node:
+    def __init__(self) -> None:
+        self.children = {}
+        self.commands = []
+        self.matchers = None
+
+
+class CommandIndex:
+    """
+    Stands in for the list of bound commands of a stream interface and dispatches a request to
+    the first command that matches it.
+
+    It provides the same ``can_process``/``process_request`` methods as
+    :class:`~lewis.adapters.stream.Func`, so lewis can use it as the only bound command. The
+    command found by ``can_process`` is remembered so ``process_request`` for the same request
+    does not match it again, and ``matcher`` refers to that command so lewis logs the pattern of
+    the command that actually handled the request.
+
+    :param commands: the bound commands in the order lewis would try them
+    """
+
+    def __init__(self, commands: Iterable[Func]) -> None:
+        self.commands = list(commands)
+        self.func = self.process_request
+        self.matcher = _IndexPattern(self.commands)
+        self._last_request = None
+        self._last_match = None
+
+        self._root = _Node()
+        for position, command in enumerate(self.commands):
+            for prefix in literal_prefixes(command.matcher):
+                node = self._root
+                for byte in prefix:
+                    node = node.children.setdefault(byte, _Node())
+                node.commands.append(position)
+
+        self._build_matchers(self._root, [])
+
+    @property
+    def doc(self) -> str:
+        return "\n\n".join(
+            "{}:\n{}".format(command.matcher.pattern, command.doc or "")
+            for command in self.commands
+        )
+
+    def _build_matchers(self, node: _Node, inherited: list[int]) -> None:
+        if node.commands or node is self._root:
+            inherited = sorted(set(inherited) | set(node.commands))
+            node.matchers = self._group(self.commands[position] for position in inherited)
+
+        for child in node.children.values():
+            self._build_matchers(child, inherited)
+
+    @staticmethod
+    def _group(commands: Iterable[Func]) -> list[_CombinedCommands | _SingleCommand]:
+        matchers = []
+        pending = []
+        for command in commands:
+            pattern = _combinable_pattern(command)
+            if pattern is not None:
+                pending.append((command, pattern))
+                continue
+            if pending:
+                matchers.append(_CombinedCommands(pending))
+                pending = []
+            matchers.append(_SingleCommand(command))
+        if pending:
+            matchers.append(_CombinedCommands(pending))
+        return matchers
+
+    def find(self, request: bytes) -> tuple[Func, tuple] | None:
+        """
+        :param request: the request to dispatch
+        :return: the first command matching the request and its unmapped arguments,
+            or None if no command matches
+        """
+        node = self._root
+        matchers = node.matchers
+        for byte in request:
+            node = node.children.get(byte)
+            if node is None:
+                break
+            if node.matchers is not None:
+                matchers = node.matchers
+
+        for matcher in matchers:
+            found = matcher.match(request)
+            if found is not None:
+                return found
+        return None
+
+    def can_process(self, request: bytes) -> bool:
+        self._last_request = request
+        self._last_match = self.find(request)
+        if self._last_match is None:
+            return False
+        self.matcher = self._last_match[0].matcher
+        return True
+
+    def process_request(self, request: bytes) -> Any:
+        found = self._last_match if request is self._last_request else self.find(request)
+        self._last_request = None
+        self._last_match = None
+        if found is None:
+            raise RuntimeError("Request can not be processed.")
+
+        command, arguments = found
+        return command.map_return_value(command.func(*command.map_arguments(arguments)))
+
+
+class _IndexPattern:
+    """
+    Placeholder matcher so that lewis can document a :class:`CommandIndex` before any request.
+    """
+
+    def __init__(self, commands: list[Func]) -> None:
+        self.pattern = "<{} indexed commands>".format(len(commands))
+
+
+class IndexedCommandsMixin:
+    """
+    Mixin for stream interfaces that replaces the bound commands with a :class:`CommandIndex`
+    after lewis has bound them to the interface and device:
+
+    .. sourcecode:: Python
+
+        class SomeInterface(IndexedCommandsMixin, StreamInterface):
+            commands = {...}
+    """
+
+    def _bind_device(self) -> None:
+        super()._bind_device()
+        self.bound_commands = [CommandIndex(self.bound_commands)]
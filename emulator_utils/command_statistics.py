@@ -0,0 +1,197 @@
+"""
+Per-command call counts, error counts and latencies for stream interfaces.
+
+Statistics are opt-in. Once :func:`enable_command_statistics` has been called, every
+:class:`~lewis.adapters.stream.StreamInterface` bound to a device from then on has the handler of
+each of its commands wrapped, including the commands behind a
+:class:`~emulator_utils.command_index.CommandIndex`. Each handler gets a call count, an
+error count, a latency summary and a latency histogram, under the name of the interface class and
+handler method, e.g. ``MercuryitcInterface.get_all_temp_sensor_details``. Nothing is wrapped unless
+statistics are enabled, so they cost nothing otherwise.
+
+To enable them for a plain ``lewis`` process, set ``LEWIS_EMULATORS_COMMAND_STATISTICS=1`` before
+starting it. The device host has a ``--command-statistics`` option instead.
+
+The statistics of a device can then be read through the lewis backdoor, where the device has these
+extra functions:
+
+.. sourcecode:: Python
+
+    device.command_statistics()  # dict keyed by command, latencies in milliseconds
+    device.command_statistics_json()  # the same as a JSON string
+    device.dump_command_statistics("commands.json")  # written to a file
+    device.reset_command_statistics()
+"""
+
+import json
+import weakref
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable
+
+from lewis.adapters.stream import StreamInterface
+
+from emulator_utils.command_index import CommandIndex
+from emulator_utils.statistics import LatencyHistogram, LatencyStatistics
+
+
+def _member_name(owner: Any, method: Callable[..., Any]) -> str:
+    """
+    :return: the name under which a bound method is found on its object, which differs from the
+        name of the function if it was made by a decorator that does not use ``functools.wraps``
+    """
+    function = getattr(method, "__func__", None)
+    for cls in type(owner).__mro__:
+        for name, member in vars(cls).items():
+            if member is function:
+                return name
+    return method.__name__
+
+
+class CommandStatistics:
+    """
+    Calls, errors and latencies of one command handler.
+    """
+
+    def __init__(self) -> None:
+        self.errors = 0
+        self.latency = LatencyStatistics()
+        self.histogram = LatencyHistogram()
+
+    def record(self, seconds: float) -> None:
+        self.latency.record(seconds)
+        self.histogram.record(seconds)
+
+    def reset(self) -> None:
+        self.errors = 0
+        self.latency.reset()
+        self.histogram.reset()
+
+    def as_dict(self) -> dict[str, Any]:
+        summary = self.latency.as_dict()
+        return {
+            "calls": summary.pop("count"),
+            "errors": self.errors,
+            "latency": summary,
+            "histogram": self.histogram.as_dict(),
+        }
+
+
+class CommandProfiler:
+    """
+    Collects :class:`CommandStatistics` for the command handlers of the interfaces of a device.
+    """
+
+    def __init__(self) -> None:
+        self.commands: dict[str, CommandStatistics] = {}
+
+    def instrument(self, interface: StreamInterface) -> None:
+        """
+        Wraps the handlers of the bound commands of an interface so that they record their
+        statistics. Handlers with the same name, e.g. one method bound to several patterns,
+        share their statistics.
+
+        :param interface: the interface, after its commands have been bound
+        """
+        for bound in interface.bound_commands or ():
+            commands = bound.commands if isinstance(bound, CommandIndex) else [bound]
+            for command in commands:
+                if not getattr(command.func, "_records_statistics", False):
+                    name = self._command_name(interface, command)
+                    command.func = self._timed(command.func, self.statistics(name))
+
+    def statistics(self, name: str) -> CommandStatistics:
+        """
+        :param name: the name of the command
+        :return: the statistics of the command, which are created if it has none yet
+        """
+        if name not in self.commands:
+            self.commands[name] = CommandStatistics()
+        return self.commands[name]
+
+    @staticmethod
+    def _command_name(interface: StreamInterface, command: Any) -> str:
+        owner = getattr(command.func, "__self__", None)
+        if owner is None:
+            # Handlers made by lewis for Var commands are local functions without a useful name
+            return "{}.{}".format(type(interface).__name__, command.matcher.pattern)
+        return "{}.{}".format(type(owner).__name__, _member_name(owner, command.func))
+
+    @staticmethod
+    def _timed(func: Callable[..., Any], statistics: CommandStatistics) -> Callable[..., Any]:
+        @wraps(func)
+        def wrapper(*args: Any) -> Any:
+            start = perf_counter()
+            try:
+                return func(*args)
+            except Exception:
+                statistics.errors += 1
+                raise
+            finally:
+                statistics.record(perf_counter() - start)
+
+        wrapper._records_statistics = True
+        return wrapper
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """
+        :return: the statistics of every command that has been called, keyed by command name
+        """
+        return {
+            name: statistics.as_dict()
+            for name, statistics in sorted(self.commands.items())
+            if statistics.latency.count
+        }
+
+    def as_json(self) -> str:
+        return json.dumps(self.as_dict(), indent=2)
+
+    def dump(self, path: str) -> None:
+        """
+        Writes the statistics to a file as JSON.
+
+        :param path: the file to write
+        """
+        with open(path, "w") as statistics_file:
+            statistics_file.write(self.as_json())
+
+    def reset(self) -> None:
+        for statistics in self.commands.values():
+            statistics.reset()
+
+
+_profilers = weakref.WeakKeyDictionary()
+
+
+def command_profiler(device: Any) -> CommandProfiler:
+    """
+    Gets the profiler of a device, creating it and adding its functions to the device the first
+    time, so that they can be called through the backdoor.
+
+    :param device: the device
+    :return: the profiler
+    """
+    if device not in _profilers:
+        profiler = _profilers[device] = CommandProfiler()
+        device.command_statistics = profiler.as_dict
+        device.command_statistics_json = profiler.as_json
+        device.dump_command_statistics = profiler.dump
+        device.reset_command_statistics = profiler.reset
+    return _profilers[device]
+
+
+_bind_device = StreamInterface._bind_device
+
+
+def _bind_device_with_statistics(self: StreamInterface) -> None:
+    _bind_device(self)
+    command_profiler(self.device).instrument(self)
+
+
+def enable_command_statistics() -> None:
+    """
+    Records command statistics for every stream interface bound to a device from now on. This
+    has to be called before the simulation is created, so that the backdoor sees the functions
+    added to the device.
+    """
+    StreamInterface._bind_device = _bind_device_with_statistics
@@ -0,0 +1,122 @@
+"""
+Replies that a stream interface sends some time after the request, without blocking the emulator.
+
+A device that simulates a slow instrument by sleeping while it handles a request holds the device
+lock the whole time, so the simulation can not cycle and no other request or connection is served
+until it wakes up. An interface whose ``adapter`` is :class:`DeferredReplyStreamAdapter` can
+instead implement ``reply_delay``, which is asked after every request how many seconds its reply
+should be held back. It is also asked just before every request, and the answer thrown away, so that
+only the request itself adds to the delay:
+
+.. sourcecode:: Python
+
+    class SomeInterface(StreamInterface):
+        adapter = DeferredReplyStreamAdapter
+
+        def reply_delay(self):
+            return self.device.delay_time
+
+The reply is then queued and sent by the adapter loop once it is due, while the adapter goes on
+handling other requests. Replies on a connection are sent in the order of the requests, like a
+device that handles one request at a time: a request that arrives while the reply to an earlier
+one is still delayed is only answered after that reply, and its own delay on top.
+"""
+
+import collections
+import time
+
+from lewis.adapters.stream import StreamAdapter, StreamHandler, StreamServer
+
+
+class DeferredReplyStreamHandler(StreamHandler):
+    """
+    Stream handler that holds replies back by the ``reply_delay`` of its interface, if it has one.
+    """
+
+    def __init__(self, sock, target, stream_server) -> None:
+        super().__init__(sock, target, stream_server)
+        self._deferred = collections.deque()
+        self._busy_until = 0.0
+
+    def _reply_delay(self) -> float:
+        reply_delay = getattr(self._target, "reply_delay", None)
+        return (reply_delay() or 0.0) if reply_delay is not None else 0.0
+
+    def found_terminator(self) -> None:
+        # As StreamHandler.found_terminator, but the delay is asked for while the device lock is
+        # still held, and once before the request so that a delay built up outside of requests
+        # (e.g. by the backdoor) is not charged to it
+        self._readtimer = 0
+
+        request = self._get_request()
+
+        with self._stream_server.device_lock:
+            self._reply_delay()
+            try:
+                cmd = next(
+                    (cmd for cmd in self._target.bound_commands if cmd.can_process(request)),
+                    None,
+                )
+
+                if cmd is None:
+                    raise RuntimeError("None of the device's commands matched.")
+
+                self.log.info(
+                    "Processing request %s using command %s",
+                    request,
+                    cmd.matcher.pattern,
+                )
+
+                reply = cmd.process_request(request)
+            except Exception as error:
+                reply = self._handle_error(request, error)
+
+            delay = self._reply_delay()
+
+        self._defer_reply(reply, delay)
+
+    def _defer_reply(self, reply, delay: float) -> None:
+        if delay <= 0 and not self._deferred:
+            self._send_reply(reply)
+            return
+
+        self._busy_until = max(time.monotonic(), self._busy_until) + delay
+        self._deferred.append((self._busy_until, reply))
+
+    def process(self, msec) -> None:
+        super().process(msec)
+
+        now = time.monotonic()
+        while self._deferred and self._deferred[0][0] <= now:
+            _, reply = self._deferred.popleft()
+            self._send_reply(reply)
+
+
+class DeferredReplyStreamServer(StreamServer):
+    def handle_accept(self) -> None:
+        pair = self.accept()
+        if pair is not None:
+            sock, addr = pair
+            handler = DeferredReplyStreamHandler(sock, self.target, self)
+
+            self._accepted_connections.append(handler)
+
+
+class DeferredReplyStreamAdapter(StreamAdapter):
+    """
+    Stream adapter whose connections send replies once the ``reply_delay`` of the interface has
+    passed, rather than straight away.
+    """
+
+    def start_server(self) -> None:
+        if self._server is None:
+            if self._options.telnet_mode:
+                self.interface.in_terminator = "\r\n"
+                self.interface.out_terminator = "\r\n"
+
+            self._server = DeferredReplyStreamServer(
+                self._options.bind_address,
+                self._options.port,
+                self.interface,
+                self.device_lock,
+            )
@@ -0,0 +1,500 @@
+"""
+Runs several of the emulators in this package inside a single interpreter.
+
+Normally every emulator is started as its own ``lewis`` process. For a full instrument test rig
+that means paying for one interpreter and one simulation loop per device. The host in this module
+instead loads every device listed in a YAML file, cycles all of their state machines from one
+shared scheduler and serves all of their stream and modbus interfaces from one event loop.
+
+Example configuration:
+
+.. sourcecode:: yaml
+
+    io_timeout: 0.01
+    stats_interval: 60
+    devices:
+      - device: eurotherm
+        protocols:
+          stream: {bind_address: localhost, port: 57677}
+        rpc_host: localhost:10000
+      - name: second_eurotherm
+        device: eurotherm
+        protocols:
+          eurotherm_modbus: {bind_address: localhost, port: 57678}
+        cycle_delay: 0.05
+      - device: mercuryitc
+        setup: default
+        speed: 2.0
+
+Each device may have its own ``setup``, ``protocols`` (as for the ``-p`` option of lewis),
+``rpc_host`` (as for ``-r``), ``cycle_delay`` and ``speed``. If ``name`` is omitted the device
+name is used, so two devices of the same type need explicit names.
+
+Usage::
+
+    python -m emulator_utils.device_host devices.yaml
+
+Add ``--traffic-log traffic.log`` to write the requests and replies of the interfaces to a file,
+see :mod:`emulator_utils.traffic_log`.
+"""
+
+import argparse
+import asyncore
+import logging
+import os
+import sys
+from datetime import datetime
+from functools import wraps
+from time import perf_counter, sleep
+from typing import Any, Callable, Sequence
+
+import yaml
+from lewis.adapters.modbus import ModbusAdapter
+from lewis.adapters.stream import StreamAdapter
+from lewis.core.adapters import Adapter
+from lewis.core.control_server import ControlServer, ExposedObject
+from lewis.core.devices import DeviceBase, DeviceBuilder, DeviceRegistry
+from lewis.core.exceptions import LewisException
+from lewis.core.logging import default_log_format, has_log
+from lewis.core.simulation import Simulation
+
+from emulator_utils.command_statistics import enable_command_statistics
+from emulator_utils.statistics import LatencyStatistics
+from emulator_utils.traffic_log import start_traffic_file
+
+
+@has_log
+class HostedSimulation(Simulation):
+    """
+    A :class:`~lewis.core.simulation.Simulation` whose cycles are driven by :class:`DeviceHost`
+    rather than by its own blocking loop in :meth:`start`.
+
+    Device, simulation and interface are exposed through the control server exactly as for a
+    normal lewis simulation, so existing backdoor calls keep working. In addition the
+    ``statistics`` property reports cycle times and request latencies for this device.
+    """
+
+    _host_only_members = (
+        "start",
+        "begin",
+        "cycle",
+        "process_io",
+        "finish",
+        "control_server",
+        "log",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        device: DeviceBase,
+        adapters: Sequence[Adapter] = (),
+        device_builder: DeviceBuilder | None = None,
+        control_server: str | None = None,
+    ) -> None:
+        self.name = name
+        self._hosted_adapters = list(adapters)
+        self._cycle_time = LatencyStatistics()
+        self._cycle_jitter = LatencyStatistics()
+        self._request_latency = LatencyStatistics()
+        self._io_milliseconds = 0.0
+        super().__init__(device, adapters, device_builder, control_server)
+
+    def _create_control_server(self, control_server: str | None) -> ControlServer | None:
+        # Simulation exposes itself with exclude_inherited=True, which would hide all of its own
+        # members on a sub-class, so the members to hide are listed explicitly instead.
+        if control_server is None:
+            return None
+
+        return ControlServer(
+            {
+                "device": ExposedObject(
+                    self._device, exclude_inherited=True, lock=self._adapters.device_lock
+                ),
+                "simulation": ExposedObject(self, exclude=self._host_only_members),
+                "interface": ExposedObject(
+                    self._adapters,
+                    exclude=("device_lock", "add_adapter", "remove_adapter", "handle", "log"),
+                    exclude_inherited=True,
+                ),
+            },
+            control_server,
+        )
+
+    @property
+    def statistics(self) -> dict[str, Any]:
+        """
+        Number of cycles and requests processed, together with cycle time, cycle jitter (how far
+        the time between cycles was from ``cycle_delay``) and request latency summaries in
+        milliseconds.
+        """
+        return {
+            "cycles": self._cycles,
+            "cycle_time": self._cycle_time.as_dict(),
+            "cycle_jitter": self._cycle_jitter.as_dict(),
+            "request_latency": self._request_latency.as_dict(),
+        }
+
+    def reset_statistics(self) -> None:
+        self._cycle_time.reset()
+        self._cycle_jitter.reset()
+        self._request_latency.reset()
+
+    @property
+    def stop_requested(self) -> bool:
+        return self._stop_commanded
+
+    def begin(self) -> None:
+        """
+        Starts the control server and the servers of all adapters, without entering a loop.
+        """
+        self.log.info("Starting simulation of %s", self.name)
+        self._running = True
+        self._started = True
+        self._stop_commanded = False
+        self._start_time = datetime.now()
+
+        if self._control_server is not None:
+            self._control_server.start_server()
+
+        for adapter in self._hosted_adapters:
+            adapter.device_lock = self._adapters.device_lock
+            adapter.start_server()
+
+        self._time_requests()
+
+    def switch_setup(self, new_setup: str) -> None:
+        super().switch_setup(new_setup)
+        self._time_requests()
+
+    def _time_requests(self) -> None:
+        for adapter in self._hosted_adapters:
+            if isinstance(adapter, StreamAdapter) and adapter.interface.bound_commands:
+                for command in adapter.interface.bound_commands:
+                    command.process_request = self._timed(command.process_request)
+
+    def _timed(self, process_request: Callable[[bytes], Any]) -> Callable[[bytes], Any]:
+        @wraps(process_request)
+        def wrapper(request: bytes) -> Any:
+            start = perf_counter()
+            try:
+                return process_request(request)
+            finally:
+                self._request_latency.record(perf_counter() - start)
+
+        return wrapper
+
+    def cycle(self, delta: float) -> None:
+        """
+        Processes one simulation cycle unless the simulation is paused.
+
+        :param delta: real time in seconds since the previous cycle
+        """
+        if not self._running:
+            return
+
+        start = perf_counter()
+        delta_simulation = delta * self._speed
+        with self._adapters.device_lock:
+            self._device.process(delta_simulation)
+        self._cycle_time.record(perf_counter() - start)
+        self._cycle_jitter.record(abs(delta - self.cycle_delay))
+
+        self._cycles += 1
+        self._runtime += delta_simulation
+
+    def process_io(self, seconds: float) -> None:
+        """
+        Does the per-iteration work of the adapters that the shared event loop does not cover:
+        read timeouts of stream connections, pending control server requests and any adapter
+        that is not built on asyncore.
+
+        :param seconds: real time in seconds since the last call
+        """
+        self._io_milliseconds += seconds * 1000
+        msec = int(self._io_milliseconds)
+        self._io_milliseconds -= msec
+
+        for adapter in self._hosted_adapters:
+            if isinstance(adapter, StreamAdapter):
+                # StreamAdapter.handle(cycle_delay) polls the shared socket map once more and
+                # advances the read timeouts by cycle_delay rather than by the time that has
+                # passed, so the timeouts are advanced on its server directly
+                adapter._server.process(msec)
+            elif not isinstance(adapter, ModbusAdapter):
+                adapter.handle(0.0)
+
+        if self._control_server is not None:
+            self._control_server.process()
+
+    def stop(self) -> None:
+        if self.is_started:
+            self.log.warning("Stopping simulation of %s", self.name)
+            self._stop_commanded = True
+
+    def finish(self) -> None:
+        for adapter in self._hosted_adapters:
+            adapter.stop_server()
+        self._running = False
+        self._started = False
+        self.log.info("Simulation of %s has ended.", self.name)
+
+
+@has_log
+class DeviceHost:
+    """
+    Drives several :class:`HostedSimulation` objects from one thread.
+
+    Every iteration of :meth:`run` waits on all sockets of all stream and modbus adapters at
+    once, then runs a cycle of each device whose ``cycle_delay`` has elapsed. A device whose
+    cycle raises is stopped and logged, the remaining devices carry on.
+
+    :param simulations: the simulations to host
+    :param io_timeout: longest time in seconds to wait for network traffic per iteration
+    :param stats_interval: seconds between statistics log messages, None to disable them
+    """
+
+    def __init__(
+        self,
+        simulations: list[HostedSimulation],
+        io_timeout: float = 0.01,
+        stats_interval: float | None = None,
+    ) -> None:
+        names = [simulation.name for simulation in simulations]
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            raise LewisException(
+                "Device names must be unique, give these devices a name: {}".format(
+                    ", ".join(sorted(duplicates))
+                )
+            )
+
+        self._simulations = list(simulations)
+        self._io_timeout = io_timeout
+        self._stats_interval = stats_interval
+        self._stop_commanded = False
+
+    @classmethod
+    def from_config(
+        cls, config: dict[str, Any], device_package: str = "lewis_emulators"
+    ) -> "DeviceHost":
+        """
+        Creates a host from a parsed configuration, see the module documentation for the format.
+
+        :param config: the configuration
+        :param device_package: package to load the devices from
+        :return: the host
+        """
+        devices = config.get("devices")
+        if not devices:
+            raise LewisException("The configuration does not list any devices.")
+
+        registry = DeviceRegistry(device_package)
+        simulations = [create_simulation(registry, entry) for entry in devices]
+
+        return cls(
+            simulations,
+            io_timeout=config.get("io_timeout", 0.01),
+            stats_interval=config.get("stats_interval"),
+        )
+
+    @property
+    def simulations(self) -> list[HostedSimulation]:
+        return list(self._simulations)
+
+    @property
+    def statistics(self) -> dict[str, dict[str, Any]]:
+        """
+        Statistics of every hosted device, keyed by device name.
+        """
+        return {simulation.name: simulation.statistics for simulation in self._simulations}
+
+    def stop(self) -> None:
+        self._stop_commanded = True
+
+    def run(self) -> None:
+        """
+        Starts all devices and processes them until :meth:`stop` is called or all devices
+        have been stopped.
+        """
+        for simulation in self._simulations:
+            simulation.begin()
+
+        now = perf_counter()
+        last_cycle = {simulation: now for simulation in self._simulations}
+        last_io = now
+        last_stats = now
+
+        try:
+            while self._simulations and not self._stop_commanded:
+                next_cycle = min(
+                    last_cycle[simulation] + simulation.cycle_delay
+                    for simulation in self._simulations
+                )
+                timeout = min(max(next_cycle - perf_counter(), 0.0), self._io_timeout)
+
+                if asyncore.socket_map:
+                    asyncore.loop(timeout, count=1)
+                else:
+                    sleep(timeout)
+
+                now = perf_counter()
+                for simulation in self._simulations:
+                    simulation.process_io(now - last_io)
+                last_io = now
+
+                for simulation in list(self._simulations):
+                    if now - last_cycle[simulation] >= simulation.cycle_delay:
+                        self._cycle(simulation, now - last_cycle[simulation])
+                        last_cycle[simulation] = now
+
+                    if simulation.stop_requested:
+                        self._remove(simulation)
+
+                if self._stats_interval is not None and now - last_stats >= self._stats_interval:
+                    self._log_statistics()
+                    last_stats = now
+        finally:
+            for simulation in self._simulations:
+                simulation.finish()
+
+    def _cycle(self, simulation: HostedSimulation, delta: float) -> None:
+        try:
+            simulation.cycle(delta)
+        except Exception:
+            self.log.exception("Cycle of %s failed, stopping that device.", simulation.name)
+            simulation.stop()
+
+    def _remove(self, simulation: HostedSimulation) -> None:
+        simulation.finish()
+        self._simulations.remove(simulation)
+
+    def _log_statistics(self) -> None:
+        for name, statistics in self.statistics.items():
+            cycle_time = statistics["cycle_time"]
+            latency = statistics["request_latency"]
+            self.log.info(
+                "%s: %d cycles (mean %.3f ms, max %.3f ms), "
+                "%d requests (mean %.3f ms, p99 %.3f ms)",
+                name,
+                statistics["cycles"],
+                cycle_time["mean_ms"],
+                cycle_time["max_ms"],
+                latency["count"],
+                latency["mean_ms"],
+                latency["p99_ms"],
+            )
+
+
+def create_simulation(registry: DeviceRegistry, entry: dict[str, Any]) -> HostedSimulation:
+    """
+    Creates a simulation for one entry of the ``devices`` list in the configuration.
+
+    :param registry: registry to look up the device in
+    :param entry: the configuration entry
+    :return: the simulation
+    """
+    try:
+        device_name = entry["device"]
+    except (KeyError, TypeError):
+        raise LewisException("Every entry in devices needs a 'device' key: {}".format(entry))
+
+    builder = registry.device_builder(device_name)
+    device = builder.create_device(entry.get("setup"))
+
+    protocols = entry.get("protocols", {None: {}})
+    adapters = []
+    for protocol, options in protocols.items():
+        interface = builder.create_interface(protocol)
+        interface.device = device
+        adapter = interface.adapter(options=options or {})
+        adapter.interface = interface
+        adapters.append(adapter)
+
+    simulation = HostedSimulation(
+        entry.get("name", device_name),
+        device=device,
+        adapters=adapters,
+        device_builder=builder,
+        control_server=entry.get("rpc_host"),
+    )
+    simulation.cycle_delay = entry.get("cycle_delay", 0.1)
+    simulation.speed = entry.get("speed", 1.0)
+    return simulation
+
+
+def main(argument_list: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Runs several lewis emulators in one process, see the module docstring "
+        "for the configuration file format."
+    )
+    parser.add_argument("config", help="YAML file listing the devices to run.")
+    parser.add_argument(
+        "-k",
+        "--device-package",
+        default="lewis_emulators",
+        help="Name of the package where devices are found.",
+    )
+    parser.add_argument(
+        "-a", "--add-path", default=None, help="Path where the device package exists."
+    )
+    parser.add_argument(
+        "-o",
+        "--output-level",
+        default="info",
+        choices=["critical", "error", "warning", "info", "debug"],
+        help="Level of detail for logging to stderr.",
+    )
+    parser.add_argument(
+        "--traffic-log",
+        default=None,
+        help="Rotating file to write the requests and replies of the interfaces to.",
+    )
+    parser.add_argument(
+        "--traffic-log-binary",
+        action="store_true",
+        help="Write binary traffic records rather than hex dumps.",
+    )
+    parser.add_argument(
+        "--traffic-sample",
+        type=int,
+        default=1,
+        help="Only write every Nth request and its reply to the traffic log.",
+    )
+    parser.add_argument(
+        "--command-statistics",
+        action="store_true",
+        help="Record calls, errors and latencies of every command, see "
+        "emulator_utils.command_statistics.",
+    )
+    arguments = parser.parse_args(argument_list)
+
+    logging.basicConfig(
+        level=getattr(logging, arguments.output_level.upper()), format=default_log_format
+    )
+
+    if arguments.traffic_log is not None:
+        start_traffic_file(
+            arguments.traffic_log,
+            binary=arguments.traffic_log_binary,
+            sample_every=arguments.traffic_sample,
+        )
+
+    if arguments.add_path is not None:
+        sys.path.append(os.path.abspath(arguments.add_path))
+
+    if arguments.command_statistics:
+        enable_command_statistics()
+
+    with open(arguments.config) as config_file:
+        config = yaml.safe_load(config_file)
+
+    host = DeviceHost.from_config(config, arguments.device_package)
+    try:
+        host.run()
+    except KeyboardInterrupt:
+        print("\nInterrupt received; shutting down.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Splits the byte stream of binary protocols into frames using the lengths the frames declare.
+
+Stream interfaces for binary protocols usually set ``in_terminator = ""`` and match anything, so
+lewis only treats the bytes received so far as a request once nothing more has arrived for
+``readtimeout`` milliseconds. Every reply waits out that timeout, two pipelined frames are merged
+into one request and a frame split over two reads may be handled in pieces.
+
+An interface that sets ``adapter`` to :class:`FramedStreamAdapter` and ``framer`` to a
+:class:`Framer` instead has each frame dispatched as soon as its last byte arrives, and all
+complete frames of a read are dispatched one after another:
+
+.. sourcecode:: Python
+
+    class SomeInterface(StreamInterface):
+        adapter = FramedStreamAdapter
+        framer = LengthPrefixedFramer(offset=0, size=4, byteorder="little", extra=4)
+
+        commands = {Cmd("any_command", r"^([\\s\\S]*)$", return_mapping=lambda x: x)}
+        in_terminator = ""
+
+Bytes the framer can not make sense of are still handled after the read timeout, as before.
+
+Framed connections also hold replies back by the ``reply_delay`` of the interface, as described in
+:mod:`emulator_utils.deferred_replies`.
+"""
+
+from lewis.adapters.stream import StreamAdapter, StreamServer
+
+from emulator_utils.deferred_replies import DeferredReplyStreamHandler
+
+
+class Framer:
+    """
+    Works out how long the frame at the start of the received data is.
+    """
+
+    def frame_length(self, data: bytes) -> int | None:
+        """
+        :param data: the bytes received that have not been dispatched yet
+        :return: the length of the first frame in bytes, or None if it can not be told (yet)
+        """
+        raise NotImplementedError()
+
+
+class LengthPrefixedFramer(Framer):
+    """
+    Frames containing a length field, such as the MBAP header of Modbus TCP.
+
+    :param offset: where the length field starts in the frame
+    :param size: the number of bytes of the length field
+    :param byteorder: "big" or "little"
+    :param extra: the number of bytes of the frame that the length does not count
+    """
+
+    def __init__(self, offset: int, size: int, byteorder: str, extra: int) -> None:
+        self._offset = offset
+        self._end = offset + size
+        self._byteorder = byteorder
+        self._extra = extra
+
+    def frame_length(self, data: bytes) -> int | None:
+        if len(data) < self._end:
+            return None
+        return self._extra + int.from_bytes(data[self._offset : self._end], self._byteorder)
+
+
+class ModbusRtuFramer(Framer):
+    """
+    Modbus RTU requests, whose length follows from the function code. Function codes other than
+    read holding registers (3), write single register (6) and write multiple registers (16) are
+    left to the read timeout.
+    """
+
+    # Address, function code, register address, register count or value, CRC
+    _FIXED_LENGTHS = {3: 8, 6: 8}
+
+    def frame_length(self, data: bytes) -> int | None:
+        if len(data) < 2:
+            return None
+        function_code = data[1]
+        if function_code in self._FIXED_LENGTHS:
+            return self._FIXED_LENGTHS[function_code]
+        if function_code == 16 and len(data) >= 7:
+            # Address, function code, register address, register count, byte count, values, CRC
+            return 9 + data[6]
+        return None
+
+
+class FramedStreamHandler(DeferredReplyStreamHandler):
+    """
+    Stream handler that dispatches every complete frame found by the ``framer`` of its interface.
+    """
+
+    def collect_incoming_data(self, data: bytes) -> None:
+        super().collect_incoming_data(data)
+
+        framer = self._target.framer
+        pending = b"".join(self._buffer)
+        length = framer.frame_length(pending)
+        while length is not None and 0 < length <= len(pending):
+            self._buffer = [pending[:length]]
+            self.found_terminator()
+            pending = pending[length:]
+            length = framer.frame_length(pending)
+
+        self._buffer = [pending] if pending else []
+
+
+class FramedStreamServer(StreamServer):
+    def handle_accept(self) -> None:
+        pair = self.accept()
+        if pair is not None:
+            sock, addr = pair
+            handler = FramedStreamHandler(sock, self.target, self)
+
+            self._accepted_connections.append(handler)
+
+
+class FramedStreamAdapter(StreamAdapter):
+    """
+    Stream adapter whose connections split requests into frames with the ``framer`` of the
+    interface rather than with a terminator or the read timeout.
+    """
+
+    def start_server(self) -> None:
+        if self._server is None:
+            self._server = FramedStreamServer(
+                self._options.bind_address,
+                self._options.port,
+                self.interface,
+                self.device_lock,
+            )
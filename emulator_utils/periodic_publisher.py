@@ -0,0 +1,193 @@
+"""
+A shared scheduler for stream interfaces that send unsolicited messages at a fixed rate.
+
+Instead of starting a new :class:`threading.Timer` for every message, an interface registers
+with the :class:`PeriodicPublisher` once, giving the rate and a function that makes the next
+message:
+
+.. sourcecode:: Python
+
+    class SomeInterface(StreamInterface):
+        def __init__(self):
+            super().__init__()
+            self.publication = shared_publisher().register(self, 10.0, self.make_message)
+
+        def make_message(self):
+            return None if not self.device.connected else b"..."
+
+All publications are sent from one scheduler thread. Each one is scheduled on a fixed grid of
+deadlines from the time it was registered, so the rate does not drift however long it takes to
+make and send the messages. If the scheduler falls behind by more than a period the missed
+messages are dropped and counted rather than sent in a burst.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Callable
+
+from lewis.core.logging import has_log
+
+
+class Publication:
+    """
+    A message sent by a stream interface at a fixed rate, as registered with
+    :meth:`PeriodicPublisher.register`.
+
+    :param publisher: the publisher that schedules the message
+    :param interface: the stream interface whose connected client the message is sent to
+    :param rate: the number of messages per second
+    :param message_factory: function returning the next message, or None to skip sending it
+    """
+
+    def __init__(
+        self,
+        publisher: "PeriodicPublisher",
+        interface: Any,
+        rate: float,
+        message_factory: Callable[[], Any],
+    ) -> None:
+        self.interface = interface
+        self.message_factory = message_factory
+        self.sent = 0
+        self.missed = 0
+        self.errors = 0
+        self.cancelled = False
+        self._publisher = publisher
+        self._period = 0.0
+        self._deadline = 0.0
+        self._failing = False
+        self.rate = rate
+
+    @property
+    def rate(self) -> float:
+        """
+        The number of messages per second. A new rate takes effect after the next message.
+        """
+        return 1.0 / self._period
+
+    @rate.setter
+    def rate(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError("The rate of a publication must be positive, not {}".format(rate))
+        self._period = 1.0 / rate
+
+    def cancel(self) -> None:
+        """
+        Stops sending the message.
+        """
+        self.cancelled = True
+
+    def _publish(self) -> None:
+        try:
+            message = self.message_factory()
+            if message is None:
+                return
+            try:
+                handler = self.interface.handler
+            except AttributeError:
+                # Happens if no client is currently connected.
+                return
+            handler.unsolicited_reply(message)
+        except Exception:
+            self.errors += 1
+            if not self._failing:
+                self._publisher.log.exception(
+                    "Could not send unsolicited message from %s", type(self.interface).__name__
+                )
+            self._failing = True
+        else:
+            self.sent += 1
+            self._failing = False
+
+    def _advance(self, now: float) -> float:
+        self._deadline += self._period
+        if self._deadline <= now:
+            missed = int((now - self._deadline) / self._period) + 1
+            self.missed += missed
+            self._deadline += missed * self._period
+        return self._deadline
+
+
+@has_log
+class PeriodicPublisher:
+    """
+    Sends the messages of any number of publications from a single scheduler thread, which is
+    started when the first publication is registered.
+
+    :param clock: monotonic clock the deadlines are measured with, in seconds
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._queue = []
+        self._order = itertools.count()
+        self._thread = None
+
+    def register(
+        self, interface: Any, rate: float, message_factory: Callable[[], Any]
+    ) -> Publication:
+        """
+        Starts sending a message to the client connected to a stream interface at a fixed rate.
+
+        :param interface: the stream interface whose connected client the message is sent to
+        :param rate: the number of messages per second
+        :param message_factory: function returning the next message, or None to skip sending it
+        :return: the publication, which can be used to change the rate or cancel it
+        """
+        publication = Publication(self, interface, rate, message_factory)
+        publication._deadline = self._clock() + publication._period
+
+        with self._condition:
+            self._push(publication)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="PeriodicPublisher", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+        return publication
+
+    def _push(self, publication: Publication) -> None:
+        heapq.heappush(self._queue, (publication._deadline, next(self._order), publication))
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+
+                deadline, _, publication = self._queue[0]
+                delay = deadline - self._clock()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+
+                heapq.heappop(self._queue)
+
+            if publication.cancelled:
+                continue
+
+            publication._publish()
+
+            with self._condition:
+                publication._advance(self._clock())
+                self._push(publication)
+
+
+_shared_publisher = None
+_shared_publisher_lock = threading.Lock()
+
+
+def shared_publisher() -> PeriodicPublisher:
+    """
+    :return: the publisher shared by all emulators running in this process
+    """
+    global _shared_publisher
+    with _shared_publisher_lock:
+        if _shared_publisher is None:
+            _shared_publisher = PeriodicPublisher()
+        return _shared_publisher
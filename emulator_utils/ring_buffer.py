@@ -0,0 +1,96 @@
+"""
+A fixed-capacity history of records stored in a preallocated NumPy array.
+
+Appending overwrites the oldest record once the buffer is full, so a device can record on every
+simulation cycle for as long as it runs without its memory growing. Appending writes a record in
+place and allocates no arrays:
+
+.. sourcecode:: Python
+
+    history = RingBuffer(10000, [("time", "f8"), ("value", "f8")])
+    history.append(clock.time(), value)
+    recent = history.window("time", clock.time() - 60, clock.time())
+"""
+
+from typing import Any
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    :param capacity: the number of records kept
+    :param dtype: the NumPy data type of a record, usually a structured type with named fields
+    """
+
+    def __init__(self, capacity: int, dtype: Any) -> None:
+        if capacity < 1:
+            raise ValueError(
+                "The capacity of a ring buffer must be at least 1, not {}".format(capacity)
+            )
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._next = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, *values: Any) -> None:
+        """
+        Adds a record, overwriting the oldest one if the buffer is full.
+
+        :param values: the fields of the record, or the value for a buffer of plain values
+        """
+        self._data[self._next] = values if len(values) > 1 else values[0]
+        self._next = (self._next + 1) % len(self._data)
+        self._size = min(self._size + 1, len(self._data))
+
+    def clear(self) -> None:
+        self._next = 0
+        self._size = 0
+
+    def _segments(self) -> tuple[np.ndarray, ...]:
+        """
+        :return: views of the records from oldest to newest, in up to two parts
+        """
+        if self._size < len(self._data):
+            return (self._data[: self._size],)
+        return self._data[self._next :], self._data[: self._next]
+
+    def to_array(self) -> np.ndarray:
+        """
+        :return: a copy of all records from oldest to newest
+        """
+        return np.concatenate(self._segments())
+
+    def latest(self, count: int) -> np.ndarray:
+        """
+        :param count: the number of records to return
+        :return: a copy of the newest records (fewer if there are not as many), oldest first
+        """
+        count = min(count, self._size)
+        if count <= self._next:
+            return self._data[self._next - count : self._next].copy()
+        return np.concatenate((self._data[self._next - count :], self._data[: self._next]))
+
+    def window(self, field: str, low: float, high: float) -> np.ndarray:
+        """
+        Finds the records whose field lies between two values, for a field that never decreases
+        from one record to the next, such as a time stamp.
+
+        :param field: the name of the field
+        :param low: the lowest value to include
+        :param high: the highest value to include
+        :return: a copy of the records, oldest first
+        """
+        parts = []
+        for segment in self._segments():
+            values = segment[field]
+            start = np.searchsorted(values, low, side="left")
+            end = np.searchsorted(values, high, side="right")
+            parts.append(segment[start:end])
+        return np.concatenate(parts)
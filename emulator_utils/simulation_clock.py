@@ -0,0 +1,158 @@
+"""
+A clock for simulated devices that can run faster than real time or be stepped by hand.
+
+Lewis passes every device the time since its last cycle, multiplied by the speed given with
+``--speed``. Anything a device times itself from the wall clock, with :func:`time.time` or
+:meth:`datetime.datetime.now`, ignores that speed. So do states that move at a rate chosen to
+keep tests short rather than the rate of the real device.
+
+A device that adds :class:`SimulationClockMixin` in front of ``StateMachineDevice`` in its bases
+has a :class:`SimulationClock` in ``self.clock``. The clock is advanced by every simulation cycle
+and the (possibly scaled) time step is what the state machine sees as ``dt``. States and timers
+read ``device.clock.time()`` and ``device.clock.now()`` instead of the wall clock:
+
+.. sourcecode:: Python
+
+    class SimulatedDevice(SimulationClockMixin, StateMachineDevice):
+        def _initialize_data(self):
+            self.started_at = self.clock.time()
+
+Through the backdoor, ``clock_speed`` speeds the device up on top of the simulation speed, for
+example ``50`` to finish a multi-hour ramp at a realistic rate within minutes. Setting
+``clock_stepping`` stops the clock, after which it only moves by the seconds passed to
+``step_clock``, so that tests can advance a device by an exact amount of time.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+
+class SimulationClock:
+    """
+    Simulated time, which starts at the current wall clock time and then advances with the
+    simulation cycles of a device.
+
+    :param speed: how many simulated seconds pass per second of simulation time
+    """
+
+    def __init__(self, speed: float = 1.0) -> None:
+        self._lock = threading.Lock()
+        self._time = time.time()
+        self._pending_step = 0.0
+        self.stepping = False
+        self.speed = speed
+
+    @property
+    def speed(self) -> float:
+        """
+        How many simulated seconds pass per second of simulation time, while not stepping.
+        """
+        return self._speed
+
+    @speed.setter
+    def speed(self, speed: float) -> None:
+        if speed < 0:
+            raise ValueError("The speed of a simulation clock can not be negative.")
+        self._speed = speed
+
+    def time(self) -> float:
+        """
+        :return: the simulated time in seconds since the epoch, like :func:`time.time`
+        """
+        return self._time
+
+    def now(self) -> datetime:
+        """
+        :return: the simulated local date and time, like :meth:`datetime.datetime.now`
+        """
+        return datetime.fromtimestamp(self._time)
+
+    def step(self, seconds: float) -> None:
+        """
+        Moves the clock on by a number of seconds with the next simulation cycle. Steps that
+        are requested before the cycle are added up.
+
+        :param seconds: the time to move on by
+        """
+        if seconds < 0:
+            raise ValueError("A simulation clock can not be stepped backwards.")
+        with self._lock:
+            self._pending_step += seconds
+
+    def advance(self, dt: float) -> float:
+        """
+        Moves the clock on by one simulation cycle.
+
+        :param dt: the simulation time that passed since the last cycle in seconds
+        :return: the simulated time that passed in seconds
+        """
+        with self._lock:
+            if self.stepping:
+                dt = 0.0
+            else:
+                dt *= self._speed
+            dt += self._pending_step
+            self._pending_step = 0.0
+            self._time += dt
+        return dt
+
+
+class _ClockControls:
+    """
+    The members through which the clock of a device is controlled from the backdoor.
+    """
+
+    @property
+    def clock_speed(self) -> float:
+        """
+        Simulated seconds per second of simulation time.
+        """
+        return self.clock.speed
+
+    @clock_speed.setter
+    def clock_speed(self, speed: float) -> None:
+        self.clock.speed = float(speed)
+
+    @property
+    def clock_stepping(self) -> bool:
+        """
+        Whether the clock only moves on when it is stepped with :meth:`step_clock`.
+        """
+        return self.clock.stepping
+
+    @clock_stepping.setter
+    def clock_stepping(self, stepping: bool) -> None:
+        self.clock.stepping = bool(stepping)
+
+    def step_clock(self, seconds: float) -> None:
+        """
+        Moves the clock on by a number of seconds with the next simulation cycle.
+        """
+        self.clock.step(float(seconds))
+
+
+CLOCK_CONTROLS = ("clock_speed", "clock_stepping", "step_clock")
+
+
+class SimulationClockMixin:
+    """
+    Gives a device a :class:`SimulationClock` in ``self.clock``, which is created before
+    ``_initialize_data`` is called and drives the ``dt`` of the state machine.
+
+    The backdoor of lewis leaves out every member a device inherits, so the members in
+    ``CLOCK_CONTROLS`` are not defined here but added to each class that uses the mixin.
+    """
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        for name in CLOCK_CONTROLS:
+            if name not in vars(cls):
+                setattr(cls, name, vars(_ClockControls)[name])
+
+    def __init__(self, *args, **kwargs) -> None:
+        self.clock = SimulationClock()
+        super().__init__(*args, **kwargs)
+
+    def process(self, dt: float = 0) -> None:
+        super().process(self.clock.advance(dt))
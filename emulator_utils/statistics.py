@@ -0,0 +1,106 @@
+from bisect import bisect_left
+from collections import deque
+
+
+class LatencyStatistics:
+    """
+    Accumulates durations (e.g. simulation cycle times or request latencies).
+
+    Count, mean and maximum cover every sample recorded since the last reset. Percentiles are
+    computed over a bounded window of the most recent samples so that memory use stays constant
+    no matter how long the emulator runs.
+    """
+
+    def __init__(self, window: int = 1024) -> None:
+        """
+        :param window: number of recent samples to keep for percentile calculations
+        """
+        self._samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        Add one sample.
+
+        :param seconds: the duration to record in seconds
+        """
+        self._samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """
+        :param fraction: the percentile to calculate as a fraction, e.g. 0.99
+        :return: the percentile of the recent samples in seconds, 0 if there are none
+        """
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def reset(self) -> None:
+        self._samples.clear()
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        """
+        :return: a summary of the samples with durations in milliseconds
+        """
+        return {
+            "count": self.count,
+            "mean_ms": self.mean * 1000,
+            "max_ms": self.maximum * 1000,
+            "p50_ms": self.percentile(0.5) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+        }
+
+
+# Upper bounds of the histogram buckets in seconds: 1, 2 and 5 times each power of ten from 10 us
+# to 10 s, so a histogram is a fixed size however many samples it counts
+HISTOGRAM_BOUNDS = tuple(
+    step * 10.0**exponent for exponent in range(-5, 1) for step in (1, 2, 5)
+) + (10.0,)
+
+
+class LatencyHistogram:
+    """
+    Counts durations in fixed buckets, so the whole distribution is kept in constant memory.
+
+    :param bounds: ascending upper bounds of the buckets in seconds, durations above the last
+        bound are counted in an extra overflow bucket
+    """
+
+    def __init__(self, bounds: tuple[float, ...] = HISTOGRAM_BOUNDS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+
+    def record(self, seconds: float) -> None:
+        """
+        Add one sample.
+
+        :param seconds: the duration to record in seconds
+        """
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+
+    def reset(self) -> None:
+        self.counts = [0] * (len(self.bounds) + 1)
+
+    def as_dict(self) -> dict[str, list]:
+        """
+        :return: the upper bounds of the buckets in milliseconds and the number of samples in each
+            bucket, the last count being that of the samples above all bounds
+        """
+        return {
+            "bounds_ms": [bound * 1000 for bound in self.bounds],
+            "counts": list(self.counts),
+        }
@@ -0,0 +1,47 @@
+import random
+import unittest
+
+from hamcrest import assert_that, equal_to, is_
+
+from emulator_utils.checksums import crc16, crc16_matches, crc16_value
+
+
+def bitwise_crc16_modbus(data):
+    """CRC-16/MODBUS computed a bit at a time, without a lookup table."""
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+class Crc16ModbusTests(unittest.TestCase):
+    """Tests the CRC-16/MODBUS checksum used by Modbus RTU frames."""
+
+    def test_that_GIVEN_the_standard_check_string_THEN_the_check_value_is_0x4B37(self):
+        assert_that(crc16_value(b"123456789"), is_(equal_to(0x4B37)))
+
+    def test_that_GIVEN_the_standard_check_string_THEN_the_checksum_is_sent_low_byte_first(self):
+        assert_that(crc16(b"123456789"), is_(equal_to(b"\x37\x4b")))
+
+    def test_that_GIVEN_no_data_THEN_the_checksum_is_the_initial_value(self):
+        assert_that(crc16_value(b""), is_(equal_to(0xFFFF)))
+
+    def test_that_GIVEN_a_frame_with_its_checksum_THEN_the_checksum_over_it_all_is_zero(self):
+        # Given:
+        frame = bytes.fromhex("010300000002")
+
+        # When:
+        result = crc16(frame + crc16(frame))
+
+        # Then:
+        assert_that(result, is_(equal_to(b"\x00\x00")))
+        assert_that(crc16_matches(frame, crc16(frame)), is_(True))
+        assert_that(crc16_matches(frame, b"\x00\x00"), is_(False))
+
+    def test_that_GIVEN_random_data_THEN_the_table_gives_the_same_checksum_as_a_bitwise_crc(self):
+        generator = random.Random(0)
+        for length in range(64):
+            data = bytes(generator.randrange(256) for _ in range(length))
+            assert_that(crc16_value(data), is_(equal_to(bitwise_crc16_modbus(data))))
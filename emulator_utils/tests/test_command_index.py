@@ -0,0 +1,102 @@
+import unittest
+
+from hamcrest import assert_that, contains_exactly, equal_to, is_, none
+from lewis.adapters.stream import Func, scanf
+
+from emulator_utils.command_index import CommandIndex
+from lewis_emulators.mercuryitc.device import SimulatedMercuryitc
+from lewis_emulators.mercuryitc.interfaces.stream_interface import MercuryitcInterface
+
+# Example text for each kind of argument in the Mercury iTC command patterns
+EXAMPLE_ARGUMENTS = {
+    "([^:]*)": "MB1.T1",
+    r"([+-]?\d+\.?\d*)": "-1.5",
+    "(ON|OFF)": "ON",
+}
+
+
+def linear_search(commands, request):
+    """The command and arguments lewis finds by trying every bound command in turn."""
+    for command in commands:
+        arguments = command.matcher.match(request)
+        if arguments is not None:
+            return command, arguments
+    return None
+
+
+def example_requests(pattern):
+    """Requests that match a Mercury iTC command pattern, and some near misses."""
+    request = pattern.replace("(?:@1)?", "").rstrip("$")
+    for argument, example in EXAMPLE_ARGUMENTS.items():
+        request = request.replace(argument, example)
+    for prefix in ("", "@1", "@2"):
+        yield (prefix + request).encode()
+        yield (prefix + request[:-1]).encode()
+        yield (prefix + request + ":").encode()
+        yield (prefix + request.lower()).encode()
+
+
+def command(pattern):
+    """A command that returns its own pattern, so that the tests can tell which one handled it."""
+    matcher = scanf(pattern) if pattern.startswith("%") else pattern
+
+    def handler(*args):
+        return pattern
+
+    return Func(handler, matcher)
+
+
+class CommandIndexTests(unittest.TestCase):
+    """Tests that a command index dispatches requests exactly like lewis' linear search."""
+
+    def assert_same_dispatch(self, commands, requests):
+        index = CommandIndex(commands)
+        for request in requests:
+            assert_that(index.find(request), is_(equal_to(linear_search(commands, request))))
+
+    def test_that_GIVEN_the_mercuryitc_commands_THEN_requests_are_dispatched_like_a_linear_search(
+        self,
+    ):
+        # Given:
+        interface = MercuryitcInterface()
+        interface.device = SimulatedMercuryitc()
+        commands = interface.bound_commands[0].commands
+
+        # Then:
+        requests = [
+            request for bound in commands for request in example_requests(bound.matcher.pattern)
+        ]
+        self.assert_same_dispatch(commands, requests + [b"", b"@1", b"READ:", b"NONSENSE"])
+
+    def test_that_GIVEN_overlapping_commands_THEN_the_first_matching_command_wins(self):
+        # Given:
+        commands = [
+            command(r"^SET:(\d+)$"),
+            command(r"^SET:(.*)$"),
+            command(r"(?i)^set:x$"),
+            command(r"^SE(?P<rest>.*)$"),
+            command(r"^(A)\1$"),
+            command("%d"),
+            command(r"^(?:@1)?S.*$"),
+            command(r".*"),
+        ]
+
+        # Then:
+        requests = [b"SET:1", b"SET:x", b"set:x", b"SEx", b"AA", b"42", b"@1Sx", b"@2", b""]
+        self.assert_same_dispatch(commands, requests)
+
+    def test_that_GIVEN_a_request_WHEN_processed_THEN_the_matching_command_is_called(
+        self,
+    ):
+        # Given:
+        index = CommandIndex([command(r"^A(\d)$"), command(r"^(?:@1)?B(\d)(\d)$")])
+
+        # When:
+        can_process = index.can_process(b"@1B23")
+        reply = index.process_request(b"@1B23")
+
+        # Then:
+        assert_that(can_process, is_(True))
+        assert_that(reply, is_(equal_to(r"^(?:@1)?B(\d)(\d)$")))
+        assert_that(index.find(b"@1B23")[1], contains_exactly(b"2", b"3"))
+        assert_that(index.find(b"C"), is_(none()))
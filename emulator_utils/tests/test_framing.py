@@ -0,0 +1,123 @@
+import unittest
+
+from hamcrest import assert_that, contains_exactly, equal_to, is_, none
+
+from emulator_utils.checksums import crc16
+from emulator_utils.framing import (
+    FramedStreamHandler,
+    LengthPrefixedFramer,
+    ModbusRtuFramer,
+)
+
+
+def rtu_frame(hex_body):
+    body = bytes.fromhex(hex_body)
+    return body + crc16(body)
+
+
+# Read holding registers, write single register and write multiple registers (two registers)
+READ = rtu_frame("010300010002")
+WRITE = rtu_frame("010600010003")
+WRITE_MULTIPLE = rtu_frame("0110000100020400040005")
+
+# Modbus TCP: the MBAP header holds the number of bytes following its length field
+MODBUS_TCP_FRAMER = LengthPrefixedFramer(offset=4, size=2, byteorder="big", extra=6)
+TCP_READ = bytes.fromhex("000100000006010300010002")
+TCP_WRITE_MULTIPLE = bytes.fromhex("00020000000b0110000100020400040005")
+
+
+class _Interface:
+    def __init__(self, framer):
+        self.framer = framer
+
+
+class _RecordingHandler(FramedStreamHandler):
+    """A framed handler without a connection that records the requests it would dispatch."""
+
+    def __init__(self, framer):
+        self._target = _Interface(framer)
+        self._buffer = []
+        self.requests = []
+
+    def found_terminator(self):
+        self.requests.append(b"".join(self._buffer))
+        self._buffer = []
+
+
+class FramerTests(unittest.TestCase):
+    """Tests that framers work out the length of the frame at the start of the data."""
+
+    def test_that_GIVEN_modbus_rtu_frames_THEN_their_lengths_follow_from_the_function_code(self):
+        framer = ModbusRtuFramer()
+        for frame in (READ, WRITE, WRITE_MULTIPLE):
+            assert_that(framer.frame_length(frame), is_(equal_to(len(frame))))
+
+    def test_that_GIVEN_a_modbus_rtu_frame_too_short_to_tell_THEN_the_length_is_unknown(self):
+        framer = ModbusRtuFramer()
+        for data in (b"", READ[:1], WRITE_MULTIPLE[:6]):
+            assert_that(framer.frame_length(data), is_(none()))
+
+    def test_that_GIVEN_an_unsupported_modbus_rtu_function_code_THEN_the_length_is_unknown(self):
+        assert_that(ModbusRtuFramer().frame_length(rtu_frame("010100010002")), is_(none()))
+
+    def test_that_GIVEN_modbus_tcp_frames_THEN_their_lengths_follow_from_the_header(self):
+        for frame in (TCP_READ, TCP_WRITE_MULTIPLE):
+            assert_that(MODBUS_TCP_FRAMER.frame_length(frame), is_(equal_to(len(frame))))
+        assert_that(MODBUS_TCP_FRAMER.frame_length(TCP_READ[:5]), is_(none()))
+
+    def test_that_GIVEN_a_little_endian_length_prefix_THEN_its_length_is_read(self):
+        framer = LengthPrefixedFramer(offset=0, size=4, byteorder="little", extra=4)
+        assert_that(framer.frame_length(b"\x03\x00\x00\x00abc"), is_(equal_to(7)))
+
+
+class FramedStreamHandlerTests(unittest.TestCase):
+    """Tests that received data is dispatched one complete frame at a time."""
+
+    def receive(self, framer, *reads):
+        handler = _RecordingHandler(framer)
+        for data in reads:
+            handler.collect_incoming_data(data)
+        return handler
+
+    def test_that_GIVEN_rtu_frames_split_over_reads_THEN_each_frame_is_dispatched_when_complete(
+        self,
+    ):
+        # Given:
+        handler = _RecordingHandler(ModbusRtuFramer())
+
+        # When:
+        handler.collect_incoming_data(WRITE_MULTIPLE[:1])
+        handler.collect_incoming_data(WRITE_MULTIPLE[1:7])
+        dispatched_early = list(handler.requests)
+        handler.collect_incoming_data(WRITE_MULTIPLE[7:] + READ[:3])
+        handler.collect_incoming_data(READ[3:])
+
+        # Then:
+        assert_that(dispatched_early, is_(equal_to([])))
+        assert_that(handler.requests, contains_exactly(WRITE_MULTIPLE, READ))
+        assert_that(handler._buffer, is_(equal_to([])))
+
+    def test_that_GIVEN_rtu_frames_coalesced_in_one_read_THEN_they_are_dispatched_separately(self):
+        handler = self.receive(ModbusRtuFramer(), READ + WRITE + WRITE_MULTIPLE + READ)
+
+        assert_that(handler.requests, contains_exactly(READ, WRITE, WRITE_MULTIPLE, READ))
+        assert_that(handler._buffer, is_(equal_to([])))
+
+    def test_that_GIVEN_a_byte_at_a_time_THEN_length_prefixed_frames_are_dispatched_whole(self):
+        data = TCP_READ + TCP_WRITE_MULTIPLE
+        handler = self.receive(MODBUS_TCP_FRAMER, *(data[i : i + 1] for i in range(len(data))))
+
+        assert_that(handler.requests, contains_exactly(TCP_READ, TCP_WRITE_MULTIPLE))
+
+    def test_that_GIVEN_coalesced_frames_and_a_partial_frame_THEN_the_partial_frame_is_kept(self):
+        handler = self.receive(MODBUS_TCP_FRAMER, TCP_READ + TCP_WRITE_MULTIPLE + TCP_READ[:8])
+
+        assert_that(handler.requests, contains_exactly(TCP_READ, TCP_WRITE_MULTIPLE))
+        assert_that(handler._buffer, contains_exactly(TCP_READ[:8]))
+
+    def test_that_GIVEN_data_the_framer_can_not_tell_THEN_it_is_left_for_the_read_timeout(self):
+        unsupported = rtu_frame("010100010002")
+        handler = self.receive(ModbusRtuFramer(), READ + unsupported)
+
+        assert_that(handler.requests, contains_exactly(READ))
+        assert_that(handler._buffer, contains_exactly(unsupported))
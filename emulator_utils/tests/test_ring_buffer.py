@@ -0,0 +1,103 @@
+import unittest
+
+import numpy as np
+from hamcrest import assert_that, equal_to, is_
+
+from emulator_utils.ring_buffer import RingBuffer
+
+RECORD = [("time", "f8"), ("value", "f8")]
+
+
+def filled(capacity, count):
+    """A buffer with records (t, 10 * t) appended for t = 0 .. count - 1."""
+    buffer = RingBuffer(capacity, RECORD)
+    for time in range(count):
+        buffer.append(float(time), 10.0 * time)
+    return buffer
+
+
+def times(records):
+    return records["time"].tolist()
+
+
+class RingBufferTests(unittest.TestCase):
+    """Tests that a ring buffer keeps the newest records in order as it wraps around."""
+
+    def test_that_GIVEN_a_capacity_below_one_THEN_a_value_error_is_raised(self):
+        with self.assertRaises(ValueError):
+            RingBuffer(0, RECORD)
+
+    def test_that_GIVEN_a_partly_filled_buffer_THEN_all_records_are_kept_in_order(self):
+        buffer = filled(5, 3)
+
+        assert_that(len(buffer), is_(equal_to(3)))
+        assert_that(times(buffer.to_array()), is_(equal_to([0.0, 1.0, 2.0])))
+        assert_that(buffer.to_array()["value"].tolist(), is_(equal_to([0.0, 10.0, 20.0])))
+
+    def test_that_GIVEN_more_records_than_the_capacity_THEN_only_the_newest_are_kept_in_order(
+        self,
+    ):
+        for count in range(5, 13):
+            buffer = filled(5, count)
+
+            assert_that(len(buffer), is_(equal_to(5)))
+            assert_that(times(buffer.to_array()), is_(equal_to(list(range(count - 5, count)))))
+
+    def test_that_GIVEN_a_wrapped_buffer_THEN_latest_returns_the_newest_records_across_the_seam(
+        self,
+    ):
+        # Every count of records wraps the buffer at a different position
+        for count in range(0, 13):
+            buffer = filled(5, count)
+            kept = list(range(max(0, count - 5), count))
+            for latest in range(0, 8):
+                expected = kept[max(0, len(kept) - latest) :]
+                assert_that(times(buffer.latest(latest)), is_(equal_to(expected)))
+
+    def test_that_GIVEN_a_wrapped_buffer_THEN_window_returns_the_records_in_range_across_the_seam(
+        self,
+    ):
+        for count in range(0, 13):
+            buffer = filled(5, count)
+            kept = list(range(max(0, count - 5), count))
+            for low in np.arange(-1.0, 13.0, 0.5):
+                for high in np.arange(low, 13.0, 0.5):
+                    expected = [time for time in kept if low <= time <= high]
+                    window = buffer.window("time", low, high)
+                    assert_that(times(window), is_(equal_to(expected)))
+                    assert_that(
+                        window["value"].tolist(), is_(equal_to([10.0 * t for t in expected]))
+                    )
+
+    def test_that_GIVEN_latest_records_WHEN_the_buffer_is_appended_to_THEN_they_are_unchanged(self):
+        # Given:
+        buffer = filled(5, 7)
+        latest = buffer.latest(3)
+        window = buffer.window("time", 2.0, 6.0)
+
+        # When:
+        for time in range(7, 12):
+            buffer.append(float(time), 0.0)
+
+        # Then:
+        assert_that(times(latest), is_(equal_to([4.0, 5.0, 6.0])))
+        assert_that(times(window), is_(equal_to([2.0, 3.0, 4.0, 5.0, 6.0])))
+
+    def test_that_GIVEN_a_cleared_buffer_THEN_it_is_empty_and_fills_again(self):
+        # Given:
+        buffer = filled(5, 7)
+
+        # When:
+        buffer.clear()
+        buffer.append(100.0, 1.0)
+
+        # Then:
+        assert_that(len(buffer), is_(equal_to(1)))
+        assert_that(times(buffer.latest(5)), is_(equal_to([100.0])))
+
+    def test_that_GIVEN_a_buffer_of_plain_values_THEN_values_are_appended_directly(self):
+        buffer = RingBuffer(3, "f8")
+        for value in range(4):
+            buffer.append(float(value))
+
+        assert_that(buffer.to_array().tolist(), is_(equal_to([1.0, 2.0, 3.0])))
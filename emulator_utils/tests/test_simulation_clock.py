@@ -0,0 +1,120 @@
+import socket
+import threading
+import unittest
+
+from hamcrest import assert_that, close_to, equal_to, has_items, is_
+from lewis.core.control_client import ControlClient
+from lewis.core.simulation import Simulation
+
+from emulator_utils.simulation_clock import SimulationClock
+from lewis_emulators.cryogenic_sms.device import SimulatedCRYOSMS
+from lewis_emulators.instron_stress_rig.device import SimulatedInstron
+from lewis_emulators.keithley_2001.device import SimulatedKeithley2001
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class SimulationClockTests(unittest.TestCase):
+    """Tests that the simulation clock follows the simulation cycles."""
+
+    def test_that_GIVEN_a_speed_THEN_the_clock_moves_on_by_the_scaled_time(self):
+        clock = SimulationClock(speed=50.0)
+        start = clock.time()
+
+        passed = clock.advance(0.1)
+
+        assert_that(passed, is_(close_to(5.0, 1e-9)))
+        assert_that(clock.time() - start, is_(close_to(5.0, 1e-9)))
+
+    def test_that_GIVEN_stepping_THEN_the_clock_only_moves_on_by_the_steps(self):
+        # Given:
+        clock = SimulationClock()
+        clock.stepping = True
+        start = clock.time()
+
+        # When:
+        clock.advance(1.0)
+        clock.step(2.5)
+        clock.step(0.5)
+        passed = clock.advance(1.0)
+
+        # Then:
+        assert_that(passed, is_(equal_to(3.0)))
+        assert_that(clock.time() - start, is_(equal_to(3.0)))
+
+    def test_that_GIVEN_a_negative_speed_or_step_THEN_a_value_error_is_raised(self):
+        clock = SimulationClock()
+        with self.assertRaises(ValueError):
+            clock.speed = -1.0
+        with self.assertRaises(ValueError):
+            clock.step(-1.0)
+
+
+class SimulationClockBackdoorTests(unittest.TestCase):
+    """Tests that the clock of a device can be controlled through the lewis backdoor."""
+
+    def setUp(self):
+        port = free_port()
+        self.device = SimulatedKeithley2001()
+        self.simulation = Simulation(self.device, control_server="127.0.0.1:{}".format(port))
+        self.simulation.control_server.start_server()
+
+        self.serving = True
+        self.server_thread = threading.Thread(target=self.serve)
+        self.server_thread.start()
+
+        self.backdoor = ControlClient("127.0.0.1", port).get_object_collection()["device"]
+
+    def serve(self):
+        while self.serving:
+            self.simulation.control_server.process(blocking=True)
+
+    def tearDown(self):
+        self.serving = False
+        self.server_thread.join()
+        self.simulation.control_server._socket.close()
+
+    def test_that_GIVEN_devices_with_a_simulation_clock_THEN_the_backdoor_has_the_clock_controls(
+        self,
+    ):
+        expected = [
+            "device.clock_speed:get",
+            "device.clock_speed:set",
+            "device.clock_stepping:get",
+            "device.clock_stepping:set",
+            "device.step_clock",
+        ]
+
+        for device_type in (SimulatedCRYOSMS, SimulatedInstron, SimulatedKeithley2001):
+            simulation = Simulation(device_type(), control_server="127.0.0.1:0")
+            api = simulation.control_server.exposed_object.get_api()
+            assert_that(api["methods"], has_items(*expected))
+
+    def test_that_GIVEN_the_backdoor_WHEN_the_clock_speed_is_set_THEN_the_device_clock_runs_faster(
+        self,
+    ):
+        # When:
+        self.backdoor.clock_speed = 50
+
+        # Then:
+        assert_that(self.backdoor.clock_speed, is_(equal_to(50.0)))
+        assert_that(self.device.clock.speed, is_(equal_to(50.0)))
+
+    def test_that_GIVEN_the_backdoor_WHEN_the_clock_is_stepped_THEN_the_device_moves_on_exactly(
+        self,
+    ):
+        # Given:
+        self.backdoor.clock_stepping = True
+        start = self.device.clock.time()
+
+        # When:
+        self.backdoor.step_clock(12.5)
+        self.device.process(0.1)
+
+        # Then:
+        assert_that(self.backdoor.clock_stepping, is_(True))
+        assert_that(self.device.clock.time() - start, is_(equal_to(12.5)))
@@ -0,0 +1,251 @@
+"""
+Logging of the raw requests and replies of an interface, cheap enough to leave in place under load.
+
+Each interface instance creates its own :class:`TrafficLog` and records what it receives and
+sends, usually by decorating the method that handles every request with :func:`log_traffic`:
+
+.. sourcecode:: Python
+
+    class SomeInterface(StreamInterface):
+        def __init__(self):
+            super().__init__()
+            self.traffic = TrafficLog("some_device")
+
+        @log_traffic
+        def any_command(self, command):
+            ...
+
+Traffic is logged at ``DEBUG`` level to the ``lewis_emulators.traffic.<name>`` logger. Nothing is
+formatted unless that level is enabled, and then only the records that are kept: with
+``TrafficLog.sample_every`` set to N only every Nth request and its reply are logged. The hex dump
+of a frame is made when the record is written rather than when it is logged.
+
+:func:`start_traffic_file` sends all traffic records to a rotating file instead, as hex dumps or as
+compact binary records. The records are passed through a queue and written by a background thread,
+so a slow disk does not hold up the request. To log traffic to a file from a plain ``lewis``
+process, set ``LEWIS_EMULATORS_TRAFFIC_LOG`` to the path of the file before starting it, and
+optionally ``LEWIS_EMULATORS_TRAFFIC_FORMAT=binary`` and ``LEWIS_EMULATORS_TRAFFIC_SAMPLE=N``.
+
+A binary record is a little endian header of the time (double, seconds since the epoch), the
+direction (unsigned char, 0 received, 1 sent), the length of the log name (unsigned char) and the
+length of the data (unsigned int), followed by the name and the data.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import struct
+from functools import wraps
+from typing import Any, BinaryIO, Callable
+
+TRAFFIC_LOGGER = "lewis_emulators.traffic"
+
+RECEIVED = "received"
+SENT = "sent"
+DIRECTIONS = (RECEIVED, SENT)
+
+BINARY_RECORD_HEADER = struct.Struct("<dBBI")
+
+
+def _as_bytes(data: bytes | bytearray | str) -> bytes:
+    return data.encode("utf-8", "backslashreplace") if isinstance(data, str) else bytes(data)
+
+
+class _HexDump:
+    """
+    Formats a frame as space separated hex bytes, but only when the log record is written.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: bytes | str) -> None:
+        self._data = data
+
+    def __str__(self) -> str:
+        return _as_bytes(self._data).hex(" ")
+
+
+class TrafficLog:
+    """
+    Records the requests received and replies sent by an interface.
+
+    :param name: name of the log, used in the logger name and in the records
+    """
+
+    # Log only every Nth request and its reply, for all traffic logs unless set on one of them
+    sample_every = 1
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.logger = logging.getLogger("{}.{}".format(TRAFFIC_LOGGER, name))
+        self._requests = 0
+        self._sampled = False
+
+    def received(self, data: bytes | str | None) -> None:
+        """
+        Records a request. Whether it is sampled also decides whether the next reply is.
+
+        :param data: the request, nothing is recorded if it is None
+        """
+        if data is None or not self.logger.isEnabledFor(logging.DEBUG):
+            self._sampled = False
+            return
+
+        self._requests += 1
+        self._sampled = self._requests % self.sample_every == 0
+        if self._sampled:
+            self._log(RECEIVED, data)
+
+    def sent(self, data: bytes | str | None) -> None:
+        """
+        Records the reply to the last request, if that request was sampled.
+
+        :param data: the reply, nothing is recorded if it is None
+        """
+        if data is not None and self._sampled and self.logger.isEnabledFor(logging.DEBUG):
+            self._log(SENT, data)
+
+    def _log(self, direction: str, data: bytes | bytearray | str) -> None:
+        if isinstance(data, bytearray):
+            # Interfaces may reuse the buffer before the record is written
+            data = bytes(data)
+        self.logger.debug(
+            "%s %d bytes: %s",
+            direction,
+            len(data),
+            _HexDump(data),
+            extra={"traffic": (self.name, direction, data)},
+        )
+
+
+def log_traffic(f: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Decorates an interface method that takes a request as its first argument and returns the
+    reply, recording both with the ``traffic`` attribute of the interface.
+    """
+
+    @wraps(f)
+    def wrapper(self: Any, request: Any, *args: Any, **kwargs: Any) -> Any:
+        self.traffic.received(request)
+        reply = f(self, request, *args, **kwargs)
+        self.traffic.sent(reply)
+        return reply
+
+    return wrapper
+
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records as they are, leaving all formatting to the thread that writes them.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _BinaryTrafficFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Writes traffic records to a rotating file in the binary format described in the module docs.
+    """
+
+    terminator = b""
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int) -> None:
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count)
+
+    def _open(self) -> BinaryIO:
+        # The base class opens the file in text mode whenever it is rotated by size
+        return open(self.baseFilename, "ab")
+
+    def format(self, record: logging.LogRecord) -> bytes:
+        name, direction, data = record.traffic
+        name = name.encode("utf-8")
+        data = _as_bytes(data)
+        header = BINARY_RECORD_HEADER.pack(
+            record.created, DIRECTIONS.index(direction), len(name), len(data)
+        )
+        return header + name + data
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.stream is None:
+            self.stream = self._open()
+        return 0 < self.maxBytes <= self.stream.tell() + len(self.format(record))
+
+
+_listener = None
+
+
+def start_traffic_file(
+    path: str,
+    binary: bool = False,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    sample_every: int | None = None,
+) -> None:
+    """
+    Writes all traffic records to a rotating file from a background thread, instead of passing
+    them on to the other log handlers. Replaces any traffic file started before.
+
+    :param path: the file to write to
+    :param binary: whether to write binary records rather than hex dumps
+    :param max_bytes: size at which the file is rotated
+    :param backup_count: number of rotated files to keep
+    :param sample_every: if given, log only every Nth request and its reply
+    """
+    global _listener
+
+    if sample_every is not None:
+        if sample_every < 1:
+            raise ValueError("Traffic can not be sampled every {} requests".format(sample_every))
+        TrafficLog.sample_every = sample_every
+
+    if binary:
+        file_handler = _BinaryTrafficFileHandler(path, max_bytes, backup_count)
+    else:
+        file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count
+        )
+        file_handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    file_handler.addFilter(lambda record: hasattr(record, "traffic"))
+
+    stop_traffic_file()
+    records = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, file_handler)
+    _listener.start()
+
+    logger = logging.getLogger(TRAFFIC_LOGGER)
+    logger.addHandler(_RecordQueueHandler(records))
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+
+
+def stop_traffic_file() -> None:
+    """
+    Writes out the queued traffic records and closes the traffic file, if one was started.
+    """
+    global _listener
+
+    logger = logging.getLogger(TRAFFIC_LOGGER)
+    for handler in list(logger.handlers):
+        if isinstance(handler, _RecordQueueHandler):
+            logger.removeHandler(handler)
+    logger.setLevel(logging.NOTSET)
+    logger.propagate = True
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_traffic_file)
+
+if os.environ.get("LEWIS_EMULATORS_TRAFFIC_LOG"):
+    start_traffic_file(
+        os.environ["LEWIS_EMULATORS_TRAFFIC_LOG"],
+        binary=os.environ.get("LEWIS_EMULATORS_TRAFFIC_FORMAT", "hex").lower() == "binary",
+        sample_every=int(os.environ.get("LEWIS_EMULATORS_TRAFFIC_SAMPLE", 1)),
+    )
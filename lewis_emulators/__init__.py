@@ -1,2 +1,16 @@
 # DO NOT DELETE THIS FILE - LEWIS FRAMEWORK REQUIRES THE DIRECTORY TO BE IMPORTABLE
 from __future__ import absolute_import
+
+
+def _enable_command_statistics_from_environment():
+    # Command statistics have to be enabled before lewis binds the interfaces of the device.
+    # Everything is imported in here because lewis lists the names in this package as devices.
+    import os
+
+    if os.environ.get("LEWIS_EMULATORS_COMMAND_STATISTICS", "0") not in ("", "0"):
+        from emulator_utils.command_statistics import enable_command_statistics
+
+        enable_command_statistics()
+
+
+_enable_command_statistics_from_environment()
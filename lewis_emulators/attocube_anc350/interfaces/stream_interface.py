@@ -4,6 +4,8 @@ from lewis.adapters.stream import Cmd, StreamInterface
 from lewis.core.logging import has_log
 from lewis.utils.byte_conversions import int_to_raw_bytes, raw_bytes_to_int
 
+from emulator_utils.framing import FramedStreamAdapter, LengthPrefixedFramer
+
 BYTES_IN_INT = 4
 HEADER_LENGTH = 4 * BYTES_IN_INT
 
@@ -105,6 +107,12 @@ class AttocubeANC350StreamInterface(StreamInterface):
     in_terminator = ""
     out_terminator = b""
 
+    # Every command starts with its length (not including the length itself)
+    adapter = FramedStreamAdapter
+    framer = LengthPrefixedFramer(
+        offset=0, size=BYTES_IN_INT, byteorder="little", extra=BYTES_IN_INT
+    )
+
     # Due to poll rate of the driver this will get individual commands
     readtimeout = 10
 
@@ -113,7 +121,9 @@ class AttocubeANC350StreamInterface(StreamInterface):
         return str(error)
 
     def any_command(self, command):
-        response = ""
+        # The replies to each request are raw bytes, so they are joined onto bytes. Starting from
+        # a str made every request fail with a TypeError.
+        response = b""
 
         if not self.device.connected:
             # Used rather than conditional_reply decorator to improve error message
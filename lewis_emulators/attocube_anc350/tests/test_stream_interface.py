@@ -0,0 +1,59 @@
+import struct
+import unittest
+
+from hamcrest import assert_that, equal_to, is_
+
+from lewis_emulators.attocube_anc350.device import SimulatedAttocubeANC350
+from lewis_emulators.attocube_anc350.interfaces.stream_interface import (
+    ID_ANC_COUNTER,
+    ID_ANC_FAST_FREQ,
+    UC_ACK,
+    UC_GET,
+    UC_REASON_OK,
+    AttocubeANC350StreamInterface,
+)
+
+
+def get(address, axis, correlation_num):
+    return struct.pack("<5i", 16, UC_GET, address, axis, correlation_num)
+
+
+def reply(address, axis, correlation_num, data):
+    return struct.pack("<7i", 24, UC_ACK, address, axis, correlation_num, UC_REASON_OK, data)
+
+
+class AttocubeANC350StreamInterfaceTests(unittest.TestCase):
+    """Tests the replies to the telegrams the driver sends."""
+
+    def setUp(self):
+        self.device = SimulatedAttocubeANC350()
+        self.interface = AttocubeANC350StreamInterface()
+        self.interface.device = self.device
+
+    def test_that_GIVEN_a_get_THEN_the_reply_is_the_bytes_of_the_acknowledgement(self):
+        # Given:
+        self.device.position = 1234
+
+        # When:
+        response = self.interface.any_command(get(ID_ANC_COUNTER, 0, 7))
+
+        # Then:
+        assert_that(response, is_(equal_to(reply(ID_ANC_COUNTER, 0, 7, 1234))))
+
+    def test_that_GIVEN_two_gets_in_one_read_THEN_both_replies_are_returned_in_order(self):
+        # When:
+        response = self.interface.any_command(
+            get(ID_ANC_COUNTER, 0, 1) + get(ID_ANC_FAST_FREQ, 2, 2)
+        )
+
+        # Then:
+        assert_that(
+            response,
+            is_(equal_to(reply(ID_ANC_COUNTER, 0, 1, 0) + reply(ID_ANC_FAST_FREQ, 2, 2, 1000))),
+        )
+
+    def test_that_GIVEN_a_disconnected_device_THEN_a_value_error_is_raised(self):
+        self.device.connected = False
+
+        with self.assertRaises(ValueError):
+            self.interface.any_command(get(ID_ANC_COUNTER, 0, 1))
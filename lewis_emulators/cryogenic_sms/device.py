@@ -1,15 +1,16 @@
 from collections import OrderedDict
-from datetime import datetime
 from typing import Callable
 
 from lewis.core.statemachine import State
 from lewis.devices import StateMachineDevice
 
+from emulator_utils.simulation_clock import SimulationClockMixin
+
 from .states import DefaultInitState, HoldingState, RampingState, TrippedState
 from .utils import RampDirection, RampTarget
 
 
-class SimulatedCRYOSMS(StateMachineDevice):
+class SimulatedCRYOSMS(SimulationClockMixin, StateMachineDevice):
     def _initialize_data(self) -> None:
         self.connected = True
 
@@ -26,6 +27,10 @@ class SimulatedCRYOSMS(StateMachineDevice):
         # ramp
         self.ramp_target = RampTarget.ZERO
         self.ramp_rate = 0.5
+        # To avoid tests taking forever, ramps go between the boundaries in roughly 8 seconds
+        # at this rate (A/s) instead of ramp_rate. Set it to None to ramp at ramp_rate, and
+        # speed up the clock if that takes too long.
+        self.simulated_ramp_rate = 0.05
 
         # paused
         self.is_paused = False
@@ -78,7 +83,7 @@ class SimulatedCRYOSMS(StateMachineDevice):
     # Utilities
 
     def timestamp_str(self) -> str:
-        return datetime.now().strftime("%H:%M:%S")
+        return self.clock.now().strftime("%H:%M:%S")
 
     def switch_mode(self, mode: str) -> None:
         if mode == "TESLA" and not self.is_output_mode_tesla:
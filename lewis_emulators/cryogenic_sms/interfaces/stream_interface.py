@@ -1,5 +1,4 @@
 import logging
-from datetime import datetime
 from typing import TYPE_CHECKING, Literal
 
 from lewis.adapters.stream import StreamInterface
@@ -167,7 +166,7 @@ class CRYOSMSStreamInterface(StreamInterface):
         return "........ {}{}".format(message, terminator)
 
     def _timestamp(self) -> str:
-        return datetime.now().strftime("%H:%M:%S")
+        return self._device.timestamp_str()
 
     def _create_log_message(self, pv: str, value: float | int | str, suffix: str = "") -> None:
         current_time = self._timestamp()
@@ -45,9 +45,9 @@ class TrippedState(State):
 class RampingState(State):
     def in_state(self, dt: float) -> None:
         device = typing.cast("SimulatedCRYOSMS", self._context)
-        # to avoid tests taking forever, ignoring actual rate in
-        # favour of value that ramps between boundaries in roughly 8 seconds
-        rate = 0.05
+        rate = device.simulated_ramp_rate
+        if rate is None:
+            rate = device.ramp_rate
         target = device.ramp_target_value()
         constant = device.constant
         if device.is_output_mode_tesla:
@@ -36,15 +36,14 @@ class CybamanStreamInterface(StreamInterface):
 
     @has_log
     def handle_error(self, request, error):
-        """If command is not recognised print and error.
+        """If command is not recognised log an error.
 
         :param request: requested string
         :param error: problem
         :return:
         """
         error = "An error occurred at request " + repr(request) + ": " + repr(error)
-        print(error)
-        self.log.debug(error)
+        self.log.error(error)
         return error
 
     @if_connected
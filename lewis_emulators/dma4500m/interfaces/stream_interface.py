@@ -40,7 +40,6 @@ class DMA4500MStreamInterface(StreamInterface):
         err_string = "command was: {}, error was: {}: {}\n".format(
             request, error.__class__.__name__, error
         )
-        print(err_string)
         self.log.error(err_string)
         return err_string
 
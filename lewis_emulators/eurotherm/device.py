@@ -1,6 +1,5 @@
 import logging
 from collections import OrderedDict
-from time import sleep
 
 from lewis.core.logging import has_log
 from lewis.devices import StateMachineDevice
@@ -21,6 +20,7 @@ class SimulatedEurotherm(StateMachineDevice):
         self.log: logging.Logger
         self._connected = True
         self.delay_time = None
+        self._reply_delay = 0.0
         self.sensors = {
             "01": SimulatedEurotherm.EurothermSensor(),
             "02": SimulatedEurotherm.EurothermSensor(),
@@ -50,10 +50,18 @@ class SimulatedEurotherm(StateMachineDevice):
 
     def _delay(self) -> None:
         """
-        Simulate a delay.
+        Simulate a delay, by holding back the reply to the request being handled.
         """
         if self.delay_time is not None:
-            sleep(self.delay_time)
+            self._reply_delay += self.delay_time
+
+    def take_reply_delay(self) -> float:
+        """
+        Returns: how long to hold back the reply to the request just handled in seconds, after
+            which the delay starts from zero for the next request.
+        """
+        delay, self._reply_delay = self._reply_delay, 0.0
+        return delay
 
     def set_delay_time(self, value: float) -> None:
         """
@@ -1,60 +1,26 @@
 import logging
-from typing import Callable, Concatenate, ParamSpec, Protocol, TypeVar
+import struct
 
 from lewis.adapters.stream import Cmd, StreamInterface
 from lewis.core.logging import has_log
-from lewis.utils.byte_conversions import BYTE, int_to_raw_bytes
 from lewis.utils.replies import conditional_reply
 
+from emulator_utils.checksums import crc16
+from emulator_utils.framing import FramedStreamAdapter, ModbusRtuFramer
+from emulator_utils.traffic_log import TrafficLog, log_traffic
 from lewis_emulators.eurotherm import SimulatedEurotherm
 
 sensor = "01"
 
-
-class HasLog(Protocol):
-    log: logging.Logger
-
-
-P = ParamSpec("P")
-T = TypeVar("T")
-T_self = TypeVar("T_self", bound=HasLog)
-
-
-def log_replies(f: Callable[Concatenate[T_self, P], T]) -> Callable[Concatenate[T_self, P], T]:
-    def _wrapper(self: T_self, *args: P.args, **kwargs: P.kwargs) -> T:
-        result = f(self, *args, **kwargs)
-        self.log.info(f"Reply in {f.__name__}: {result}")
-        return result
-
-    return _wrapper
+# Most registers a single read (function 3) or write (function 16) may cover, from the modbus spec
+MAX_READ_REGISTERS = 125
+MAX_WRITE_REGISTERS = 123
 
 
 def bytes_to_int(bytes: bytes) -> int:
     return int.from_bytes(bytes, byteorder="big", signed=True)
 
 
-def crc16(data: bytes) -> bytes:
-    """
-    CRC algorithm - translated from section 3-5 of eurotherm manual.
-    :param data: the data to checksum
-    :return: the checksum
-    """
-    crc = 0xFFFF
-
-    for b in data:
-        crc ^= b
-        for _ in range(8):
-            if crc & 1:
-                crc >>= 1
-                crc ^= 0xA001
-            else:
-                crc >>= 1
-
-            crc %= BYTE**2
-
-    return int_to_raw_bytes(crc, 2, low_byte_first=True)
-
-
 @has_log
 class EurothermModbusInterface(StreamInterface):
     """
@@ -72,6 +38,7 @@ class EurothermModbusInterface(StreamInterface):
         super().__init__()
         self.device: SimulatedEurotherm
         self.log: logging.Logger
+        self.traffic = TrafficLog("eurotherm_modbus")
         # Modbus addresses for the needle valve were obtained from Jamie,
         # full info can be found on the manuals share
         self.read_commands = {
@@ -118,23 +85,32 @@ class EurothermModbusInterface(StreamInterface):
     out_terminator = ""
     readtimeout = 10
 
+    # Modbus RTU has no length field, but the function code says how long a request is
+    adapter = FramedStreamAdapter
+    framer = ModbusRtuFramer()
+
     protocol = "eurotherm_modbus"
 
+    def reply_delay(self) -> float:
+        # Framed connections send replies to slow reads later rather than blocking the emulator
+        return self.device.take_reply_delay()
+
     def handle_error(self, request: bytes, error: BaseException | str) -> None:
         error_message = "An error occurred at request " + repr(request) + ": " + repr(error)
-        print(error_message)
         self.log.error(error_message)
 
-    @log_replies
+    @log_traffic
     @conditional_reply("connected")
     def any_command(self, command: bytes) -> bytes | None:
-        self.log.info(command)
         comms_address = command[0]
         function_code = int(command[1])
         data = command[2:-2]
 
         assert crc16(command) == b"\x00\x00", "Invalid checksum from IOC"
 
+        if function_code == 16:
+            return self.handle_write_multiple(comms_address, data)
+
         if len(data) != 4:
             raise ValueError(f"Invalid message length {len(data)}")
 
@@ -145,27 +121,45 @@ class EurothermModbusInterface(StreamInterface):
         else:
             raise ValueError(f"Unknown modbus function code: {function_code}")
 
-    def handle_read(self, comms_address: int, data: bytes) -> bytes:
-        mem_address = bytes_to_int(data[0:2])
-        words_to_read = bytes_to_int(data[2:4])
-        self.log.info(f"Attempting to read {words_to_read} words from mem address: {mem_address}")
-        reply_data = self.read_commands[mem_address]()
+    def read_register(self, mem_address: int) -> int:
+        """
+        Reads a single register. Registers without a getter read as zero so that the IOC can read
+        blocks of adjacent registers in one request even if there are gaps between them.
+
+        :param mem_address: the address of the register
+        :return: the value of the register
+        """
+        try:
+            reply_data = self.read_commands[mem_address]()
+        except KeyError:
+            self.log.debug("No getter for mem address %d, reading as 0", mem_address)
+            return 0
 
-        self.log.info(f"reply_data = {reply_data}")
         assert -0x8000 <= reply_data <= 0x7FFF, f"reply {reply_data} was outside modbus range, bug?"
+        return reply_data
 
-        reply = (
-            comms_address.to_bytes(1, byteorder="big", signed=True)
-            + b"\x03\x02"
-            + reply_data.to_bytes(2, byteorder="big", signed=True)
+    def handle_read(self, comms_address: int, data: bytes) -> bytes:
+        mem_address, words_to_read = struct.unpack(">HH", data)
+        self.log.debug(
+            "Attempting to read %d words from mem address: %d", words_to_read, mem_address
         )
+        if not 1 <= words_to_read <= MAX_READ_REGISTERS:
+            raise ValueError(f"Invalid number of registers to read: {words_to_read}")
 
+        reply_data = [
+            self.read_register(address)
+            for address in range(mem_address, mem_address + words_to_read)
+        ]
+
+        reply = struct.pack(
+            f">BBB{words_to_read}h", comms_address, 3, 2 * words_to_read, *reply_data
+        )
         return reply + crc16(reply)
 
     def handle_write(self, data: bytes, command: bytes) -> bytes | None:
         mem_address = bytes_to_int(data[0:2])
         value = bytes_to_int(data[2:4])
-        self.log.info(f"Attempting to write {value} to mem address: {mem_address}")
+        self.log.debug("Attempting to write %d to mem address: %d", value, mem_address)
         try:
             self.write_commands[mem_address](value)
         except Exception as e:
@@ -174,6 +168,34 @@ class EurothermModbusInterface(StreamInterface):
         # On write, device echos command back to IOC
         return command
 
+    def handle_write_multiple(self, comms_address: int, data: bytes) -> bytes | None:
+        mem_address, words_to_write, byte_count = struct.unpack_from(">HHB", data)
+        if not 1 <= words_to_write <= MAX_WRITE_REGISTERS:
+            raise ValueError(f"Invalid number of registers to write: {words_to_write}")
+        if byte_count != 2 * words_to_write or len(data) != 5 + byte_count:
+            raise ValueError(f"Invalid message length {len(data)}")
+
+        values = struct.unpack_from(f">{words_to_write}h", data, 5)
+        addresses = range(mem_address, mem_address + words_to_write)
+        self.log.debug("Attempting to write %s to mem addresses from: %d", values, mem_address)
+
+        # Check every register up front so that a bad address does not leave a partial write
+        unknown = [address for address in addresses if address not in self.write_commands]
+        if unknown:
+            self.log.error(f"No setter for mem addresses {unknown}")
+            return None
+
+        try:
+            for address, value in zip(addresses, values):
+                self.write_commands[address](value)
+        except Exception as e:
+            self.log.error(e)
+            return None
+
+        # On a multiple write, device replies with the start address and number of registers
+        reply = struct.pack(">BBHH", comms_address, 16, mem_address, words_to_write)
+        return reply + crc16(reply)
+
     def get_temperature(self) -> int:
         return int(self.device.current_temperature(sensor) * self.device.scaling(sensor))
 
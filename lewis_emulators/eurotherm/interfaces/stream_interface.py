@@ -5,6 +5,7 @@ from lewis.adapters.stream import StreamInterface
 from lewis.utils.command_builder import CmdBuilder
 from lewis.utils.replies import conditional_reply
 
+from emulator_utils.deferred_replies import DeferredReplyStreamAdapter
 from lewis_emulators.eurotherm import SimulatedEurotherm
 
 if_connected = conditional_reply("connected")
@@ -83,6 +84,16 @@ class EurothermStreamInterface(StreamInterface):
     out_terminator = ""
     readtimeout = 1
 
+    # Replies to slow reads are sent later rather than blocking the emulator
+    adapter = DeferredReplyStreamAdapter
+
+    def reply_delay(self) -> float:
+        """Get how long to hold back the reply to the request just handled.
+
+        Returns: the delay in seconds.
+        """
+        return self.device.take_reply_delay()
+
     # calculate a eurotherm xor checksum character from a data string
     def make_checksum(self, chars: str) -> str:
         """Make a checksum to send after a read or write command.
@@ -1,3 +1,4 @@
+import struct
 from collections import OrderedDict
 
 from lewis.devices import StateMachineDevice
@@ -5,12 +6,87 @@ from lewis.devices import StateMachineDevice
 from .states import DefaultState
 
 
+class _WordValue(object):
+    """A type of value stored in the plc memory, taking up one or two big endian words. Values taking up two words are
+    stored with the least significant word first.
+    """
+
+    def __init__(self, value_struct):
+        self._struct = value_struct
+        self.size = value_struct.size
+
+    def pack_into(self, memory, offset, value):
+        raw = self._struct.pack(value)
+        memory[offset : offset + self.size] = raw if self.size == 2 else raw[2:] + raw[:2]
+
+    def unpack_from(self, memory, offset):
+        raw = memory[offset : offset + self.size]
+        return self._struct.unpack(raw if self.size == 2 else raw[2:] + raw[:2])[0]
+
+
+class _IntWordValue(_WordValue):
+    """An integer stored in the plc memory. Integers out of the signed range wrap around, so that unsigned values can
+    be stored as well.
+    """
+
+    def pack_into(self, memory, offset, value):
+        bits = 8 * self.size
+        value = int(value) & ((1 << bits) - 1)
+        if value >= 1 << (bits - 1):
+            value -= 1 << bits
+        super(_IntWordValue, self).pack_into(memory, offset, value)
+
+
+_INT16 = _IntWordValue(struct.Struct(">h"))
+_INT32 = _IntWordValue(struct.Struct(">i"))
+_FLOAT = _WordValue(struct.Struct(">f"))
+
+
+class _TypedMemoryView(object):
+    """A view of the plc memory that reads and writes the values of one type at the addresses that store that type,
+    and behaves like a dictionary from address to value.
+    """
+
+    def __init__(self, memory, value_type, addresses):
+        self._memory = memory
+        self._value_type = value_type
+        self._addresses = addresses
+
+    def __contains__(self, address):
+        return address in self._addresses
+
+    def __iter__(self):
+        return iter(sorted(self._addresses))
+
+    def __len__(self):
+        return len(self._addresses)
+
+    def keys(self):
+        return sorted(self._addresses)
+
+    def items(self):
+        return [(address, self[address]) for address in self]
+
+    def __getitem__(self, address):
+        if address not in self._addresses:
+            raise KeyError(address)
+        return self._value_type.unpack_from(self._memory, 2 * address)
+
+    def __setitem__(self, address, value):
+        if address not in self._addresses:
+            raise KeyError(address)
+        self._value_type.pack_into(self._memory, 2 * address, value)
+
+
 class SimulatedFinsPLC(StateMachineDevice):
     """Class represented a simulated Helium Recovery FINS PLC.
     """
 
     HELIUM_RECOVERY_NODE = 58
 
+    # The DM area of the PLC is word addressed, from word 0 to word 32767
+    DM_AREA_SIZE = 32768
+
     #  a dictionary representing the mapping between pv names, and the memory addresses in the helium recovery FINS PLC
     #  that store the data corresponding to each PV.
     PV_NAME_MEMORY_MAPPING = {
@@ -154,6 +230,153 @@ class SimulatedFinsPLC(StateMachineDevice):
         "MASS_FLOW:HE_RSPPL:TS1:SHTR": 19884,  # TS1 mass flow target group helium resupply shutter
     }
 
+    #  the addresses of the words in the plc memory that store 16 bit ints.
+    INT16_ADDRESSES = frozenset(
+        {
+            # memory locations in the order they appear in the substitutions file (except the heartbeat)
+            19500,  # heartbeat
+            19501,  # mcp bank 1 TS2 helium gas resupply
+            19502,  # mcp bank 1 TS1 helium gas resupply
+            19503,  # mcp 1 bank 2 impure helium
+            19504,  # mcp 2 bank 2 impure helium
+            19505,  # mcp 1 bank 3 main helium storage
+            19506,  # mcp 2 bank 3 main helium storage
+            19507,  # mcp 1 bank 4 dls helium storage
+            19508,  # mcp 2 bank 4 dls helium storage
+            19509,  # mcp 1 bank 5 spare storage
+            19510,  # mcp 2 bank 5 spare storage
+            19511,  # mcp 1 bank 6 spare storage
+            19512,  # mcp 2 bank 6 spare storage
+            19513,  # mcp 1 bank 7 spare storage
+            19514,  # mcp 2 bank 7 spare storage
+            19515,  # mcp 1 bank 8 spare storage
+            19516,  # mcp 2 bank 8 spare storage
+            19517,  # mcp manifold inlet pressure from compressors
+            19518,  # mcp external temperature
+            19521,  # mass flow meter for gas flow liquefaction
+            19522,  # mass flow meter for helium fills,
+            19523,  # Kaiser compressor container internal temperature
+            19524,  # Coldbox Helium temperature
+            19525,  # Coldbox Helium temperature limit
+            19526,  # Transport dewar flash pressure
+            19533,  # helium purity
+            19534,  # dew point
+            19652,  # TS2 east flow meter
+            19653,  # O2 level TS2 east
+            19662,  # TS2 west flow meter
+            19663,  # TS2 west O2 level
+            19668,  # TS1 north O2 level
+            19669,  # TS1 south OS level
+            19697,  # TS1 window flow meter
+            19698,  # TS1 shutter flow meter
+            19699,  # TS1 void flow meter,
+            19929,  # bank 1 TS2 helium gas resupply average purity
+            19930,  # bank 1 TS1 helium gas resupply average purity
+            19931,  # bank 2 impure helium average purity
+            19933,  # bank 3 ISIS main helium purity average
+            19935,  # bank 4 DLS main helium storage purity average
+            19937,  # bank 5 ISIS helium spare storage purity average
+            19939,  # bank 6 ISIS helium spare storage purity average
+            19941,  # bank 7 ISIS helium spare storage purity average
+            19943,  # bank 8 ISIS helium spare storage purity average
+            19945,  # coldbox turbine 100 speed
+            19946,  # coldbox turbine 101 speed
+            19947,  # coldbox tempereture T106
+            19948,  # coldbox temperature transducer 111
+            19949,  # coldbox pressure transducer 102
+            19950,  # buffer pressure transducer 203
+            19951,  # purifier temperature transducer 104
+            19952,  # purifier temperature transducer 102
+            19953,  # coldbox temperature transducer 108
+            19954,  # coldbox pressure transducer 112
+            19955,  # liquefier coldbox control valve 103 %
+            19956,  # liquefier coldbox control valve 111 %
+            19957,  # liquefier coldbox control valve 112 %
+            19958,  # helium mother dewar level
+            19961,  # purifier level %
+            19962,  # impure helium supply pressure
+            19963,  # compressor low pressure control pressure
+            19964,  # compressor high pressure control pressure
+            19966,  # liquefier coldbox cv103 %
+            19972,  # control valve 2250 %
+            19974,  # control valve 2150 %
+            19975,  # control valve 2160 %
+            19982,  # liquefier alarm 1
+            19983,  # liquefier alarm 2
+            19996,  # mcp liquid helium inventory
+            # memory locations corresponding to bi records for automatic/manual mode
+            19967,  # control valve 120 automatic/manual mode
+            19969,  # control valve 121 automatic/manual mode
+            19971,  # low pressure automatic/manual
+            19973,  # high pressure automatic/manual
+            19976,  # TIC106 automatic/manual
+            19977,  # PIC112 automatic/manual
+            # memory locations corresponding to various mbbi records
+            19979,  # liquid nitrogen status
+            19968,  # control valve 120 position
+            19970,  # control valve 121 position
+            19978,  # purifier status
+            19980,  # compressor status
+            19981,  # coldbox status
+            # the part of the plc memory storing valve statuses, in the order they appear in the memory map
+            19875,  # liquefier coldbox motorised valve 108 status
+            19871,  # control valve 112 status
+            19872,  # liquefier compressor control valve 2150 status
+            19873,  # liquefier compressor control valve 2160 status
+            19874,  # liquefier compressor control valve 2250 status
+            19984,  # motorised valve 110 status
+            19985,  # motorised valve 160 status
+            19986,  # motorised valve 163 status
+            19987,  # motorised valve 167 status
+            19988,  # motorised valve 172 status
+            19989,  # motorised valve 174 status
+            19990,  # motorised valve 175 status
+            19991,  # motorised valve 176 status
+            19992,  # motorised valve 177 status
+            19993,  # motorised valve 178 status
+            19994,  # control valve 103 status
+            19995,  # control valve 111 status
+        }
+    )
+
+    #  the addresses in the plc memory that store 32 bit ints, in the order they appear in the memory map. Each int
+    #  takes up two words, starting from its address.
+    INT32_ADDRESSES = frozenset(
+        {
+            19700,  # R108 U40 gas counter
+            19702,  # R108 dewar farm gas counter
+            19704,  # gas counter R55 total
+            19706,  # gas counter R55 north
+            19708,  # gas counter R55 south
+            19710,  # gas counter mice hall
+            19712,  # gas counter muon
+            19714,  # gas counter PEARL, HRPD, ENGIN-X, GEM and MARI
+            19720,  # gas counter SXD and MERLIN
+            19724,  # gas counter Cryo Lab
+            19726,  # gas counter MAPS and VESUVIO
+            19728,  # gas counter SANDALS
+            19730,  # gas counter CRISP and LOQ
+            19734,  # gas counter IRIS and OSIRIS
+            19736,  # gas counter INES and TOSCA
+            19738,  # gas counter RIKEN
+            19746,  # gas counter R80 total
+            19748,  # gas counter R53
+            19750,  # gas counter R80 east
+            19752,  # gas counter WISH
+            19754,  # gas counter WISH dewar farm
+            19756,  # gas counter LARMOR and OFFSPEC
+            19758,  # gas counter ZOOM, SANS2D and POLREF
+            19762,  # gas counter magnet lab
+            19766,  # gas counter IMAT
+            19768,  # gas counter LET and NIMROD
+            19772,  # gas counter R80 west
+        }
+    )
+
+    # the addresses in the plc memory that store floating point numbers, in the order they appear in the memory map.
+    # Comments explaining what each memory location is are in the name to address mappings above.
+    FLOAT_ADDRESSES = frozenset(range(19876, 19886, 2))
+
     def _initialize_data(self):
         """Initialize all of the device's attributes.
         """
@@ -162,147 +385,51 @@ class SimulatedFinsPLC(StateMachineDevice):
 
         self.connected = True
 
-        #  represents the part of the plc memory that stores 16 bit ints.
-        self.int16_memory = {
-            # memory locations in the order they appear in the substitutions file (except the heartbeat)
-            19500: 0,  # heartbeat
-            19501: 0,  # mcp bank 1 TS2 helium gas resupply
-            19502: 0,  # mcp bank 1 TS1 helium gas resupply
-            19503: 0,  # mcp 1 bank 2 impure helium
-            19504: 0,  # mcp 2 bank 2 impure helium
-            19505: 0,  # mcp 1 bank 3 main helium storage
-            19506: 0,  # mcp 2 bank 3 main helium storage
-            19507: 0,  # mcp 1 bank 4 dls helium storage
-            19508: 0,  # mcp 2 bank 4 dls helium storage
-            19509: 0,  # mcp 1 bank 5 spare storage
-            19510: 0,  # mcp 2 bank 5 spare storage
-            19511: 0,  # mcp 1 bank 6 spare storage
-            19512: 0,  # mcp 2 bank 6 spare storage
-            19513: 0,  # mcp 1 bank 7 spare storage
-            19514: 0,  # mcp 2 bank 7 spare storage
-            19515: 0,  # mcp 1 bank 8 spare storage
-            19516: 0,  # mcp 2 bank 8 spare storage
-            19517: 0,  # mcp manifold inlet pressure from compressors
-            19518: 0,  # mcp external temperature
-            19521: 0,  # mass flow meter for gas flow liquefaction
-            19522: 0,  # mass flow meter for helium fills,
-            19523: 0,  # Kaiser compressor container internal temperature
-            19524: 0,  # Coldbox Helium temperature
-            19525: 0,  # Coldbox Helium temperature limit
-            19526: 0,  # Transport dewar flash pressure
-            19533: 0,  # helium purity
-            19534: 0,  # dew point
-            19652: 0,  # TS2 east flow meter
-            19653: 0,  # O2 level TS2 east
-            19662: 0,  # TS2 west flow meter
-            19663: 0,  # TS2 west O2 level
-            19668: 0,  # TS1 north O2 level
-            19669: 0,  # TS1 south OS level
-            19697: 0,  # TS1 window flow meter
-            19698: 0,  # TS1 shutter flow meter
-            19699: 0,  # TS1 void flow meter,
-            19929: 0,  # bank 1 TS2 helium gas resupply average purity
-            19930: 0,  # bank 1 TS1 helium gas resupply average purity
-            19931: 0,  # bank 2 impure helium average purity
-            19933: 0,  # bank 3 ISIS main helium purity average
-            19935: 0,  # bank 4 DLS main helium storage purity average
-            19937: 0,  # bank 5 ISIS helium spare storage purity average
-            19939: 0,  # bank 6 ISIS helium spare storage purity average
-            19941: 0,  # bank 7 ISIS helium spare storage purity average
-            19943: 0,  # bank 8 ISIS helium spare storage purity average
-            19945: 0,  # coldbox turbine 100 speed
-            19946: 0,  # coldbox turbine 101 speed
-            19947: 0,  # coldbox tempereture T106
-            19948: 0,  # coldbox temperature transducer 111
-            19949: 0,  # coldbox pressure transducer 102
-            19950: 0,  # buffer pressure transducer 203
-            19951: 0,  # purifier temperature transducer 104
-            19952: 0,  # purifier temperature transducer 102
-            19953: 0,  # coldbox temperature transducer 108
-            19954: 0,  # coldbox pressure transducer 112
-            19955: 0,  # liquefier coldbox control valve 103 %
-            19956: 0,  # liquefier coldbox control valve 111 %
-            19957: 0,  # liquefier coldbox control valve 112 %
-            19958: 0,  # helium mother dewar level
-            19961: 0,  # purifier level %
-            19962: 0,  # impure helium supply pressure
-            19963: 0,  # compressor low pressure control pressure
-            19964: 0,  # compressor high pressure control pressure
-            19966: 0,  # liquefier coldbox cv103 %
-            19972: 0,  # control valve 2250 %
-            19974: 0,  # control valve 2150 %
-            19975: 0,  # control valve 2160 %
-            19982: 0,  # liquefier alarm 1
-            19983: 0,  # liquefier alarm 2
-            19996: 0,  # mcp liquid helium inventory
-            # memory locations corresponding to bi records for automatic/manual mode
-            19967: 0,  # control valve 120 automatic/manual mode
-            19969: 0,  # control valve 121 automatic/manual mode
-            19971: 0,  # low pressure automatic/manual
-            19973: 0,  # high pressure automatic/manual
-            19976: 0,  # TIC106 automatic/manual
-            19977: 0,  # PIC112 automatic/manual
-            # memory locations corresponding to various mbbi records
-            19979: 0,  # liquid nitrogen status
-            19968: 0,  # control valve 120 position
-            19970: 0,  # control valve 121 position
-            19978: 0,  # purifier status
-            19980: 0,  # compressor status
-            19981: 0,  # coldbox status
-            # the part of the plc memory storing valve statuses, in the order they appear in the memory map
-            19875: 0,  # liquefier coldbox motorised valve 108 status
-            19871: 0,  # control valve 112 status
-            19872: 0,  # liquefier compressor control valve 2150 status
-            19873: 0,  # liquefier compressor control valve 2160 status
-            19874: 0,  # liquefier compressor control valve 2250 status
-            19984: 0,  # motorised valve 110 status
-            19985: 0,  # motorised valve 160 status
-            19986: 0,  # motorised valve 163 status
-            19987: 0,  # motorised valve 167 status
-            19988: 0,  # motorised valve 172 status
-            19989: 0,  # motorised valve 174 status
-            19990: 0,  # motorised valve 175 status
-            19991: 0,  # motorised valve 176 status
-            19992: 0,  # motorised valve 177 status
-            19993: 0,  # motorised valve 178 status
-            19994: 0,  # control valve 103 status
-            19995: 0,  # control valve 111 status
-        }
+        #  represents the DM area of the plc memory as big endian words. The memory map stores 16 bit ints, 32 bit ints
+        #  and real numbers in it, which are read and written through typed views of the same memory.
+        self._dm_memory = bytearray(2 * SimulatedFinsPLC.DM_AREA_SIZE)
+        self._int16_view = _TypedMemoryView(
+            self._dm_memory, _INT16, SimulatedFinsPLC.INT16_ADDRESSES
+        )
+        self._int32_view = _TypedMemoryView(
+            self._dm_memory, _INT32, SimulatedFinsPLC.INT32_ADDRESSES
+        )
+        self._float_view = _TypedMemoryView(
+            self._dm_memory, _FLOAT, SimulatedFinsPLC.FLOAT_ADDRESSES
+        )
 
-        #  represents the part of the plc memory that stores 32 bit ints, in the order they appear in the memory map
-        self.int32_memory = {
-            19700: 0,  # R108 U40 gas counter
-            19702: 0,  # R108 dewar farm gas counter
-            19704: 0,  # gas counter R55 total
-            19706: 0,  # gas counter R55 north
-            19708: 0,  # gas counter R55 south
-            19710: 0,  # gas counter mice hall
-            19712: 0,  # gas counter muon
-            19714: 0,  # gas counter PEARL, HRPD, ENGIN-X, GEM and MARI
-            19720: 0,  # gas counter SXD and MERLIN
-            19724: 0,  # gas counter Cryo Lab
-            19726: 0,  # gas counter MAPS and VESUVIO
-            19728: 0,  # gas counter SANDALS
-            19730: 0,  # gas counter CRISP and LOQ
-            19734: 0,  # gas counter IRIS and OSIRIS
-            19736: 0,  # gas counter INES and TOSCA
-            19738: 0,  # gas counter RIKEN
-            19746: 0,  # gas counter R80 total
-            19748: 0,  # gas counter R53
-            19750: 0,  # gas counter R80 east
-            19752: 0,  # gas counter WISH
-            19754: 0,  # gas counter WISH dewar farm
-            19756: 0,  # gas counter LARMOR and OFFSPEC
-            19758: 0,  # gas counter ZOOM, SANS2D and POLREF
-            19762: 0,  # gas counter magnet lab
-            19766: 0,  # gas counter IMAT
-            19768: 0,  # gas counter LET and NIMROD
-            19772: 0,  # gas counter R80 west
-        }
+    @staticmethod
+    def _write_values(view, values):
+        # Addresses come back from the backdoor as strings, as JSON only has string keys
+        for address, value in values.items():
+            view[int(address)] = value
+
+    @property
+    def int16_memory(self):
+        """The 16 bit ints in the plc memory, as a dict from address to value."""
+        return dict(self._int16_view.items())
+
+    @int16_memory.setter
+    def int16_memory(self, values):
+        self._write_values(self._int16_view, values)
+
+    @property
+    def int32_memory(self):
+        """The 32 bit ints in the plc memory, as a dict from address to value."""
+        return dict(self._int32_view.items())
 
-        # represents the part of the plc memory that stores floating point numbers, in the order they appear in the
-        # memory map. Comments explaining what each memory location is are in the name to address mappings above.
-        self.float_memory = {address: 0 for address in range(19876, 19886, 2)}
+    @int32_memory.setter
+    def int32_memory(self, values):
+        self._write_values(self._int32_view, values)
+
+    @property
+    def float_memory(self):
+        """The real numbers in the plc memory, as a dict from address to value."""
+        return dict(self._float_view.items())
+
+    @float_memory.setter
+    def float_memory(self, values):
+        self._write_values(self._float_view, values)
 
     def _get_state_handlers(self):
         return {
@@ -323,6 +450,36 @@ class SimulatedFinsPLC(StateMachineDevice):
         """
         self._initialize_data()
 
+    def read_dm_words(self, memory_start_address, number_of_words):
+        """Reads consecutive words from the DM area of the plc emulator's memory. 32 bit integers and real numbers
+        take up two words, with the least significant word first. Words that are not in the memory map read as 0.
+
+        Args:
+            memory_start_address (int): The memory address from where reading starts.
+            number_of_words (int): The number of words to read, starting from the start address, inclusive.
+
+        Returns:
+            memoryview: the words, each of them as two big endian bytes. This is a view of the plc memory, so it
+                changes if the memory does.
+
+        Raises:
+            ValueError: if the words to read are not all in the DM area.
+        """
+        if (
+            memory_start_address < 0
+            or number_of_words < 0
+            or memory_start_address + number_of_words > SimulatedFinsPLC.DM_AREA_SIZE
+        ):
+            raise ValueError(
+                "Reading {} words from address {} goes outside of the DM area.".format(
+                    number_of_words, memory_start_address
+                )
+            )
+
+        return memoryview(self._dm_memory)[
+            2 * memory_start_address : 2 * (memory_start_address + number_of_words)
+        ]
+
     def set_memory(self, pv_name, data):
         """Sets a location in the plc emulator's memory to the given data.
 
@@ -340,12 +497,12 @@ class SimulatedFinsPLC(StateMachineDevice):
         """
         memory_location = SimulatedFinsPLC.PV_NAME_MEMORY_MAPPING[pv_name]
 
-        if memory_location in self.int16_memory.keys():
-            self.int16_memory[memory_location] = data
-        elif memory_location in self.int32_memory.keys():
-            self.int32_memory[memory_location] = data
-        elif memory_location in self.float_memory.keys():
-            self.float_memory[memory_location] = data
+        if memory_location in self._int16_view:
+            self._int16_view[memory_location] = data
+        elif memory_location in self._int32_view:
+            self._int32_view[memory_location] = data
+        elif memory_location in self._float_view:
+            self._float_view[memory_location] = data
         else:
             raise ValueError(
                 "the pv name maps to a memory address that is not recognized by the emulator memory."
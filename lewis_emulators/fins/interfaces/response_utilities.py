@@ -1,4 +1,4 @@
-from lewis.utils.byte_conversions import float_to_raw_bytes, int_to_raw_bytes, raw_bytes_to_int
+import struct
 
 from ..device import SimulatedFinsPLC
 
@@ -20,6 +20,14 @@ def check_is_byte(character):
         raise ValueError("the character in the string must represent a byte value")
 
 
+# FINS command codes for reading memory areas
+MEMORY_AREA_READ = 0x0101
+MULTIPLE_MEMORY_AREA_READ = 0x0104
+
+# FINS memory area code for reading words from the DM area
+DM_AREA_WORD = 0x82
+
+
 def dm_memory_area_read_response_fins_frame(
     device,
     client_network_address,
@@ -28,7 +36,7 @@ def dm_memory_area_read_response_fins_frame(
     service_id,
     memory_start_address,
     number_of_words_to_read,
-    is_float,
+    builder=None,
 ):
     """Returns a response to a DM memory area read command.
 
@@ -46,14 +54,18 @@ def dm_memory_area_read_response_fins_frame(
         service_id (int): The service ID of the original command.
         memory_start_address (int): The memory address from where reading starts.
         number_of_words_to_read (int): The number of words to be read, starting from the start address, inclusive.
-        is_float: data is a float
+        builder (FinsResponseBuilder): A builder to reuse for the response. A new one is made if not given.
 
     Returns:
         bytes: the response.
     """
-    # The length argument asks for number of bytes, and each word has two bytes
-    fins_reply = (
-        FinsResponseBuilder()
+    #  The FINS driver does not recognise 32 bit ints or real numbers. Instead, it reads them as an array of two 16 bit
+    #  ints, which the device lays out in its memory with the least significant word first.
+    data = device.read_dm_words(memory_start_address, number_of_words_to_read)
+
+    return (
+        (builder or FinsResponseBuilder())
+        .reset()
         .add_fins_frame_header(
             device.network_address,
             device.unit_address,
@@ -63,80 +75,100 @@ def dm_memory_area_read_response_fins_frame(
             service_id,
         )
         .add_fins_command_and_error_codes()
+        .add_bytes(data)
+        .build()
     )
 
-    #  The plc has 2 byte words. The command asks for 1 word if the memory address stores a 16 bit integer, or 2 words
-    #  if it stores a 32 bit integer, or a real number.
-    if number_of_words_to_read == 1:
-        fins_reply = fins_reply.add_int(device.int16_memory[memory_start_address], 2)
-
-    #  The FINS driver does not recognise 32 bit ints. Instead, it represents 32 bit ints as an array of two 16 bit
-    #  ints. Although the 16 bit ints are in big endian, in the array the first int is the least significant int, and
-    #  the second one is the most significant one.
-    elif is_float:
-        data = _convert_32bit_float_to_int16_array(device.float_memory[memory_start_address])
-        fins_reply = fins_reply.add_int(data[0], 2).add_int(data[1], 2)
-    elif number_of_words_to_read == 2:
-        # convert 32 bit int to array of two ints
-        data = _convert_32bit_int_to_int16_array(device.int32_memory[memory_start_address])
-        fins_reply = fins_reply.add_int(data[0], 2).add_int(data[1], 2)
-    # The asyn device support for ai records makes the IOC ask for 4 words, even though the real numbers are only 2
-    # words long
-
-    return fins_reply.build()
 
+def dm_multiple_memory_area_read_response_fins_frame(
+    device,
+    client_network_address,
+    client_node_address,
+    client_unit_address,
+    service_id,
+    memory_addresses,
+    builder=None,
+):
+    """Returns a response to a multiple memory area read command that reads single words from the DM area.
 
-def _convert_32bit_int_to_int16_array(number):
-    """Converts a 32 bit integer into an array of two 16 bit integers. The first 16 bit integer is the least significant
-    one, and the second is the most significant. The order of the 16 bit integers in the array is little endian.
+    Response structure is:
+        10 bytes FINS frame header.
+        2 bytes (integer): Command code, for multiple memory area read in this case.
+        2 bytes (integer): End code. Shows errors.
+        3 bytes for every word read: the memory area code followed by the word.
 
     Args:
-        number (int): The number to be converted. But the individual 16 bit ints are encoded in big endian.
+        device (device.SimulatedFinsPLC): The Lewis device.
+        client_network_address (int): The FINS network address of the client.
+        client_node_address (int): The FINS node of the client.
+        client_unit_address (int): The FINS unit address of the client.
+        service_id (int): The service ID of the original command.
+        memory_addresses (list of int): The memory addresses of the words to read, in the order they were asked for.
+        builder (FinsResponseBuilder): A builder to reuse for the response. A new one is made if not given.
 
     Returns:
-        int list: a list, with the first element being the least significant byte of the given number, and the second
-            element being the most significant byte.
+        bytes: the response.
     """
-    if type(number) != int:
-        raise TypeError("number argument must always be an integer!")
+    fins_reply = (
+        (builder or FinsResponseBuilder())
+        .reset()
+        .add_fins_frame_header(
+            device.network_address,
+            device.unit_address,
+            client_network_address,
+            client_node_address,
+            client_unit_address,
+            service_id,
+        )
+        .add_fins_command_and_error_codes(MULTIPLE_MEMORY_AREA_READ)
+    )
 
-    raw_bytes_representation = int_to_raw_bytes(number, 4, False)
+    for memory_address in memory_addresses:
+        fins_reply = fins_reply.add_int(DM_AREA_WORD, 1).add_bytes(
+            device.read_dm_words(memory_address, 1)
+        )
 
-    least_significant_byte = raw_bytes_to_int(raw_bytes_representation[2:4], low_bytes_first=False)
-    most_significant_byte = raw_bytes_to_int(raw_bytes_representation[:2], low_bytes_first=False)
+    return fins_reply.build()
 
-    return [least_significant_byte, most_significant_byte]
 
+class FinsResponseBuilder(object):
+    """Response builder which formats the responses as bytes.
 
-def _convert_32bit_float_to_int16_array(number):
-    """Converts a 32 bit real number into an array of two 16 bit integers. The first 16 bit integer is the least
-    significant one, and the second is the most significant. The order of the 16 bit integers in the array is little
-    endian.
+    The response is packed into a preallocated buffer, which grows if a response does not fit. Calling reset lets the
+    same builder, and its buffer, be reused for the next response.
 
     Args:
-        number (float): The number to be converted. But the individual 16 bit ints are encoded in big endian.
-
-    Returns:
-        int list: a list, with the first element being the least significant byte of the given number, and the second
-            element being the most significant byte.
+        capacity (int): The number of bytes to preallocate for the response.
     """
-    if type(number) != int and type(number) != float:
-        raise TypeError("number argument must always be a real number! {}".format(type(number)))
 
-    raw_bytes_representation = float_to_raw_bytes(number, False)
+    # FINS frame header: ICF, reserved byte, gate count, then the destination and source network, node and unit
+    # addresses, and the service ID
+    _HEADER = struct.Struct(">10B")
+    _COMMAND_AND_ERROR_CODES = struct.Struct(">HH")
+    _FLOAT = struct.Struct(">f")
 
-    least_significant_byte = raw_bytes_to_int(raw_bytes_representation[2:4], low_bytes_first=False)
-    most_significant_byte = raw_bytes_to_int(raw_bytes_representation[:2], low_bytes_first=False)
+    def __init__(self, capacity=64):
+        self.response = bytearray(capacity)
+        self.length = 0
 
-    return [least_significant_byte, most_significant_byte]
+    def reset(self):
+        """Empties the builder so that it can build another response.
 
+        Returns:
+            FinsResponseBuilder: The builder.
+        """
+        self.length = 0
+        return self
 
-class FinsResponseBuilder(object):
-    """Response builder which formats the responses as bytes.
-    """
-
-    def __init__(self):
-        self.response = bytearray()
+    def _reserve(self, size):
+        """Makes sure the buffer has room for the given number of bytes after the response built so far, and returns
+        the offset where they go.
+        """
+        offset = self.length
+        self.length += size
+        if self.length > len(self.response):
+            self.response.extend(bytes(max(self.length, 2 * len(self.response)) - len(self.response)))
+        return offset
 
     def add_int(self, value, length):
         """Adds an integer to the builder.
@@ -148,7 +180,21 @@ class FinsResponseBuilder(object):
         Returns:
             FinsResponseBuilder: The builder.
         """
-        self.response += int_to_raw_bytes(value, length, False)
+        offset = self._reserve(length)
+        self.response[offset : self.length] = value.to_bytes(length, "big", signed=value < 0)
+        return self
+
+    def add_bytes(self, data):
+        """Adds raw bytes to the builder.
+
+        Args:
+            data (bytes): The bytes to add.
+
+        Returns:
+            FinsResponseBuilder: The builder.
+        """
+        offset = self._reserve(len(data))
+        self.response[offset : self.length] = data
         return self
 
     def add_float(self, value):
@@ -160,7 +206,7 @@ class FinsResponseBuilder(object):
         Returns:
             response_utilities.FinsResponseBuilder: The builder.
         """
-        self.response += float_to_raw_bytes(value, False)
+        self._FLOAT.pack_into(self.response, self._reserve(self._FLOAT.size), value)
         return self
 
     def add_fins_frame_header(
@@ -198,32 +244,41 @@ class FinsResponseBuilder(object):
         Returns:
             FinsResponseBuilder: The builder with the FINS frame header bytes.
         """
-        return (
-            self.add_int(0xC1, 1)
-            .add_int(0x00, 1)
-            .add_int(0x02, 1)
-            .add_int(client_network_address, 1)
-            .add_int(client_node, 1)
-            .add_int(client_unit_address, 1)
-            .add_int(emulator_network_address, 1)
-            .add_int(SimulatedFinsPLC.HELIUM_RECOVERY_NODE, 1)
-            .add_int(emulator_unit_address, 1)
-            .add_int(service_id, 1)
+        self._HEADER.pack_into(
+            self.response,
+            self._reserve(self._HEADER.size),
+            0xC1,
+            0x00,
+            0x02,
+            client_network_address,
+            client_node,
+            client_unit_address,
+            emulator_network_address,
+            SimulatedFinsPLC.HELIUM_RECOVERY_NODE,
+            emulator_unit_address,
+            service_id,
         )
+        return self
 
-    def add_fins_command_and_error_codes(self):
-        """Adds the code for the FINS memory area read command and a default error code to the builder.
+    def add_fins_command_and_error_codes(self, command_code=MEMORY_AREA_READ):
+        """Adds the code for a FINS command and a default error code to the builder.
+
+        Args:
+            command_code (int): The code of the command being responded to. Defaults to the memory area read command.
 
         Returns:
             FinsResponseBuilder: The builder with the command and error codes now added.
         """
-        # The memory area read command code is 0101, and the 0000 is the No error code.
-        return self.add_int(0x0101, 2).add_int(0x0000, 2)
+        # 0000 is the No error code.
+        self._COMMAND_AND_ERROR_CODES.pack_into(
+            self.response, self._reserve(self._COMMAND_AND_ERROR_CODES.size), command_code, 0x0000
+        )
+        return self
 
     def build(self):
         """Gets the response from the builder.
 
         Returns:
-            FinsResponseBuilder: The response builder.
+            bytes: The response.
         """
-        return bytes(self.response)
+        return bytes(memoryview(self.response)[: self.length])
@@ -2,8 +2,37 @@ from lewis.adapters.stream import Cmd, StreamInterface
 from lewis.core.logging import has_log
 from lewis.utils.byte_conversions import raw_bytes_to_int
 
+from emulator_utils.framing import FramedStreamAdapter, Framer
+from emulator_utils.traffic_log import TrafficLog, log_traffic
+
 from ..device import SimulatedFinsPLC
-from .response_utilities import check_is_byte, dm_memory_area_read_response_fins_frame
+from .response_utilities import (
+    DM_AREA_WORD,
+    MEMORY_AREA_READ,
+    MULTIPLE_MEMORY_AREA_READ,
+    FinsResponseBuilder,
+    check_is_byte,
+    dm_memory_area_read_response_fins_frame,
+    dm_multiple_memory_area_read_response_fins_frame,
+)
+
+# The most words a memory area read, and the most items a multiple memory area read, can ask for in one frame
+MAX_WORDS_PER_READ = 999
+MAX_MULTIPLE_READ_ITEMS = 167
+
+
+class FinsFramer(Framer):
+    """Works out the length of FINS memory area read commands: a 10 byte FINS frame header, the 2 byte command code and
+    8 bytes for the memory area, address and number of words. Multiple memory area reads do not say how many words
+    they read, so they are left to the read timeout.
+    """
+
+    def frame_length(self, data):
+        if len(data) < 12:
+            return None
+        if raw_bytes_to_int(data[10:12], low_bytes_first=False) == MEMORY_AREA_READ:
+            return 18
+        return None
 
 
 @has_log
@@ -16,14 +45,24 @@ class FinsPLCStreamInterface(StreamInterface):
     in_terminator = ""
     out_terminator = b""
 
+    # Split requests into frames by their length rather than waiting for the read timeout
+    adapter = FramedStreamAdapter
+    framer = FinsFramer()
+
     do_log = True
 
+    def __init__(self):
+        super().__init__()
+        self.traffic = TrafficLog("fins")
+        # Every response is built in the same buffer, which is copied out when the response is done
+        self._response_builder = FinsResponseBuilder()
+
     def handle_error(self, request, error):
         error_message = "An error occurred at request " + repr(request) + ": " + repr(error)
         self.log.error(error_message)
-        print(error_message)
         return str(error)
 
+    @log_traffic
     def any_command(self, command):
         """Handles all command sent to this emulator. It checks the validity of the command, and raises an error if it
         finds something invalid. If the command is valid, then it returns a string representing the response to the
@@ -35,8 +74,6 @@ class FinsPLCStreamInterface(StreamInterface):
         Returns:
             bytes: a string where each character represents a byte from the FINS response frame.
         """
-        self._log_fins_frame(command, False)
-
         self._check_fins_frame_header_validity(command[:10])
 
         # We extract information necessary for building the FINS response header
@@ -49,10 +86,50 @@ class FinsPLCStreamInterface(StreamInterface):
 
         service_id = command[9]
 
-        if command[10] != 0x01 or command[11] != 0x01:
-            raise ValueError("The command code should be 0x0101, for memory area read command!")
+        command_code = raw_bytes_to_int(command[10:12], low_bytes_first=False)
 
-        if command[12] != 0x82:
+        if command_code == MEMORY_AREA_READ:
+            reply = self._memory_area_read(
+                command,
+                client_network_address,
+                client_node_address,
+                client_unit_address,
+                service_id,
+            )
+        elif command_code == MULTIPLE_MEMORY_AREA_READ:
+            reply = self._multiple_memory_area_read(
+                command,
+                client_network_address,
+                client_node_address,
+                client_unit_address,
+                service_id,
+            )
+        else:
+            raise ValueError(
+                "The command code should be 0x0101 for memory area read, or 0x0104 for multiple memory area read!"
+            )
+
+        return reply
+
+    def _memory_area_read(
+        self, command, client_network_address, client_node_address, client_unit_address, service_id
+    ):
+        """Reads a number of consecutive words from the DM area.
+
+        Args:
+            command (bytes): The FINS command frame.
+            client_network_address (int): The FINS network address of the client.
+            client_node_address (int): The FINS node of the client.
+            client_unit_address (int): The FINS unit address of the client.
+            service_id (int): The service ID of the original command.
+
+        Returns:
+            bytes: the FINS response frame.
+        """
+        if len(command) != 18:
+            raise ValueError("A memory area read command should be 18 bytes long.")
+
+        if command[12] != DM_AREA_WORD:
             raise ValueError(
                 "The emulator only supports reading words from the DM area, for which the code is 82."
             )
@@ -72,23 +149,12 @@ class FinsPLCStreamInterface(StreamInterface):
         number_of_words_to_read = raw_bytes_to_int(command[16:18], low_bytes_first=False)
 
         # The helium recovery PLC memory map has addresses that store types that take up either one word (16 bits) or
-        # two. Most take up one word, so if the number of words to read is two we check that the client wants to read
-        # from a memory location from where a 32 bit value starts.
-        if number_of_words_to_read == 2 and (
-            memory_start_address not in self.device.int32_memory.keys()
-            and memory_start_address not in self.device.float_memory.keys()
-        ):
+        # two. The IOC asks for one or two words per PV, but a bulk scan can read any block of the memory at once.
+        if not 1 <= number_of_words_to_read <= MAX_WORDS_PER_READ:
             raise ValueError(
-                "The memory start address {} corresponds to a single word in the memory map, "
-                "not two.".format(memory_start_address)
+                "The number of words to read must be between 1 and {}.".format(MAX_WORDS_PER_READ)
             )
-        # The PLC also stores 32 bit floating point numbers, but the asyn device support makes the IOC ask for 4 bytes
-        # instead of two.
-        elif number_of_words_to_read > 2:
-            raise ValueError(
-                "The memory map only specifies data types for which commands should ask for one or two at most."
-            )
-        is_float = True if memory_start_address in self.device.float_memory.keys() else False
+
         self._log_command_contents(
             client_network_address,
             client_node_address,
@@ -98,7 +164,7 @@ class FinsPLCStreamInterface(StreamInterface):
             number_of_words_to_read,
         )
 
-        reply = dm_memory_area_read_response_fins_frame(
+        return dm_memory_area_read_response_fins_frame(
             self.device,
             client_network_address,
             client_node_address,
@@ -106,30 +172,66 @@ class FinsPLCStreamInterface(StreamInterface):
             service_id,
             memory_start_address,
             number_of_words_to_read,
-            is_float,
+            self._response_builder,
         )
 
-        self._log_fins_frame(reply, True)
-
-        return reply
+    def _multiple_memory_area_read(
+        self, command, client_network_address, client_node_address, client_unit_address, service_id
+    ):
+        """Reads single words from any number of addresses in the DM area.
 
-    def _log_fins_frame(self, fins_frame, is_reply):
-        """Nicely displays every byte in the command as a hexadecimal number in the emulator log.
+        Each word to read is given by 4 bytes in the command: the memory area code, two bytes for the word address
+        and a bit address that must be 0x00.
 
         Args:
-            fins_frame (bytes): The fins frame we want to log.
-            is_reply (bool): Whether we want to log the reply or the command.
+            command (bytes): The FINS command frame.
+            client_network_address (int): The FINS network address of the client.
+            client_node_address (int): The FINS node of the client.
+            client_unit_address (int): The FINS unit address of the client.
+            service_id (int): The service ID of the original command.
 
         Returns:
-            None.
+            bytes: the FINS response frame.
         """
+        items = command[12:]
+        if not items or len(items) % 4 != 0:
+            raise ValueError(
+                "Every word to read in a multiple memory area read command should be 4 bytes long."
+            )
+
+        number_of_items = len(items) // 4
+        if number_of_items > MAX_MULTIPLE_READ_ITEMS:
+            raise ValueError(
+                "A multiple memory area read can read at most {} words.".format(
+                    MAX_MULTIPLE_READ_ITEMS
+                )
+            )
+
+        memory_addresses = []
+        for i in range(0, len(items), 4):
+            if items[i] != DM_AREA_WORD:
+                raise ValueError(
+                    "The emulator only supports reading words from the DM area, for which the code is 82."
+                )
+            if items[i + 3] != 0x00:
+                raise ValueError(
+                    "The emulator only supports word designated memory reading. The bit address must "
+                    "be 0x00."
+                )
+            memory_addresses.append(raw_bytes_to_int(items[i + 1 : i + 3], low_bytes_first=False))
+
         if self.do_log:
-            hex_command = [hex(character) for character in fins_frame]
+            self.log.debug("Memory addresses: %s", memory_addresses)
 
-            if not is_reply:
-                self.log.info("command is {}".format(hex_command))
-            else:
-                self.log.info("reply is{}".format(hex_command))
+        return dm_multiple_memory_area_read_response_fins_frame(
+            self.device,
+            client_network_address,
+            client_node_address,
+            client_unit_address,
+            service_id,
+            memory_addresses,
+            self._response_builder,
+        )
 
     def _log_command_contents(
         self,
@@ -154,14 +256,19 @@ class FinsPLCStreamInterface(StreamInterface):
             None.
         """
         if self.do_log:
-            self.log.info("Server network address: {}".format(self.device.network_address))
-            self.log.info("Server Unit address: {}".format(self.device.unit_address))
-            self.log.info("Client network address: {}".format(client_network_address))
-            self.log.info("Client node address: {}".format(client_node_address))
-            self.log.info("Client unit address: {}".format(client_unit_address))
-            self.log.info("Service id: {}".format(service_id))
-            self.log.info("Memory start address: {}".format(memory_start_address))
-            self.log.info("Number of words to read: {}".format(number_of_words_to_read))
+            self.log.debug(
+                "Server network address: %d, server unit address: %d, client network address: %d, "
+                "client node address: %d, client unit address: %d, service id: %d, "
+                "memory start address: %d, number of words to read: %d",
+                self.device.network_address,
+                self.device.unit_address,
+                client_network_address,
+                client_node_address,
+                client_unit_address,
+                service_id,
+                memory_start_address,
+                number_of_words_to_read,
+            )
 
     @staticmethod
     def _check_fins_frame_header_validity(fins_frame_header):
@@ -0,0 +1,92 @@
+import json
+import struct
+import unittest
+
+from hamcrest import assert_that, close_to, equal_to, is_
+from jsonrpc import JSONRPCResponseManager
+from lewis.core.simulation import Simulation
+
+from lewis_emulators.fins.device import SimulatedFinsPLC
+
+
+def words(device, address, count):
+    return bytes(device.read_dm_words(address, count))
+
+
+class FinsMemoryTests(unittest.TestCase):
+    """Tests that values written to the plc memory are read back as the FINS driver expects."""
+
+    def setUp(self):
+        self.device = SimulatedFinsPLC()
+
+    def test_that_GIVEN_an_int16_THEN_it_is_stored_as_one_big_endian_word(self):
+        # When:
+        self.device.set_memory("HEARTBEAT", -2)
+        self.device.set_memory("MCP:BANK1:TS2", 0xABCD)
+
+        # Then:
+        assert_that(words(self.device, 19500, 2), is_(equal_to(b"\xff\xfe\xab\xcd")))
+        assert_that(self.device.int16_memory[19500], is_(equal_to(-2)))
+        assert_that(self.device.int16_memory[19501], is_(equal_to(0xABCD - 0x10000)))
+
+    def test_that_GIVEN_an_int32_THEN_it_is_stored_as_two_words_least_significant_first(self):
+        # When:
+        self.device.set_memory("GC:R108:U40", 0x12345678)
+
+        # Then:
+        assert_that(words(self.device, 19700, 2), is_(equal_to(b"\x56\x78\x12\x34")))
+        assert_that(self.device.int32_memory[19700], is_(equal_to(0x12345678)))
+
+    def test_that_GIVEN_a_float_THEN_it_is_stored_as_two_words_least_significant_first(self):
+        # When:
+        self.device.set_memory("MASS_FLOW:HE_RSPPL:TS2:EAST", 1.5)
+
+        # Then:
+        raw = struct.pack(">f", 1.5)
+        assert_that(words(self.device, 19876, 2), is_(equal_to(raw[2:] + raw[:2])))
+        assert_that(self.device.float_memory[19876], is_(close_to(1.5, 1e-7)))
+
+    def test_that_GIVEN_a_read_outside_the_dm_area_THEN_a_value_error_is_raised(self):
+        with self.assertRaises(ValueError):
+            self.device.read_dm_words(SimulatedFinsPLC.DM_AREA_SIZE - 1, 2)
+
+    def test_that_GIVEN_a_name_of_no_memory_location_THEN_a_key_error_is_raised(self):
+        with self.assertRaises(KeyError):
+            self.device.set_memory("NOT_A_PV", 1)
+
+
+class FinsMemoryBackdoorTests(unittest.TestCase):
+    """Tests that the typed memory can be read and written through the lewis backdoor."""
+
+    def setUp(self):
+        self.device = SimulatedFinsPLC()
+        self.backdoor = Simulation(self.device, control_server="127.0.0.1:0").control_server
+
+    def call(self, method, *params):
+        request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": list(params)}
+        response = JSONRPCResponseManager.handle(json.dumps(request), self.backdoor.exposed_object)
+        return json.loads(response.json)
+
+    def test_that_GIVEN_the_backdoor_THEN_each_memory_is_read_as_a_map_of_address_to_value(self):
+        # Given:
+        self.device.set_memory("HEARTBEAT", 7)
+        self.device.set_memory("GC:R55:TOTAL", 100000)
+        self.device.set_memory("MASS_FLOW:HE_RSPPL:TS1:VOID", 2.5)
+
+        # Then:
+        int16_memory = self.call("device.int16_memory:get")["result"]
+        int32_memory = self.call("device.int32_memory:get")["result"]
+        float_memory = self.call("device.float_memory:get")["result"]
+
+        assert_that(len(int16_memory), is_(equal_to(len(SimulatedFinsPLC.INT16_ADDRESSES))))
+        assert_that(int16_memory["19500"], is_(equal_to(7)))
+        assert_that(int32_memory["19704"], is_(equal_to(100000)))
+        assert_that(float_memory["19880"], is_(equal_to(2.5)))
+
+    def test_that_GIVEN_the_backdoor_WHEN_memory_is_set_THEN_the_words_change(self):
+        # When:
+        response = self.call("device.int32_memory:set", {"19772": -1})
+
+        # Then:
+        assert_that("error" in response, is_(False))
+        assert_that(words(self.device, 19772, 2), is_(equal_to(b"\xff\xff\xff\xff")))
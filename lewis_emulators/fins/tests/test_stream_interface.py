@@ -0,0 +1,88 @@
+import unittest
+
+from hamcrest import assert_that, equal_to, is_
+
+from lewis_emulators.fins.device import SimulatedFinsPLC
+from lewis_emulators.fins.interfaces.stream_interface import FinsPLCStreamInterface
+
+# Command frame header to the helium recovery PLC from node 11 of network 2, unit 3, service ID 7
+COMMAND_HEADER = bytes([0x80, 0x00, 0x02, 0x00, 58, 0x00, 0x02, 11, 0x03, 0x07])
+
+# Response frame header from the PLC back to that client
+RESPONSE_HEADER = bytes([0xC1, 0x00, 0x02, 0x02, 11, 0x03, 0x00, 58, 0x00, 0x07])
+
+
+def memory_area_read(address, count):
+    return (
+        COMMAND_HEADER
+        + b"\x01\x01\x82"
+        + address.to_bytes(2, "big")
+        + b"\x00"
+        + count.to_bytes(2, "big")
+    )
+
+
+def multiple_memory_area_read(*addresses):
+    items = b"".join(b"\x82" + address.to_bytes(2, "big") + b"\x00" for address in addresses)
+    return COMMAND_HEADER + b"\x01\x04" + items
+
+
+class FinsStreamInterfaceTests(unittest.TestCase):
+    """Tests the responses to FINS memory area reads."""
+
+    def setUp(self):
+        self.device = SimulatedFinsPLC()
+        self.interface = FinsPLCStreamInterface()
+        self.interface.device = self.device
+
+        self.device.set_memory("MCP:INLET:PRESSURE", 0x0102)  # 19517
+        self.device.set_memory("MCP:EXTERNAL_TEMP", -1)  # 19518
+        self.device.set_memory("GAS_LIQUEFACTION:MASS_FLOW", 0x0304)  # 19521
+        self.device.set_memory("GC:R108:U40", 0x11223344)  # 19700 and 19701
+
+    def test_that_GIVEN_a_memory_area_read_across_a_gap_THEN_unmapped_words_read_as_zero(self):
+        # When:
+        reply = self.interface.any_command(memory_area_read(19517, 5))
+
+        # Then:
+        expected = RESPONSE_HEADER + b"\x01\x01\x00\x00" + bytes.fromhex("0102 ffff 0000 0000 0304")
+        assert_that(reply, is_(equal_to(expected)))
+
+    def test_that_GIVEN_a_memory_area_read_of_an_int32_THEN_both_words_are_returned(self):
+        reply = self.interface.any_command(memory_area_read(19700, 2))
+
+        assert_that(
+            reply, is_(equal_to(RESPONSE_HEADER + b"\x01\x01\x00\x00" + b"\x33\x44\x11\x22"))
+        )
+
+    def test_that_GIVEN_a_multiple_memory_area_read_THEN_each_word_follows_its_area_code(self):
+        # When:
+        reply = self.interface.any_command(multiple_memory_area_read(19521, 19519, 19701, 19517))
+
+        # Then:
+        expected = (
+            RESPONSE_HEADER + b"\x01\x04\x00\x00" + bytes.fromhex("82 0304 82 0000 82 1122 82 0102")
+        )
+        assert_that(reply, is_(equal_to(expected)))
+
+    def test_that_GIVEN_consecutive_reads_THEN_each_reply_only_holds_its_own_words(self):
+        # The response builder reuses its buffer, so a long reply must not leak into a short one
+        self.interface.any_command(memory_area_read(19500, 100))
+
+        reply = self.interface.any_command(memory_area_read(19517, 1))
+
+        assert_that(reply, is_(equal_to(RESPONSE_HEADER + b"\x01\x01\x00\x00\x01\x02")))
+
+    def test_that_GIVEN_a_read_that_is_not_from_the_dm_area_THEN_a_value_error_is_raised(self):
+        command = bytearray(memory_area_read(19517, 1))
+        command[12] = 0xB0
+
+        with self.assertRaises(ValueError):
+            self.interface.any_command(bytes(command))
+
+    def test_that_GIVEN_a_frame_for_another_node_THEN_a_value_error_is_raised(self):
+        command = bytearray(memory_area_read(19517, 1))
+        command[4] = 1
+
+        with self.assertRaises(ValueError):
+            self.interface.any_command(bytes(command))
@@ -2,10 +2,12 @@ from collections import OrderedDict
 
 from lewis.devices import StateMachineDevice
 
+from emulator_utils.simulation_clock import SimulationClockMixin
+
 from .states import StartedState, StoppedState
 
 
-class SimulatedFZJDDFCH(StateMachineDevice):
+class SimulatedFZJDDFCH(SimulationClockMixin, StateMachineDevice):
     """Simulated FZJ Digital Drive Fermi Chopper Controller.
     """
 
@@ -18,6 +20,9 @@ class SimulatedFZJDDFCH(StateMachineDevice):
         self.frequency = 0
         self.phase_setpoint = 0
         self.phase = 0
+        # Rates the frequency (Hz/s) and phase (degrees/s) change at
+        self.frequency_rate = 1.0
+        self.phase_rate = 1.0
         self.phase_status_is_ok = False
         self.magnetic_bearing_is_on = False
         self.magnetic_bearing_status_is_ok = False
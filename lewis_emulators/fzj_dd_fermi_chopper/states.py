@@ -12,8 +12,10 @@ class StartedState(State):
 
     def in_state(self, dt):
         device = self._context
-        device.frequency = approaches.linear(device.frequency, device.frequency_setpoint, 1, dt)
-        device.phase = approaches.linear(device.phase, device.phase_setpoint, 1, dt)
+        device.frequency = approaches.linear(
+            device.frequency, device.frequency_setpoint, device.frequency_rate, dt
+        )
+        device.phase = approaches.linear(device.phase, device.phase_setpoint, device.phase_rate, dt)
 
 
 class StoppedState(State):
@@ -24,5 +26,5 @@ class StoppedState(State):
 
     def in_state(self, dt):
         device = self._context
-        device.frequency = approaches.linear(device.frequency, 0, 1, dt)
-        device.phase = approaches.linear(device.phase, 0, 1, dt)
+        device.frequency = approaches.linear(device.frequency, 0, device.frequency_rate, dt)
+        device.phase = approaches.linear(device.phase, 0, device.phase_rate, dt)
@@ -114,7 +114,6 @@ class HelioxStreamInterface(StreamInterface):
         err_string = "command was: {}, error was: {}: {}\n".format(
             request, error.__class__.__name__, error
         )
-        print(err_string)
         self.log.error(err_string)
         return err_string
 
@@ -37,7 +37,6 @@ class Itc503StreamInterface(StreamInterface):
         err_string = "command was: {}, error was: {}: {}\n".format(
             request, error.__class__.__name__, error
         )
-        print(err_string)
         self.log.error(err_string)
         return err_string
 
@@ -84,7 +84,6 @@ class IndfurnStreamInterface(StreamInterface):
         err_string = "command was: {}, error was: {}: {}\n".format(
             request, error.__class__.__name__, error
         )
-        print(err_string)
         self.log.error(err_string)
         return "<Unsupported command"
 
@@ -1,14 +1,15 @@
-import time
 from collections import OrderedDict
 
 from lewis.devices import StateMachineDevice
 
+from emulator_utils.simulation_clock import SimulationClockMixin
+
 from .channel import PositionChannel, StrainChannel, StressChannel
 from .states import DefaultState, GeneratingWaveformState, GoingToSetpointState
 from .waveform_generator import WaveformGenerator
 
 
-class SimulatedInstron(StateMachineDevice):
+class SimulatedInstron(SimulationClockMixin, StateMachineDevice):
     def _initialize_data(self):
         """Initialize all of the device's attributes.
         """
@@ -30,7 +31,7 @@ class SimulatedInstron(StateMachineDevice):
         # Maps a channel number to a channel object
         self.channels = {1: PositionChannel(), 2: StressChannel(), 3: StrainChannel()}
 
-        self._waveform_generator = WaveformGenerator()
+        self._waveform_generator = WaveformGenerator(self.clock)
 
     def raise_exception_if_cannot_write(self):
         if self._control_mode != 1:
@@ -126,7 +127,7 @@ class SimulatedInstron(StateMachineDevice):
             self.movement_type = mov_type + 3
 
     def set_current_time(self):
-        self.current_time = time.time()
+        self.current_time = self.clock.time()
 
     def set_step_time(self, channel, value):
         self.channels[channel].step_time = value
@@ -251,9 +252,6 @@ class SimulatedInstron(StateMachineDevice):
     def set_waveform_hold(self):
         self._waveform_generator.hold()
 
-    def quarter_cycle_event(self):
-        self._waveform_generator.quart_counter.count()
-
     def arm_quarter_counter(self):
         self._waveform_generator.quart_counter.arm()
 
@@ -277,3 +275,21 @@ class SimulatedInstron(StateMachineDevice):
 
     def get_waveform_value(self):
         return self._waveform_generator.get_value(self.control_channel)
+
+    def advance_waveform(self, dt):
+        self._waveform_generator.advance(dt, self.control_channel)
+
+    def get_waveform_samples(self, channel):
+        return self._waveform_generator.get_samples(int(channel)).tolist()
+
+    def doAfterProcess(self, dt):
+        channel = self.channels[self.control_channel]
+        self._waveform_generator.record_log(
+            self.control_channel, channel.value, channel.ramp_amplitude_setpoint
+        )
+
+    def get_waveform_log(self, start=0.0, end=float("inf")):
+        """Returns the waveform log records from start to end seconds after it was started, each
+        as [time, channel, value, setpoint, cycles].
+        """
+        return self._waveform_generator.get_log(float(start), float(end)).tolist()
@@ -49,6 +49,8 @@ class InstronStreamInterface(StreamInterface):
         Cmd("set_waveform_frequency", "^C202,([1-3]),([0-9]*.[0-9]*)$"),
         Cmd("set_waveform_hold", "^C213,3$"),
         Cmd("set_waveform_maintain_log", "^C214,0$"),
+        # Not a command of the real rig: the waveform log between two times since it was started
+        Cmd("get_waveform_log", r"^Q214,([0-9]+\.?[0-9]*),([0-9]+\.?[0-9]*)$"),
         # Waveform (quarter counter event detector) commands
         Cmd("arm_quarter_counter", "^C212,2$"),
         Cmd("get_quarter_counts", "^Q210$"),
@@ -197,5 +199,12 @@ class InstronStreamInterface(StreamInterface):
     def set_waveform_maintain_log(self):
         self._device.set_waveform_maintain_log()
 
+    def get_waveform_log(self, start, end):
+        # One record per simulation step: time,channel,value,setpoint,cycles
+        return ";".join(
+            "{:.3f},{:d},{:g},{:g},{:g}".format(*record)
+            for record in self._device.get_waveform_log(float(start), float(end))
+        )
+
     def ignore(self):
         pass
@@ -1,5 +1,3 @@
-import time
-
 from lewis.core import approaches
 from lewis.core.statemachine import State
 
@@ -9,7 +7,8 @@ class DefaultState(State):
         device = self._context
         device.set_current_time()
 
-        if device.watchdog_refresh_time + 3 < time.time() and device.get_control_mode() != 0:
+        watchdog_expired = device.watchdog_refresh_time + 3 < device.clock.time()
+        if watchdog_expired and device.get_control_mode() != 0:
             print("Watchdog time expired, going back to front panel control mode")
             device.set_control_mode(0)
 
@@ -33,18 +32,9 @@ class GoingToSetpointState(DefaultState):
 
 
 class GeneratingWaveformState(DefaultState):
-    TIME_SINCE_LAST_QUART_COUNT = 0
-
-    @staticmethod
-    def increment_cycle(device, dt):
-        GeneratingWaveformState.TIME_SINCE_LAST_QUART_COUNT += dt
-        if GeneratingWaveformState.TIME_SINCE_LAST_QUART_COUNT > 1.0:
-            GeneratingWaveformState.TIME_SINCE_LAST_QUART_COUNT = 0.0
-            device.quarter_cycle_event()
-
     def in_state(self, dt):
         super(GeneratingWaveformState, self).in_state(dt)
         device = self._context
 
-        GeneratingWaveformState.increment_cycle(device, dt)
+        device.advance_waveform(dt)
         device.channels[device.control_channel].value = device.get_waveform_value()
@@ -1,21 +1,124 @@
-import math
-from datetime import datetime, timedelta
+from datetime import timedelta
+
+import numpy as np
+
+from emulator_utils.ring_buffer import RingBuffer
 
 from .quarter_cycle_event_detector import QuarterCycleEventDetector as QCED
 from .waveform_generator_states import WaveformGeneratorStates as GenStates
 from .waveform_types import WaveformTypes
 
+CHANNELS = (1, 2, 3)
+
+# A record of the waveform log: seconds since the log was started, the control channel, its value
+# and setpoint, and the number of cycles counted by the quarter counter
+LOG_RECORD = np.dtype(
+    [
+        ("time", "f8"),
+        ("channel", "u1"),
+        ("value", "f8"),
+        ("setpoint", "f8"),
+        ("cycles", "f8"),
+    ]
+)
+
+
+# One period of each waveform with unit amplitude, as a function of the phase in cycles.
+def _sine(phase):
+    return np.sin(2 * np.pi * phase)
+
+
+def _triangle(phase):
+    return 1 - 2 * np.abs((2 * phase - 0.5) % 2 - 1)
+
+
+def _square(phase):
+    return np.copysign(1.0, _sine(phase))
+
+
+def _sawtooth(phase):
+    return phase % 1
+
+
+def _haversine(phase):
+    return (1.0 - np.cos(2 * np.pi * phase)) / 2.0
+
+
+def _havertriangle(phase):
+    return 1 - np.abs(2 * phase % 2 - 1)
+
+
+def _haversquare(phase):
+    return (1.0 + np.copysign(1.0, _haversine(phase) - 0.5)) / 2.0
+
+
+# External waveforms are not emulated, they (and unknown types) are generated as a sine
+SHAPES = {
+    WaveformTypes.SINE: _sine,
+    WaveformTypes.TRIANGLE: _triangle,
+    WaveformTypes.SQUARE: _square,
+    WaveformTypes.SAWTOOTH: _sawtooth,
+    WaveformTypes.HAVERSINE: _haversine,
+    WaveformTypes.HAVERTRIANGLE: _havertriangle,
+    WaveformTypes.HAVERSQUARE: _haversquare,
+}
+
+
+LOOKUP_TABLE_SIZE = 4096
+LOOKUP_PHASES = np.linspace(0.0, 1.0, LOOKUP_TABLE_SIZE + 1)
+
+
+def _lookup_table(shape):
+    """One period of a waveform, with the first sample repeated at the end for interpolation."""
+    table = shape(LOOKUP_PHASES)
+    table[-1] = table[0]
+    return table
+
+
+# Interpolating would round off the edges of square waves, so they are always calculated
+LOOKUP_TABLES = {
+    wave_type: _lookup_table(shape)
+    for wave_type, shape in SHAPES.items()
+    if wave_type not in (WaveformTypes.SQUARE, WaveformTypes.HAVERSQUARE)
+}
+
 
 class WaveformGenerator(object):
+    """Generates the waveforms of all three channels in blocks of samples.
+
+    Each channel keeps its own phase in cycles, which moves on by frequency * dt whenever the
+    generator is advanced, so changing the frequency does not make the waveform jump. Every
+    advance produces a block of samples spaced 1 / SAMPLE_RATE seconds apart (but no more than
+    MAX_BLOCK_SIZE of them), which can be read with get_samples(). Quarter cycles of the control
+    channel are counted from the phase, so none are missed however long the step is.
+
+    Once maintain_log() has been called, the control channel is recorded in a ring buffer of
+    LOG_CAPACITY records on every simulation step, so the log covers the latest part of a run
+    of any length.
+
+    With use_lookup_tables set, samples of the continuous waveforms are interpolated from one
+    precomputed period instead of being calculated.
+    """
+
     STOP_DELAY = timedelta(seconds=3)
+    SAMPLE_RATE = 1000.0
+    MAX_BLOCK_SIZE = 65536
+    LOG_CAPACITY = 36000
 
-    def __init__(self):
+    def __init__(self, clock, use_lookup_tables=False):
+        self.clock = clock
+        self.use_lookup_tables = use_lookup_tables
         self.state = GenStates.STOPPED
         self.amplitude = {i + 1: 0.0 for i in range(3)}
         self.frequency = {i + 1: 1.0 for i in range(3)}
         self.type = {i + 1: WaveformTypes.SINE for i in range(3)}
         self.stop_requested_at_time = None
         self.quart_counter = QCED()
+        self.phase = np.zeros(len(CHANNELS))
+        self.block = np.zeros((len(CHANNELS), 1))
+        self.log = RingBuffer(self.LOG_CAPACITY, LOG_RECORD)
+        self.logging = False
+        self.log_started_at = 0.0
 
     def abort(self):
         if self.active():
@@ -25,13 +128,13 @@ class WaveformGenerator(object):
 
     def finish(self):
         if self.active():
-            self.stop_requested_at_time = datetime.now()
+            self.stop_requested_at_time = self.clock.now()
             self.state = GenStates.FINISHING
 
     def time_to_stop(self):
         return (
             self.stop_requested_at_time is not None
-            and (datetime.now() - self.stop_requested_at_time) > WaveformGenerator.STOP_DELAY
+            and (self.clock.now() - self.stop_requested_at_time) > WaveformGenerator.STOP_DELAY
         )
 
     def stop(self):
@@ -42,61 +145,100 @@ class WaveformGenerator(object):
     def start(self):
         self.state = GenStates.RUNNING
         self.stop_requested_at_time = None
+        self.phase[:] = 0.0
+        self.block = np.zeros((len(CHANNELS), 1))
 
     def hold(self):
         if self.active():
             self.state = GenStates.HOLDING
 
     def maintain_log(self):
-        # Does nothing in current emulator
-        pass
+        """Starts a new waveform log."""
+        self.log.clear()
+        self.log_started_at = self.clock.time()
+        self.logging = True
+
+    def record_log(self, channel, value, setpoint):
+        if self.logging:
+            self.log.append(
+                self.clock.time() - self.log_started_at,
+                channel,
+                value,
+                setpoint,
+                self.quart_counter.cycles(),
+            )
+
+    def get_log(self, start, end):
+        """Gets the logged records between two times.
+
+        Args:
+            start (float): Seconds after the log was started.
+            end (float): Seconds after the log was started.
+
+        Returns:
+            numpy.ndarray: The LOG_RECORDs from start to end, oldest first.
+        """
+        return self.log.window("time", start, end)
 
     def active(self):
         return self.state in [GenStates.RUNNING, GenStates.HOLDING]
 
-    def get_value(self, channel):
-        def sin(a, x, f):
-            return a * math.sin(math.pi * x * f)
-
-        def square(a, x, f):
-            return math.copysign(a, sin(a, x, f))
-
-        def sawtooth(a, x, f):
-            return a * (x % (1.0 / f))
-
-        def triangle(a, x, f):
-            return a * (1 - 2 * abs((f * x - 0.5) % 2 - 1))
-
-        def haversine(a, x, f):
-            return a / 2.0 * (1.0 - math.cos(math.pi * f * x))
-
-        def havertriangle(a, x, f):
-            return a * (1 - abs(f * x % 2 - 1))
-
-        def haversquare(a, x, f):
-            return a / 2.0 * (1.0 + math.copysign(1.0, haversine(a, x, f) - 0.5))
+    def sample(self, channel, phases):
+        """Calculates the waveform of a channel at the given phases.
+
+        Args:
+            channel (int): The channel, 1 to 3.
+            phases (numpy.ndarray): Phases in cycles since the waveform was started.
+
+        Returns:
+            numpy.ndarray: The samples.
+        """
+        wave_type = self.type[channel]
+        table = LOOKUP_TABLES.get(wave_type) if self.use_lookup_tables else None
+        if table is not None:
+            unit = np.interp(phases % 1, LOOKUP_PHASES, table)
+        else:
+            unit = SHAPES.get(wave_type, _sine)(phases)
+        return self.amplitude[channel] * unit
+
+    def advance(self, dt, control_channel):
+        """Generates the samples of all channels for the next dt seconds and counts the quarter
+        cycles the control channel completes.
+
+        The waveforms only move on while the generator is running.
+
+        Args:
+            dt (float): The time to advance by in seconds.
+            control_channel (int): The channel whose quarter cycles are counted.
+        """
+        if self.state != GenStates.RUNNING or dt <= 0:
+            return
+
+        size = int(min(max(1, np.ceil(dt * self.SAMPLE_RATE)), self.MAX_BLOCK_SIZE))
+        frequencies = np.array([max(self.frequency[channel], 0.0) for channel in CHANNELS])
+        steps = np.linspace(dt / size, dt, size)
+        phases = self.phase[:, np.newaxis] + frequencies[:, np.newaxis] * steps
+
+        self.block = np.empty((len(CHANNELS), size))
+        for row, channel in enumerate(CHANNELS):
+            self.block[row] = self.sample(channel, phases[row])
+
+        index = CHANNELS.index(control_channel)
+        quarters = int(np.floor(4 * phases[index, -1]) - np.floor(4 * self.phase[index]))
+        self.phase = phases[:, -1].copy()
+        for _ in range(quarters):
+            self.quart_counter.count()
+
+    def get_samples(self, channel):
+        """Returns:
+        numpy.ndarray: The samples of a channel generated by the last advance.
+        """
+        if not self.active():
+            return np.zeros(0)
+        return self.block[CHANNELS.index(channel)]
 
+    def get_value(self, channel):
         if self.active():
-            amp = self.amplitude[channel]
-            freq = max(self.frequency[channel], 1.0e-20)
-            wave_type = self.type[channel]
-            val = self.quart_counter.counts
-
-            if not self.active():
-                return 0.0
-            elif wave_type == WaveformTypes.TRIANGLE:
-                return triangle(amp, val, freq)
-            elif wave_type == WaveformTypes.SAWTOOTH:
-                return sawtooth(amp, val, freq)
-            elif wave_type == WaveformTypes.SQUARE:
-                return square(amp, val, freq)
-            elif wave_type == WaveformTypes.HAVERSINE:
-                return haversine(amp, val, freq)
-            elif wave_type == WaveformTypes.HAVERSQUARE:
-                return haversquare(amp, val, freq)
-            elif wave_type == WaveformTypes.HAVERTRIANGLE:
-                return havertriangle(amp, val, freq)
-            else:
-                return sin(amp, val, freq)
+            return float(self.block[CHANNELS.index(channel), -1])
 
         return 0.0
@@ -68,7 +68,6 @@ class IpsStreamInterface(StreamInterface):
         err_string = "command was: {}, error was: {}: {}\n".format(
             request, error.__class__.__name__, error
         )
-        print(err_string)
         self.log.error(err_string)
         return err_string
 
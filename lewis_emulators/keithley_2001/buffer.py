@@ -1,18 +1,77 @@
 from enum import Enum
 
+import numpy as np
+
+from emulator_utils.ring_buffer import RingBuffer
+
+# A reading stored in the buffer, named after the reading elements of :FORM:ELEM
+READING = np.dtype([("READ", "f8"), ("CHAN", "u1"), ("UNIT", "U16")])
+
 
 class Buffer(object):
+    """Buffer of readings, kept in a preallocated array of READING records.
+
+    Once the buffer holds size readings, each new reading added with add_reading overwrites the
+    oldest one. Readings fed to the buffer by a scan with feed follow the buffer source and mode
+    instead, and count the readings that were lost because the buffer was full as overruns.
+    """
+
+    MAX_SIZE = 404
+
     def __init__(self):
-        self.buffer = []
         self._size = 100
+        self._readings = RingBuffer(self._size, READING)
         self._source = Source.NONE
         self._mode = Mode.NEV
         self.number_of_times_buffer_cleared = 0
+        self.readings_fed = 0
+        self.overruns = 0
         self._egroup = Egroup.FULL
         self.scan_channels = None
 
+    def __len__(self):
+        return len(self._readings)
+
+    @property
+    def full(self):
+        return len(self._readings) == self._size
+
+    def add_reading(self, reading, channel, unit):
+        self._readings.append(reading, channel, unit)
+
+    def feed(self, reading, channel, unit):
+        """Feeds a reading taken by a scan to the buffer.
+
+        Nothing is stored without a source or with feed control NEV. When the buffer is full,
+        NEXT discards the new reading and ALW and PRET overwrite the oldest one, both of which
+        count as an overrun.
+
+        Returns:
+            bool: Whether the reading was stored.
+        """
+        if self._source == Source.NONE or self._mode == Mode.NEV:
+            return False
+
+        self.readings_fed += 1
+        if self.full:
+            self.overruns += 1
+            if self._mode == Mode.NEXT:
+                return False
+
+        self._readings.append(reading, channel, unit)
+        return True
+
+    @property
+    def readings(self):
+        """The READING records in the buffer.
+
+        Returns:
+            numpy.ndarray: The READING records, oldest first.
+        """
+        return self._readings.to_array()
+
     def clear_buffer(self):
-        self.buffer = []
+        self._readings.clear()
         self.number_of_times_buffer_cleared += 1
 
     @property
@@ -43,7 +102,13 @@ class Buffer(object):
 
     @size.setter
     def size(self, size):
-        if 2 <= size <= 404:
+        """Sets the number of readings the buffer holds, keeping the newest readings that fit."""
+        if 2 <= size <= Buffer.MAX_SIZE:
+            if size != self._size:
+                readings = self._readings.latest(size)
+                self._readings = RingBuffer(size, READING)
+                for reading in readings:
+                    self._readings.append(reading)
             self._size = size
         else:
             raise ValueError("{} is not a valid buffer size.".format(size))
@@ -2,12 +2,15 @@ from collections import OrderedDict
 
 from lewis.devices import StateMachineDevice
 
+from emulator_utils.simulation_clock import SimulationClockMixin
+
 from .buffer import Buffer
-from .states import DefaultState
+from .scan_engine import ScanEngine
+from .states import DefaultState, ScanningState
 from .utils import Channel, ScanTrigger, StatusRegister
 
 
-class SimulatedKeithley2001(StateMachineDevice):
+class SimulatedKeithley2001(SimulationClockMixin, StateMachineDevice):
     """Simulated Keithley2700 Multimeter
     """
 
@@ -35,6 +38,13 @@ class SimulatedKeithley2001(StateMachineDevice):
         self._scan_trigger_type = ScanTrigger.IMM
         self.measurement_scan_count = 0
 
+        # Readings per second taken by the scan engine once :INIT is sent. With a rate of 0
+        # :INIT takes one reading of every channel in the scan list at once instead.
+        self.reading_rate = 0.0
+        # Seconds between scans with the TIM scan trigger
+        self.scan_timer = 1.0
+        self.scan_engine = ScanEngine()
+
         self.continuous_initialisation_status = False
         self._channels = {
             1: Channel(1),
@@ -55,13 +65,19 @@ class SimulatedKeithley2001(StateMachineDevice):
     def _get_state_handlers(self):
         return {
             "default": DefaultState(),
+            "scanning": ScanningState(),
         }
 
     def _get_initial_state(self):
         return "default"
 
     def _get_transition_handlers(self):
-        return OrderedDict([])
+        return OrderedDict(
+            [
+                (("default", "scanning"), lambda: self.scan_engine.running),
+                (("scanning", "default"), lambda: not self.scan_engine.running),
+            ]
+        )
 
     def reset_device(self):
         """Resets device to initialized state.
@@ -87,6 +103,7 @@ class SimulatedKeithley2001(StateMachineDevice):
         }
         self.closed_channel = None
         self._scan_trigger_type = ScanTrigger.IMM
+        self.scan_engine.stop()
         self._clear_error()
 
         SimulatedKeithley2001.number_of_times_device_has_been_reset += 1
@@ -133,22 +150,56 @@ class SimulatedKeithley2001(StateMachineDevice):
         """
         return self._scan_trigger_type.name
 
+    @scan_trigger_type.setter
+    def scan_trigger_type(self, trigger):
+        try:
+            self._scan_trigger_type = ScanTrigger[trigger]
+        except KeyError:
+            raise ValueError("{} is not a valid scan trigger.".format(trigger))
+
+    def initiate(self):
+        """Starts scanning the channels in the scan list.
+
+        With a reading rate the scan engine takes the readings over time, otherwise they are
+        all taken at once.
+        """
+        if self.reading_rate > 0:
+            self.scan_engine.start()
+        else:
+            self.scan_channels()
+
+    def abort_scan(self):
+        self.scan_engine.stop()
+
+    def scan_list(self):
+        """The channels a scan reads.
+
+        Returns:
+            list of int: The channels to scan, the closed channel if no scan list was set.
+        """
+        if self.buffer.scan_channels:
+            return [int(channel) for channel in self.buffer.scan_channels]
+        if self.closed_channel is not None:
+            return [self.closed_channel]
+        return []
+
+    def take_scan_reading(self, channel_number):
+        """Takes a reading of a channel for the scan engine and feeds it to the buffer."""
+        channel = self._channels[channel_number]
+        self.buffer.feed(channel.reading, channel.channel, channel.reading_units)
+        if self.buffer.full:
+            self.status_register.buffer_full = True
+
     def scan_channels(self):
         """Generates buffer of readings.
 
-        Each element of the buffer is a dictinoary of values
-        generated from the channel.
+        Each element of the buffer holds the reading, number and reading
+        unit of the channel.
 
         """
         for channel_to_scan in self.buffer.scan_channels:
             channel = self._channels[int(channel_to_scan)]
-            self.buffer.buffer.append(
-                {
-                    "READ": channel.reading,
-                    "CHAN": channel.channel,
-                    "READ_UNIT": channel.reading_units,
-                }
-            )
+            self.buffer.add_reading(channel.reading, channel.channel, channel.reading_units)
 
     @property
     def error(self):
@@ -233,6 +284,22 @@ class SimulatedKeithley2001(StateMachineDevice):
         """
         return self.number_of_times_ioc_has_been_reset
 
+    def get_scan_statistics_via_the_backdoor(self):
+        """Gets the counts of the scan engine and buffer since the device was initialised.
+
+        Only called via the backdoor.
+
+        Returns:
+            dict: Readings taken, fed to and stored in the buffer, overruns and scans completed.
+        """
+        return {
+            "readings_taken": self.scan_engine.readings_taken,
+            "readings_fed": self.buffer.readings_fed,
+            "readings_in_buffer": len(self.buffer),
+            "overruns": self.buffer.overruns,
+            "scans": self.scan_engine.scans,
+        }
+
     def set_how_many_times_ioc_has_been_reset_via_the_backdoor(self, value):
         """Sets the number of times the ioc has been reset.
 
@@ -8,6 +8,8 @@ class Keithley2001StreamInterface(StreamInterface):
     out_terminator = "\n"
 
     _channel_readback_format = None
+    # The fields of a buffer reading that _channel_readback_format formats, in order
+    _channel_readback_fields = ()
 
     commands = {
         # Commands used on setup
@@ -33,6 +35,13 @@ class Keithley2001StreamInterface(StreamInterface):
         CmdBuilder("set_scan_count").escape(":ARM:LAY2:COUN ").int().eos().build(),
         CmdBuilder("get_scan_count").escape(":ARM:LAY2:COUN?").eos().build(),
         CmdBuilder("get_scan_trigger").escape(":ARM:LAY2:SOUR?").eos().build(),
+        CmdBuilder("set_scan_trigger")
+        .escape(":ARM:LAY2:SOUR ")
+        .arg("IMM|HOLD|MAN|BUS|TLIN|EXT|TIM")
+        .eos()
+        .build(),
+        CmdBuilder("get_scan_timer").escape(":ARM:LAY2:TIM?").eos().build(),
+        CmdBuilder("set_scan_timer").escape(":ARM:LAY2:TIM ").float().eos().build(),
         # Reading a single channel
         CmdBuilder("set_read_channel").escape(":ROUT:CLOS (@").int().escape(")").eos().build(),
         CmdBuilder("read_single_channel").escape(":READ?").eos().build(),
@@ -45,6 +54,7 @@ class Keithley2001StreamInterface(StreamInterface):
         CmdBuilder("get_buffer_mode").escape(":DATA:FEED:CONT?").eos().build(),
         CmdBuilder("clear_buffer").escape(":DATA:CLE").eos().build(),
         CmdBuilder("scan_channels").escape(":INIT").eos().build(),
+        CmdBuilder("abort_scan").escape(":ABOR").eos().build(),
         CmdBuilder("get_buffer_date").escape(":DATA:DATA?").eos().build(),
         # Setting up a scan
         CmdBuilder("set_measurement_scan_count").escape(":TRIG:COUN ").int().eos().build(),
@@ -64,7 +74,6 @@ class Keithley2001StreamInterface(StreamInterface):
 
     def handle_error(self, request, error):
         self.log.error("An error occurred at request {}: {}".format(repr(request), repr(error)))
-        print("An error occurred at request {}: {}".format(repr(request), repr(error)))
 
     # Commands used on setup
     @conditional_reply("_connected")
@@ -111,18 +120,23 @@ class Keithley2001StreamInterface(StreamInterface):
         """Generates the readback format for buffer readings.
         """
         readback_elements = []
+        readback_fields = []
 
         if self._device.elements["READ"]:
             readback_elements.append("{:.7E}")
+            readback_fields.append("READ")
             if self._device.elements["UNIT"]:
                 readback_elements.append("{}")
+                readback_fields.append("UNIT")
 
         if self._device.elements["CHAN"]:
             readback_elements.append(",{:02d}")
+            readback_fields.append("CHAN")
             if self._device.elements["UNIT"]:
                 readback_elements.append("INTCHAN")
 
         self._channel_readback_format = "".join(readback_elements)
+        self._channel_readback_fields = tuple(readback_fields)
 
     @conditional_reply("_connected")
     def reset_device(self):
@@ -256,6 +270,26 @@ class Keithley2001StreamInterface(StreamInterface):
         """
         return self._device.scan_trigger_type
 
+    @conditional_reply("_connected")
+    def set_scan_trigger(self, trigger):
+        """Sets the scan trigger type.
+
+        Args:
+            trigger (string): One of IMM, HOLD, MAN, BUS, TLIN, EXT, TIM. Only IMM and TIM
+                start scans by themselves.
+        """
+        self._device.scan_trigger_type = trigger
+
+    @conditional_reply("_connected")
+    def get_scan_timer(self):
+        """Returns the seconds between scans with the TIM scan trigger."""
+        return str(self._device.scan_timer)
+
+    @conditional_reply("_connected")
+    def set_scan_timer(self, interval):
+        """Sets the seconds between scans with the TIM scan trigger."""
+        self._device.scan_timer = float(interval)
+
     # Reading a single channel
     @conditional_reply("_connected")
     def set_read_channel(self, channel):
@@ -350,7 +384,12 @@ class Keithley2001StreamInterface(StreamInterface):
         """Sets the device to scan.
 
         """
-        self._device.scan_channels()
+        self._device.initiate()
+
+    @conditional_reply("_connected")
+    def abort_scan(self):
+        """Stops the scan in progress."""
+        self._device.abort_scan()
 
     @conditional_reply("_connected")
     def get_buffer_date(self):
@@ -359,14 +398,27 @@ class Keithley2001StreamInterface(StreamInterface):
         Returns:
             list of strings: List of readings from channels.
         """
-        return ",".join(map(self._format_buffer_readings, self._device.buffer.buffer))
+        return self._format_buffer(self._device.buffer.readings)
+
+    def _format_buffer(self, readings):
+        """Formats all readings of the buffer with one call of the readback format.
+
+        Args:
+            readings (numpy.ndarray): READING records of the buffer
+
+        Returns:
+            string: Buffer readings formatted depending on elements, separated by commas
+        """
+        columns = [readings[field].tolist() for field in self._channel_readback_fields]
+        values = [value for reading in zip(*columns) for value in reading]
+        return ",".join([self._channel_readback_format] * len(readings)).format(*values)
 
     def _format_buffer_readings(self, reading):
         """Formats a reading.
 
         Args:
             reading: dictionary with keys
-                "READ", "READ_UNIT", "CHAN"
+                "READ", "READ_UNIT", "CHAN", as returned by take_single_reading
 
         Returns:
             string: Buffer reading formatted depending on elements
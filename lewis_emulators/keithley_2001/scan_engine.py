@@ -0,0 +1,85 @@
+from .utils import ScanTrigger
+
+
+class ScanEngine(object):
+    """Takes the readings of a scan at the reading rate of the device as simulated time passes.
+
+    A scan takes one reading of each channel in the scan list, one after another, every
+    1 / reading_rate seconds. With the IMM arm source the next scan starts as soon as the last
+    one finished, with TIM scans start every scan_timer seconds (or as soon as the last one
+    finished if it took longer). After scan_count scans (any number if it is not positive) the
+    engine stops, unless continuous initiation is on.
+
+    Readings are timed on a fixed grid, so the rate is kept whatever the simulation cycle time.
+    """
+
+    def __init__(self):
+        self.running = False
+        self.scans = 0
+        self.readings_taken = 0
+        self._position = 0
+        self._time = 0.0
+        self._next_reading = 0.0
+        self._next_scan = 0.0
+
+    def start(self):
+        """Arms the engine, the first scan starts immediately."""
+        self.running = True
+        self.scans = 0
+        self._position = 0
+        self._time = 0.0
+        self._next_reading = 0.0
+        self._next_scan = 0.0
+
+    def stop(self):
+        self.running = False
+
+    def advance(self, device, dt):
+        """Takes the readings that are due in the next dt seconds.
+
+        Args:
+            device (SimulatedKeithley2001): The device to read the channels of.
+            dt (float): Simulated time since the last call in seconds.
+        """
+        end = self._time + dt
+        self._time = end
+
+        channels = device.scan_list()
+        trigger = device.scan_trigger_type
+        triggered = trigger in (ScanTrigger.IMM.name, ScanTrigger.TIM.name)
+        if device.reading_rate <= 0 or not channels or not triggered:
+            # Nothing is triggered meanwhile, rather than everything at once afterwards
+            self._next_reading = max(self._next_reading, end)
+            self._next_scan = max(self._next_scan, end)
+            return
+
+        period = 1.0 / device.reading_rate
+        while self.running:
+            at = self._next_reading
+            if self._position == 0 and trigger == ScanTrigger.TIM.name:
+                at = max(at, self._next_scan)
+            if at > end:
+                break
+
+            device.take_scan_reading(channels[self._position % len(channels)])
+            self.readings_taken += 1
+            self._next_reading = at + period
+            self._position += 1
+
+            if self._position >= len(channels):
+                self._position = 0
+                self.scans += 1
+                self._schedule_next_scan(at, device.scan_timer)
+                if 0 < device.scan_count <= self.scans:
+                    if device.continuous_initialisation_status:
+                        self.scans = 0
+                    else:
+                        self.running = False
+
+    def _schedule_next_scan(self, now, interval):
+        if interval <= 0:
+            self._next_scan = now
+            return
+        # Timer ticks that passed while the scan was still running are missed
+        while self._next_scan <= now:
+            self._next_scan += interval
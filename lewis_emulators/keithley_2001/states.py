@@ -3,3 +3,9 @@ from lewis.core.statemachine import State
 
 class DefaultState(State):
     pass
+
+
+class ScanningState(State):
+    def in_state(self, dt):
+        device = self._context
+        device.scan_engine.advance(device, dt)
@@ -0,0 +1,105 @@
+import itertools
+import unittest
+
+from hamcrest import assert_that, equal_to, is_
+
+from lewis_emulators.keithley_2001.buffer import Buffer
+from lewis_emulators.keithley_2001.device import SimulatedKeithley2001
+from lewis_emulators.keithley_2001.interfaces.stream_interface import (
+    Keithley2001StreamInterface,
+)
+
+READINGS = [
+    (0.0, 1, "VDC"),
+    (-1.25e-3, 2, "VDC"),
+    (123456.789, 10, "OHM"),
+    (9.99999995e-21, 3, "VAC"),
+    (-7.0, 99, "ADC"),
+]
+
+
+def buffer_with(readings, size=100):
+    buffer = Buffer()
+    buffer.size = size
+    for reading in readings:
+        buffer.add_reading(*reading)
+    return buffer
+
+
+class BufferTests(unittest.TestCase):
+    """Tests that the buffer keeps the newest readings."""
+
+    def test_that_GIVEN_more_readings_than_the_size_THEN_the_oldest_are_overwritten(self):
+        buffer = buffer_with(READINGS, size=3)
+
+        assert_that(len(buffer), is_(equal_to(3)))
+        assert_that(buffer.full, is_(True))
+        assert_that(buffer.readings["CHAN"].tolist(), is_(equal_to([10, 3, 99])))
+
+    def test_that_GIVEN_a_smaller_size_THEN_the_newest_readings_are_kept(self):
+        # Given:
+        buffer = buffer_with(READINGS)
+
+        # When:
+        buffer.size = 2
+
+        # Then:
+        assert_that(buffer.readings.tolist(), is_(equal_to(READINGS[-2:])))
+
+    def test_that_GIVEN_a_larger_size_THEN_all_readings_are_kept_and_more_fit(self):
+        # Given:
+        buffer = buffer_with(READINGS, size=3)
+
+        # When:
+        buffer.size = 10
+        buffer.add_reading(1.0, 4, "VDC")
+
+        # Then:
+        assert_that(buffer.readings.tolist(), is_(equal_to(READINGS[-3:] + [(1.0, 4, "VDC")])))
+        assert_that(buffer.full, is_(False))
+
+    def test_that_GIVEN_an_invalid_size_THEN_the_readings_are_unchanged(self):
+        buffer = buffer_with(READINGS)
+
+        with self.assertRaises(ValueError):
+            buffer.size = Buffer.MAX_SIZE + 1
+
+        assert_that(buffer.readings.tolist(), is_(equal_to(READINGS)))
+
+
+class BufferDataTests(unittest.TestCase):
+    """Tests that :DATA:DATA? formats the buffer exactly as formatting each reading did."""
+
+    def setUp(self):
+        self.device = SimulatedKeithley2001()
+        self.interface = Keithley2001StreamInterface()
+        self.interface.device = self.device
+        for reading in READINGS:
+            self.device.buffer.add_reading(*reading)
+
+    def format_one_reading_at_a_time(self):
+        return ",".join(
+            self.interface._format_buffer_readings({"READ": read, "CHAN": chan, "READ_UNIT": unit})
+            for read, chan, unit in READINGS
+        )
+
+    def test_that_GIVEN_any_combination_of_elements_THEN_the_buffer_data_is_identical(self):
+        elements = list(self.device.elements)
+        for count in range(len(elements) + 1):
+            for enabled in itertools.combinations(elements, count):
+                # Given:
+                for element in elements:
+                    self.device.elements[element] = element in enabled
+                self.interface._generate_readback_format()
+
+                # When:
+                result = self.interface.get_buffer_date()
+
+                # Then:
+                assert_that(result, is_(equal_to(self.format_one_reading_at_a_time())))
+
+    def test_that_GIVEN_an_empty_buffer_THEN_the_buffer_data_is_empty(self):
+        self.device.buffer.clear_buffer()
+        self.interface.set_elements("READ, UNIT, CHAN")
+
+        assert_that(self.interface.get_buffer_date(), is_(equal_to("")))
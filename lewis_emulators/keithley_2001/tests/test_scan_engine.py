@@ -0,0 +1,109 @@
+import unittest
+
+from hamcrest import assert_that, close_to, contains_exactly, equal_to, is_
+
+from lewis_emulators.keithley_2001.scan_engine import ScanEngine
+
+
+class _Device(object):
+    """The parts of the device the scan engine uses, recording when each reading is taken."""
+
+    def __init__(self, channels, reading_rate, trigger="IMM", scan_timer=1.0, scan_count=0):
+        self.channels = channels
+        self.reading_rate = reading_rate
+        self.scan_trigger_type = trigger
+        self.scan_timer = scan_timer
+        self.scan_count = scan_count
+        self.continuous_initialisation_status = False
+        self.time = 0.0
+        self.readings = []
+
+    def scan_list(self):
+        return self.channels
+
+    def take_scan_reading(self, channel_number):
+        self.readings.append((round(self.time, 9), channel_number))
+
+
+def run(device, seconds, dt):
+    """Starts a scan engine and advances it in steps of dt, like the simulation does."""
+    engine = ScanEngine()
+    engine.start()
+    for _ in range(int(round(seconds / dt))):
+        device.time += dt
+        engine.advance(device, dt)
+    return engine
+
+
+class ScanEngineTests(unittest.TestCase):
+    """Tests that the scan engine takes readings at the reading rate of the device."""
+
+    def test_that_GIVEN_a_reading_rate_THEN_channels_are_read_in_turn_at_that_rate(self):
+        # Given:
+        device = _Device([1, 2, 3], reading_rate=10.0)
+
+        # When:
+        engine = run(device, 1.0, 0.1)
+
+        # Then:
+        assert_that(engine.readings_taken, is_(equal_to(11)))
+        assert_that(
+            [channel for _, channel in device.readings[:7]], contains_exactly(1, 2, 3, 1, 2, 3, 1)
+        )
+        assert_that(engine.scans, is_(equal_to(3)))
+
+    def test_that_GIVEN_any_simulation_cycle_time_THEN_the_same_number_of_readings_is_taken(self):
+        for dt in (0.001, 0.0137, 0.1, 0.25, 1.0):
+            device = _Device([1, 2], reading_rate=50.0)
+
+            engine = run(device, 2.0, dt)
+
+            assert_that(engine.readings_taken, is_(close_to(101, 1)))
+
+    def test_that_GIVEN_a_scan_count_THEN_the_engine_stops_after_that_many_scans(self):
+        # Given:
+        device = _Device([1, 2], reading_rate=100.0, scan_count=3)
+
+        # When:
+        engine = run(device, 1.0, 0.01)
+
+        # Then:
+        assert_that(engine.readings_taken, is_(equal_to(6)))
+        assert_that(engine.running, is_(False))
+
+    def test_that_GIVEN_continuous_initiation_THEN_the_engine_keeps_scanning(self):
+        # Given:
+        device = _Device([1, 2], reading_rate=100.0, scan_count=3)
+        device.continuous_initialisation_status = True
+
+        # When:
+        engine = run(device, 1.0, 0.01)
+
+        # Then:
+        assert_that(engine.running, is_(True))
+        assert_that(engine.readings_taken, is_(close_to(101, 1)))
+
+    def test_that_GIVEN_the_timer_trigger_THEN_scans_start_every_scan_timer_seconds(self):
+        # Given:
+        device = _Device([1, 2, 3], reading_rate=100.0, trigger="TIM", scan_timer=0.5)
+
+        # When:
+        run(device, 1.2, 0.01)
+
+        # Then:
+        scan_starts = [time for time, channel in device.readings if channel == 1]
+        assert_that(scan_starts, contains_exactly(0.01, 0.5, 1.0))
+
+    def test_that_GIVEN_a_trigger_that_does_not_start_scans_THEN_no_readings_are_taken_meanwhile(
+        self,
+    ):
+        # Given:
+        device = _Device([1, 2], reading_rate=100.0, trigger="HOLD")
+        engine = run(device, 1.0, 0.1)
+
+        # When:
+        device.scan_trigger_type = "IMM"
+        engine.advance(device, 0.1)
+
+        # Then:
+        assert_that(engine.readings_taken, is_(equal_to(11)))
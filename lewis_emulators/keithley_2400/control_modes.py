@@ -51,3 +51,15 @@ class OffsetCompensationMode(OnOffMode):
 
 class OutputMode(OnOffMode):
     pass
+
+
+class SweepMode(Mode):
+    FIXED = "FIX"
+    SWEEP = "SWE"
+    MODES = [FIXED, SWEEP]
+
+
+class SweepSpacing(Mode):
+    LINEAR = "LIN"
+    LOGARITHMIC = "LOG"
+    MODES = [LINEAR, LOGARITHMIC]
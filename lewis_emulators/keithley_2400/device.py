@@ -3,11 +3,12 @@ from __future__ import division
 from collections import OrderedDict
 from random import uniform
 
+import numpy as np
 from lewis.devices import StateMachineDevice
 
 from .control_modes import *
 from .states import DefaultRunningState, StaticRunningState
-from .utilities import format_value
+from .utilities import format_value, format_values
 
 
 class SimulatedKeithley2400(StateMachineDevice):
@@ -21,6 +22,9 @@ class SimulatedKeithley2400(StateMachineDevice):
     INITIAL_SOURCE_CURRENT = 1.0e-4
     INITIAL_SOURCE_VOLTAGE = 0.8
 
+    INITIAL_SWEEP_POINTS = 2500
+    MAXIMUM_SWEEP_POINTS = 2500
+
     def _initialize_data(self):
         """Initialize all of the device's attributes.
         """
@@ -61,6 +65,19 @@ class SimulatedKeithley2400(StateMachineDevice):
         self._current_compliance = SimulatedKeithley2400.INITIAL_CURRENT_COMPLIANCE
         self._voltage_compliance = SimulatedKeithley2400.INITIAL_VOLTAGE_COMPLIANCE
 
+        # Sweeps
+        self._source_current_sweep_mode = SweepMode.FIXED
+        self._source_voltage_sweep_mode = SweepMode.FIXED
+
+        self._source_current_start = 0.0
+        self._source_current_stop = 0.0
+        self._source_voltage_start = 0.0
+        self._source_voltage_stop = 0.0
+
+        self._sweep_points = SimulatedKeithley2400.INITIAL_SWEEP_POINTS
+        self._sweep_spacing = SweepSpacing.LINEAR
+        self._source_delay = 0.0
+
     def _get_state_handlers(self):
         return {
             "running": DefaultRunningState(),
@@ -78,9 +95,12 @@ class SimulatedKeithley2400(StateMachineDevice):
             ]
         )
 
-    def _resistance(self):
+    def _load_resistance(self):
         # The device only tracks current and voltage. Resistance is calculated as a dependent variable
-        r = self.voltage / self.current
+        return self.voltage / self.current
+
+    def _resistance(self):
+        r = self._load_resistance()
         return (
             min(r, self._resistance_range)
             if self._resistance_range_mode == ResistanceRangeMode.MANUAL
@@ -115,6 +135,65 @@ class SimulatedKeithley2400(StateMachineDevice):
     def get_resistance(self, as_string=False):
         return self._format_power_output(self._resistance(), as_string)
 
+    def sweep_enabled(self):
+        """Whether a reading sweeps the source rather than measuring at a fixed level.
+        """
+        if self._source_mode == SourceMode.VOLTAGE:
+            return self._source_voltage_sweep_mode == SweepMode.SWEEP
+        return self._source_current_sweep_mode == SweepMode.SWEEP
+
+    def _sweep_source_levels(self):
+        """The source levels of every point of the sweep of the current source function.
+        """
+        if self._source_mode == SourceMode.VOLTAGE:
+            start, stop = self._source_voltage_start, self._source_voltage_stop
+        else:
+            start, stop = self._source_current_start, self._source_current_stop
+
+        if self._sweep_spacing == SweepSpacing.LOGARITHMIC:
+            if start * stop <= 0:
+                raise ValueError(
+                    "A log sweep needs a start and stop of the same sign, not {} and {}".format(
+                        start, stop
+                    )
+                )
+            return np.geomspace(start, stop, self._sweep_points)
+        return np.linspace(start, stop, self._sweep_points)
+
+    def _sweep(self):
+        """Calculate the voltage, current and resistance of every point of a sweep at once.
+
+        The sweep is sourced into the load the device is currently modelling, whose resistance is
+        the ratio of its voltage and current. Points where the measured function would exceed its
+        compliance limit are held at the limit, which also limits the source.
+
+        :return: Arrays of the voltages, currents and resistances of the sweep
+        """
+        load = self._load_resistance()
+        levels = self._sweep_source_levels()
+
+        if self._source_mode == SourceMode.VOLTAGE:
+            limit = abs(self._current_compliance)
+            currents = np.clip(levels / load, -limit, limit)
+            voltages = currents * load
+        else:
+            limit = abs(self._voltage_compliance)
+            voltages = np.clip(levels * load, -limit, limit)
+            currents = voltages / load
+
+        resistances = np.full(len(levels), self._resistance())
+        return voltages, currents, resistances
+
+    def get_sweep(self):
+        """Get the readings of a whole sweep as one string of voltage, current and resistance
+        triplets, one per point.
+        """
+        voltages, currents, resistances = self._sweep()
+        if self._offset_compensation_mode == OffsetCompensationMode.ON:
+            voltages = voltages - SimulatedKeithley2400.INITIAL_VOLTAGE
+            currents = currents - SimulatedKeithley2400.INITIAL_CURRENT
+        return format_values(np.column_stack((voltages, currents, resistances)).ravel().tolist())
+
     def update(self, dt):
         """Update the current and voltage values based on the current mode and time elapsed.
         """
@@ -288,3 +367,71 @@ class SimulatedKeithley2400(StateMachineDevice):
 
     def set_measured_voltage_range(self, value):
         self._measured_voltage_range = value
+
+    def get_source_current_sweep_mode(self):
+        return self._source_current_sweep_mode
+
+    def set_source_current_sweep_mode(self, mode):
+        if SimulatedKeithley2400._check_mode(mode, SweepMode):
+            self._source_current_sweep_mode = mode
+
+    def get_source_voltage_sweep_mode(self):
+        return self._source_voltage_sweep_mode
+
+    def set_source_voltage_sweep_mode(self, mode):
+        if SimulatedKeithley2400._check_mode(mode, SweepMode):
+            self._source_voltage_sweep_mode = mode
+
+    def get_source_current_start(self):
+        return self._source_current_start
+
+    def set_source_current_start(self, value):
+        self._source_current_start = value
+
+    def get_source_current_stop(self):
+        return self._source_current_stop
+
+    def set_source_current_stop(self, value):
+        self._source_current_stop = value
+
+    def get_source_voltage_start(self):
+        return self._source_voltage_start
+
+    def set_source_voltage_start(self, value):
+        self._source_voltage_start = value
+
+    def get_source_voltage_stop(self):
+        return self._source_voltage_stop
+
+    def set_source_voltage_stop(self, value):
+        self._source_voltage_stop = value
+
+    def get_sweep_points(self):
+        return self._sweep_points
+
+    def set_sweep_points(self, value):
+        if not 1 <= value <= SimulatedKeithley2400.MAXIMUM_SWEEP_POINTS:
+            raise ValueError(
+                "A sweep has 1 to {} points, not {}".format(
+                    SimulatedKeithley2400.MAXIMUM_SWEEP_POINTS, value
+                )
+            )
+        self._sweep_points = value
+
+    def get_sweep_spacing(self):
+        return self._sweep_spacing
+
+    def set_sweep_spacing(self, mode):
+        if SimulatedKeithley2400._check_mode(mode, SweepSpacing):
+            self._sweep_spacing = mode
+
+    def get_source_delay(self):
+        return self._source_delay
+
+    def set_source_delay(self, value):
+        """Set the settling delay before each source level is measured.
+
+        The delay is only stored so that it can be read back. The emulator does not wait, so a
+        sweep is returned as soon as it is read whatever the delay.
+        """
+        self._source_delay = value
@@ -91,6 +91,42 @@ class Keithley2400StreamInterface(StreamInterface):
         .escape(":SENS:VOLT:RANG ")
         .arg(SCI_NOTATION_REGEX)
         .build(),
+        CmdBuilder("get_source_current_sweep_mode").escape(":SOUR:CURR:MODE?").build(),
+        CmdBuilder("set_source_current_sweep_mode")
+        .escape(":SOUR:CURR:MODE ")
+        .enum("FIX", "SWE")
+        .build(),
+        CmdBuilder("get_source_voltage_sweep_mode").escape(":SOUR:VOLT:MODE?").build(),
+        CmdBuilder("set_source_voltage_sweep_mode")
+        .escape(":SOUR:VOLT:MODE ")
+        .enum("FIX", "SWE")
+        .build(),
+        CmdBuilder("get_source_current_start").escape(":SOUR:CURR:STAR?").build(),
+        CmdBuilder("set_source_current_start")
+        .escape(":SOUR:CURR:STAR ")
+        .arg(SCI_NOTATION_REGEX)
+        .build(),
+        CmdBuilder("get_source_current_stop").escape(":SOUR:CURR:STOP?").build(),
+        CmdBuilder("set_source_current_stop")
+        .escape(":SOUR:CURR:STOP ")
+        .arg(SCI_NOTATION_REGEX)
+        .build(),
+        CmdBuilder("get_source_voltage_start").escape(":SOUR:VOLT:STAR?").build(),
+        CmdBuilder("set_source_voltage_start")
+        .escape(":SOUR:VOLT:STAR ")
+        .arg(SCI_NOTATION_REGEX)
+        .build(),
+        CmdBuilder("get_source_voltage_stop").escape(":SOUR:VOLT:STOP?").build(),
+        CmdBuilder("set_source_voltage_stop")
+        .escape(":SOUR:VOLT:STOP ")
+        .arg(SCI_NOTATION_REGEX)
+        .build(),
+        CmdBuilder("get_sweep_points").escape(":SOUR:SWE:POIN?").build(),
+        CmdBuilder("set_sweep_points").escape(":SOUR:SWE:POIN ").int().build(),
+        CmdBuilder("get_sweep_spacing").escape(":SOUR:SWE:SPAC?").build(),
+        CmdBuilder("set_sweep_spacing").escape(":SOUR:SWE:SPAC ").enum("LIN", "LOG").build(),
+        CmdBuilder("get_source_delay").escape(":SOUR:DEL?").build(),
+        CmdBuilder("set_source_delay").escape(":SOUR:DEL ").arg(SCI_NOTATION_REGEX).build(),
     }
 
     # Private control commands that can be used as an alternative to the lewis backdoor
@@ -107,8 +143,12 @@ class Keithley2400StreamInterface(StreamInterface):
     def get_values(self):
         """Get the current, voltage and resistance readings
 
-        :return: A string of 3 doubles: voltage, current, resistance. In that order
+        :return: A string of 3 doubles: voltage, current, resistance. In that order. When the source
+            is swept, the triplets of every point of the sweep in one string
         """
+        if self._device.get_output_mode() == OutputMode.ON and self._device.sweep_enabled():
+            return self._device.get_sweep()
+
         return (
             ", ".join(
                 [
@@ -230,8 +270,7 @@ class Keithley2400StreamInterface(StreamInterface):
     @has_log
     def handle_error(self, request, error):
         err = "An error occurred at request {}: {}".format(str(request), str(error))
-        print(err)
-        self.log.info(err)
+        self.log.error(err)
         return str(err)
 
     def set_source_current_range(self, value):
@@ -258,3 +297,61 @@ class Keithley2400StreamInterface(StreamInterface):
     def set_measured_current_autorange_mode(self, value):
         val = self._device.set_measured_current_autorange_mode(value)
         return val
+
+    def get_source_current_sweep_mode(self):
+        return self._device.get_source_current_sweep_mode()
+
+    def set_source_current_sweep_mode(self, new_mode):
+        return self._set_mode(
+            self._device.set_source_current_sweep_mode, new_mode, ":SOUR:CURR:MODE"
+        )
+
+    def get_source_voltage_sweep_mode(self):
+        return self._device.get_source_voltage_sweep_mode()
+
+    def set_source_voltage_sweep_mode(self, new_mode):
+        return self._set_mode(
+            self._device.set_source_voltage_sweep_mode, new_mode, ":SOUR:VOLT:MODE"
+        )
+
+    def get_source_current_start(self):
+        return self._device.get_source_current_start()
+
+    def set_source_current_start(self, value):
+        return self._device.set_source_current_start(float(value))
+
+    def get_source_current_stop(self):
+        return self._device.get_source_current_stop()
+
+    def set_source_current_stop(self, value):
+        return self._device.set_source_current_stop(float(value))
+
+    def get_source_voltage_start(self):
+        return self._device.get_source_voltage_start()
+
+    def set_source_voltage_start(self, value):
+        return self._device.set_source_voltage_start(float(value))
+
+    def get_source_voltage_stop(self):
+        return self._device.get_source_voltage_stop()
+
+    def set_source_voltage_stop(self, value):
+        return self._device.set_source_voltage_stop(float(value))
+
+    def get_sweep_points(self):
+        return self._device.get_sweep_points()
+
+    def set_sweep_points(self, value):
+        return self._device.set_sweep_points(value)
+
+    def get_sweep_spacing(self):
+        return self._device.get_sweep_spacing()
+
+    def set_sweep_spacing(self, new_mode):
+        return self._set_mode(self._device.set_sweep_spacing, new_mode, ":SOUR:SWE:SPAC")
+
+    def get_source_delay(self):
+        return self._device.get_source_delay()
+
+    def set_source_delay(self, value):
+        return self._device.set_source_delay(float(value))
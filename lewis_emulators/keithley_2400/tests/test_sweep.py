@@ -0,0 +1,125 @@
+import unittest
+
+import numpy as np
+from hamcrest import assert_that, close_to, contains_exactly, equal_to, is_
+
+from lewis_emulators.keithley_2400.control_modes import SourceMode, SweepSpacing
+from lewis_emulators.keithley_2400.device import SimulatedKeithley2400
+
+
+def levels(device):
+    voltages, currents, _ = device._sweep()
+    return voltages if device._source_mode == SourceMode.VOLTAGE else currents
+
+
+class SweepTests(unittest.TestCase):
+    """Tests the voltages, currents and resistances calculated for a source sweep."""
+
+    def setUp(self):
+        self.device = SimulatedKeithley2400()
+        # A 100 ohm load
+        self.device.set_voltage(10.0)
+        self.device.set_current(0.1)
+        self.device.set_voltage_compliance(1000.0)
+        self.device.set_current_compliance(1.0)
+
+    def sweep_current(self, start, stop, points, spacing=SweepSpacing.LINEAR):
+        self.device.set_source_mode(SourceMode.CURRENT)
+        self.device.set_source_current_start(start)
+        self.device.set_source_current_stop(stop)
+        self.device.set_sweep_points(points)
+        self.device.set_sweep_spacing(spacing)
+
+    def sweep_voltage(self, start, stop, points, spacing=SweepSpacing.LINEAR):
+        self.device.set_source_mode(SourceMode.VOLTAGE)
+        self.device.set_source_voltage_start(start)
+        self.device.set_source_voltage_stop(stop)
+        self.device.set_sweep_points(points)
+        self.device.set_sweep_spacing(spacing)
+
+    def test_that_GIVEN_a_linear_current_sweep_THEN_the_currents_are_evenly_spaced(self):
+        # Given:
+        self.sweep_current(0.0, 0.04, 5)
+
+        # When:
+        voltages, currents, resistances = self.device._sweep()
+
+        # Then:
+        np.testing.assert_allclose(currents, [0.0, 0.01, 0.02, 0.03, 0.04])
+        np.testing.assert_allclose(voltages, [0.0, 1.0, 2.0, 3.0, 4.0])
+        np.testing.assert_allclose(resistances, [100.0] * 5)
+
+    def test_that_GIVEN_a_log_voltage_sweep_THEN_the_voltages_are_evenly_spaced_in_decades(self):
+        # Given:
+        self.sweep_voltage(0.01, 10.0, 4, SweepSpacing.LOGARITHMIC)
+
+        # When:
+        voltages, currents, _ = self.device._sweep()
+
+        # Then:
+        np.testing.assert_allclose(voltages, [0.01, 0.1, 1.0, 10.0])
+        np.testing.assert_allclose(currents, [1e-4, 1e-3, 1e-2, 1e-1])
+
+    def test_that_GIVEN_a_negative_log_sweep_THEN_the_levels_keep_their_sign(self):
+        self.sweep_current(-1e-6, -1e-3, 4, SweepSpacing.LOGARITHMIC)
+
+        np.testing.assert_allclose(levels(self.device), [-1e-6, -1e-5, -1e-4, -1e-3])
+
+    def test_that_GIVEN_a_current_sweep_past_voltage_compliance_THEN_it_is_held_at_the_limit(self):
+        # Given:
+        self.device.set_voltage_compliance(2.5)
+        self.sweep_current(-0.04, 0.04, 5)
+
+        # When:
+        voltages, currents, _ = self.device._sweep()
+
+        # Then:
+        np.testing.assert_allclose(voltages, [-2.5, -2.0, 0.0, 2.0, 2.5])
+        np.testing.assert_allclose(currents, [-0.025, -0.02, 0.0, 0.02, 0.025])
+
+    def test_that_GIVEN_a_voltage_sweep_past_current_compliance_THEN_it_is_held_at_the_limit(self):
+        # Given:
+        self.device.set_current_compliance(0.015)
+        self.sweep_voltage(0.0, 3.0, 4)
+
+        # When:
+        voltages, currents, _ = self.device._sweep()
+
+        # Then:
+        np.testing.assert_allclose(currents, [0.0, 0.01, 0.015, 0.015])
+        np.testing.assert_allclose(voltages, [0.0, 1.0, 1.5, 1.5])
+
+    def test_that_GIVEN_a_log_sweep_through_zero_THEN_a_value_error_is_raised(self):
+        self.sweep_current(-1e-3, 1e-3, 3, SweepSpacing.LOGARITHMIC)
+
+        with self.assertRaises(ValueError):
+            self.device._sweep()
+
+    def test_that_GIVEN_a_log_sweep_from_zero_THEN_a_value_error_is_raised(self):
+        self.sweep_voltage(0.0, 1.0, 3, SweepSpacing.LOGARITHMIC)
+
+        with self.assertRaises(ValueError):
+            self.device._sweep()
+
+    def test_that_GIVEN_a_single_point_sweep_THEN_only_the_start_is_sourced(self):
+        self.sweep_current(0.02, 0.04, 1)
+
+        assert_that(levels(self.device).tolist(), contains_exactly(close_to(0.02, 1e-12)))
+
+    def test_that_GIVEN_a_sweep_THEN_small_currents_are_formatted_with_their_exponent(self):
+        # Given:
+        self.sweep_current(1e-9, 2e-9, 2)
+
+        # When:
+        reading = self.device.get_sweep()
+
+        # Then:
+        assert_that(
+            reading,
+            is_(
+                equal_to(
+                    "+1.000000E-07, +1.000000E-09, +1.000000E+02, "
+                    "+2.000000E-07, +2.000000E-09, +1.000000E+02"
+                )
+            ),
+        )
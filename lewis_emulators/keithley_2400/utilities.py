@@ -2,3 +2,12 @@ def format_value(f, as_string):
     """Format a floating point value into either a string or return it as is.
     """
     return "{0:.3f}".format(f) if as_string else f
+
+
+def format_values(values):
+    """Format a sequence of floating point values into a single comma separated string.
+
+    The values are in exponential notation, as the device sends them, so that small currents keep
+    their significant figures.
+    """
+    return ", ".join(["{:+.6E}"] * len(values)).format(*values)
@@ -48,7 +48,6 @@ class KepcoStreamInterface(StreamInterface):
 
     def handle_error(self, request, error):
         self.log.error("An error occurred at request" + repr(request) + ": " + repr(error))
-        print("An error occurred at request" + repr(request) + ": " + repr(error))
 
     @if_connected
     def read_actual_voltage(self):
@@ -52,12 +52,21 @@ class SimulatedKynctm3K(StateMachineDevice):
 
         OUT_values contains the measurement values to be returned. A False value is considered to not
         be in the program, and will not be returned.
+
+        auto_send_rate is the number of measurement frames per second streamed unsolicited while
+        auto-send is on. At 0 nothing is streamed, and the device only replies to polls.
         """
         self.OUT_values = None
         self.truncated_output = False
         self.auto_send = False
         self.input_mode = "R0"
 
+        self.auto_send_rate = 0.0
+        self.auto_send_frames_sent = 0
+        self.auto_send_frames_missed = 0
+        self._frame_key = None
+        self._frame = None
+
         pass
 
     def reset_device(self):
@@ -156,6 +165,29 @@ class SimulatedKynctm3K(StateMachineDevice):
             A string containing the measurement values for the current program, formatted as per the user manual
 
         """
+        return self._format_measurement_frame()
+
+    def auto_send_frame(self):
+        """The measurement frame streamed in auto-send mode, which is rendered once for as long as
+        the values and settings stay the same.
+
+        An out of range channel keeps the sign it was rendered with until the values change.
+
+        Returns:
+            The formatted measurement values as a string, or None if there are none to send
+
+        """
+        key = (None if self.OUT_values is None else tuple(self.OUT_values), self.truncated_output)
+        if key != self._frame_key:
+            frame = self._format_measurement_frame()
+            if frame is not None and self.truncated_output:
+                frame = frame[: int(round(len(frame) / 2.0))]
+            self._frame = frame
+            self._frame_key = key
+
+        return self._frame
+
+    def _format_measurement_frame(self):
         if self.OUT_values is None:
             return None
         else:
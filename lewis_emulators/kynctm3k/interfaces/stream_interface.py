@@ -1,7 +1,18 @@
+import time
+
 from lewis.adapters.stream import Cmd, StreamInterface
 from lewis.core.logging import has_log
 from lewis.utils.command_builder import CmdBuilder
 
+from emulator_utils.periodic_publisher import shared_publisher
+
+# Frames streamed at a higher rate than this are sent in batches, rather than one message each
+MAX_BATCH_RATE = 100.0
+# How often to check whether to start streaming while auto-send is off
+IDLE_RATE = 10.0
+# Frames that are this many seconds late are dropped rather than sent in a burst
+MAX_BACKLOG = 0.1
+
 
 @has_log
 class Kynctm3KStreamInterface(StreamInterface):
@@ -15,6 +26,56 @@ class Kynctm3KStreamInterface(StreamInterface):
     in_terminator = "\r"
     out_terminator = "\r"
 
+    def __init__(self):
+        super(Kynctm3KStreamInterface, self).__init__()
+        self._frames_due = 0.0
+        self._last_batch = None
+        self.publication = shared_publisher().register(self, IDLE_RATE, self.get_auto_send_frames)
+
+    def get_auto_send_frames(self):
+        """Streams the measurement frames due in auto-send mode since the last batch, as one
+        message. Frames are only counted as sent once the message has been handed to a connected
+        client.
+        """
+        handler = getattr(self, "handler", None)
+        if handler is None or not handler.connected:
+            self._last_batch = None
+            return None
+
+        # This runs on the publisher thread, so the device is only touched under its lock
+        device_lock = handler._stream_server.device_lock
+        with device_lock:
+            rate = self._device.auto_send_rate if self._device.auto_send else 0.0
+            self.publication.rate = min(rate, MAX_BATCH_RATE) if rate > 0 else IDLE_RATE
+
+            frame = self._device.auto_send_frame() if rate > 0 else None
+            if frame is None:
+                self._last_batch = None
+                return None
+
+            now = time.monotonic()
+            if self._last_batch is None:
+                self._frames_due = 1.0
+            else:
+                self._frames_due += (now - self._last_batch) * rate
+            self._last_batch = now
+
+            backlog = max(1.0, rate * MAX_BACKLOG)
+            if self._frames_due > backlog:
+                self._device.auto_send_frames_missed += int(self._frames_due - backlog)
+                self._frames_due -= int(self._frames_due - backlog)
+
+            count = int(self._frames_due)
+            if count == 0:
+                return None
+            self._frames_due -= count
+
+        # Raises if the client has gone away, which the publication counts as an error
+        handler.unsolicited_reply(self.out_terminator.join([frame] * count))
+        with device_lock:
+            self._device.auto_send_frames_sent += count
+        return None
+
     def return_data(self):
         return_data = self._device.format_output_data()
         self.log.info("Returning {}".format(return_data))
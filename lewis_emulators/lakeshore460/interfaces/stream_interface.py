@@ -54,7 +54,6 @@ class Lakeshore460StreamInterface(StreamInterface):
 
     def handle_error(self, request, error):
         self.log.error("An error occurred at request" + repr(request) + ": " + repr(error))
-        print("An error occurred at request" + repr(request) + ": " + repr(error))
 
     def get_idn(self):
         return "{0}".format(self._device.idn)
@@ -1,10 +1,28 @@
 import struct
-import threading
 
 from lewis.adapters.stream import StreamInterface
 
+from emulator_utils.periodic_publisher import shared_publisher
+
 EXPECTED_MESSAGE_LENGTH = 188
 
+# The status message is a fixed message "preamble", then 6 integer header fields which we ignore. They are:
+# - Order number
+# - Serial number
+# - Length of measurement data
+# - Length of video data
+# - Frame number
+# - Counter
+# Then two little-endian signed integers corresponding to the data for sensors 1 and 2 respectively, and 38 more
+# integers corresponding to video data (???), which we ignore.
+_STATUS_MESSAGE = struct.Struct("<4s6I2i38I")
+_SENSOR_DATA = struct.Struct("<2i")
+_SENSOR_DATA_OFFSET = struct.calcsize("<4s6I")
+
+assert (
+    _STATUS_MESSAGE.size == EXPECTED_MESSAGE_LENGTH
+), "Message length {} was expected to be {}".format(_STATUS_MESSAGE.size, EXPECTED_MESSAGE_LENGTH)
+
 
 class MecfrfStreamInterface(StreamInterface):
     # Commands that we expect via serial during normal operation (No commands - the device always sends a stream of
@@ -16,59 +34,30 @@ class MecfrfStreamInterface(StreamInterface):
 
     def __init__(self):
         super(MecfrfStreamInterface, self).__init__()
-        self._queue_next_unsolicited_message()
-
-    def _queue_next_unsolicited_message(self):
-        timer = threading.Timer(1.0, self.get_data_unsolicited)
-        timer.daemon = True
-        timer.start()
+        self._status_message = bytearray(_STATUS_MESSAGE.pack(b"DATA", *[0] * 6, 0, 0, *[0] * 38))
+        # The device streams a status message once a second
+        self.publication = shared_publisher().register(self, 1.0, self.get_data_unsolicited)
 
     def handle_error(self, request, error):
         print("An error occurred at request " + repr(request) + ": " + repr(error))
         return str(error)
 
     def get_data_unsolicited(self):
-        self._queue_next_unsolicited_message()
-
         if not self.device.connected:
-            return
+            return None
 
-        try:
-            handler = self.handler
-        except AttributeError:
-            # Happens if no client is currently connected.
-            return
-        else:
-            if self.device.corrupted_messages:
-                # Nonsense message which should cause alarms in the IOC.
-                handler.unsolicited_reply(b"A" * EXPECTED_MESSAGE_LENGTH)
-            else:
-                handler.unsolicited_reply(self._construct_status_message())
+        if self.device.corrupted_messages:
+            # Nonsense message which should cause alarms in the IOC.
+            return b"A" * EXPECTED_MESSAGE_LENGTH
+        return self._construct_status_message()
 
     def _construct_status_message(self):
-        # Fixed message "preamble"
-        msg = b"DATA"
-
-        # There are 6 integer header fields which we ignore. They are:
-        # - Order number
-        # - Serial number
-        # - Length of measurement data
-        # - Length of video data
-        # - Frame number
-        # - Counter
-        for _ in range(6):
-            msg += struct.pack("L", 0)
-
-        # Two little-endian signed integers corresponding to the data for sensors 1 and 2 respectively.
-        msg += struct.pack("<l", int(self.device.sensor1))
-        msg += struct.pack("<l", int(self.device.sensor2))
-
-        # 38 more integers corresponding to video data (???), which we ignore.
-        for _ in range(38):
-            msg += struct.pack("L", 0)
-
-        assert (
-            len(msg) == EXPECTED_MESSAGE_LENGTH
-        ), "Message length {} was expected to be {}".format(len(msg), EXPECTED_MESSAGE_LENGTH)
-
-        return msg
+        # Only the sensor values change between messages, so they are packed into the message built up front. It is
+        # copied out because the handler queues the message rather than sending it straight away.
+        _SENSOR_DATA.pack_into(
+            self._status_message,
+            _SENSOR_DATA_OFFSET,
+            int(self.device.sensor1),
+            int(self.device.sensor2),
+        )
+        return bytes(self._status_message)
@@ -3,6 +3,7 @@ from lewis.core.logging import has_log
 from lewis.utils.command_builder import CmdBuilder
 from lewis.utils.replies import conditional_reply
 
+from emulator_utils.command_index import IndexedCommandsMixin
 from lewis_emulators.mercuryitc.device import ChannelTypes
 
 if_connected = conditional_reply("connected")
@@ -11,7 +12,7 @@ ISOBUS_PREFIX = "@1"
 
 
 @has_log
-class MercuryitcInterface(StreamInterface):
+class MercuryitcInterface(IndexedCommandsMixin, StreamInterface):
     commands = {
         # System-level commands
         CmdBuilder("get_catalog").optional(ISOBUS_PREFIX).escape("READ:SYS:CAT").eos().build(),
@@ -425,7 +426,6 @@ class MercuryitcInterface(StreamInterface):
         err_string = "command was: {}, error was: {}: {}\n".format(
             request, error.__class__.__name__, error
         )
-        print(err_string)
         self.log.error(err_string)
 
         return "{}:INVALID".format(request.lstrip(ISOBUS_PREFIX))
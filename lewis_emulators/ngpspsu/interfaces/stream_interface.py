@@ -27,7 +27,7 @@ class NgpspsuStreamInterface(StreamInterface):
     in_terminator = "\r"
 
     def handle_error(self, request, error):
-        """Prints an error message if a command is not recognised.
+        """Logs an error message if a command is not recognised.
 
         Args:
             request : Request.
@@ -38,8 +38,6 @@ class NgpspsuStreamInterface(StreamInterface):
         """
         self.log.error("An error occurred at request " + repr(request) + ": " + repr(error))
 
-        print("An error occurred at request {}: {}".format(request, error))
-
     @if_connected
     def get_version(self):
         """Returns the model number and firmware of the device
@@ -24,7 +24,7 @@ class OerconeStreamInterface(StreamInterface):
     out_terminator = "\r\n"
 
     def handle_error(self, request, error):
-        """Prints and logs an error message if a command is not recognised.
+        """Logs an error message if a command is not recognised.
 
         Args:
             request : Request.
@@ -36,7 +36,6 @@ class OerconeStreamInterface(StreamInterface):
         err_string = 'command was: "{}", error was: {}: {}\n'.format(
             request, error.__class__.__name__, error
         )
-        print(err_string)
         self.log.error(err_string)
         return err_string
 
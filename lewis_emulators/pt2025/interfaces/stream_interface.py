@@ -1,9 +1,9 @@
 
-import threading
-
 from lewis.adapters.stream import StreamInterface
 from lewis.utils.replies import conditional_reply
 
+from emulator_utils.periodic_publisher import shared_publisher
+
 if_connected = conditional_reply("connected")
 DATA = "L12.123456T"
 NUMBER_OF_MESSAGES = 10
@@ -16,26 +16,12 @@ class Pt2025StreamInterface(StreamInterface):
 
     def __init__(self):
         super(Pt2025StreamInterface, self).__init__()
-        self._queue_next_unsolicited_message()
-
-    def _queue_next_unsolicited_message(self):
-        timer = threading.Timer(1.0, self.get_data_unsolicited)
-        timer.daemon = True
-        timer.start()
+        self.publication = shared_publisher().register(self, 1.0, self.get_data_unsolicited)
 
     def get_data_unsolicited(self):
-        self._queue_next_unsolicited_message()
-
         if not self.device.connected:
-            return
-
-        try:
-            handler = self.handler
-        except AttributeError:
-            # Happens if no client is currently connected.
-            return
-        else:
-            handler.unsolicited_reply(str(self.device.data))
+            return None
+        return str(self.device.data)
 
     def handle_error(self, request, error):
         pass
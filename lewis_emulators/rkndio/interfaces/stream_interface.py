@@ -23,7 +23,7 @@ class RkndioStreamInterface(StreamInterface):
     out_terminator = "\r\n"
 
     def handle_error(self, request, error):
-        """Prints an error message if a command is not recognised.
+        """Logs an error message if a command is not recognised.
 
         Args:
             request : Request.
@@ -34,8 +34,6 @@ class RkndioStreamInterface(StreamInterface):
         """
         self.log.error("An error occurred at request " + repr(request) + ": " + repr(error))
 
-        print("An error occurred at request {}: {}".format(request, error))
-
     @conditional_reply("connected")
     def get_idn(self):
         return self._device.idn
@@ -1,18 +1,25 @@
+import struct
 from os import urandom
 
 from lewis.adapters.stream import Cmd, StreamInterface
 from lewis.core.logging import has_log
-from lewis.utils.byte_conversions import float_to_raw_bytes, int_to_raw_bytes, raw_bytes_to_int
+from lewis.utils.byte_conversions import raw_bytes_to_int
 from lewis.utils.replies import conditional_reply
 
+from emulator_utils.framing import FramedStreamAdapter, LengthPrefixedFramer
+from emulator_utils.traffic_log import TrafficLog, log_traffic
 
-def log_replies(f):
-    def _wrapper(self, *args, **kwargs):
-        result = f(self, *args, **kwargs)
-        self.log.info(f"Reply in {f.__name__}: {result}")
-        return result
+# Most registers a single read (function 3) or write (function 16) may cover, from the modbus spec
+MAX_READ_REGISTERS = 125
+MAX_WRITE_REGISTERS = 123
 
-    return _wrapper
+# The device represents 32 bit values in 2 words, little endian, but each of these words
+# respectively is big endian. Swapping the words of a big endian value gives the same layout.
+_BIG_ENDIAN_FLOAT = struct.Struct(">f")
+
+
+def _swap_words(value_bytes):
+    return value_bytes[2:] + value_bytes[:2]
 
 
 @has_log
@@ -28,6 +35,7 @@ class SKFChopperModbusInterface(StreamInterface):
 
     def __init__(self):
         super().__init__()
+        self.traffic = TrafficLog("skf_chopper_modbus")
         self.read_commands = {
             353: self.get_freq,  # RBV
             345: self.get_freq,  # SP:RBV
@@ -49,18 +57,20 @@ class SKFChopperModbusInterface(StreamInterface):
 
     in_terminator = ""
     out_terminator = b""
+
+    # The MBAP header holds the number of bytes following its length field
+    adapter = FramedStreamAdapter
+    framer = LengthPrefixedFramer(offset=4, size=2, byteorder="big", extra=6)
     protocol = "stream"
 
     def handle_error(self, request, error):
         error_message = "An error occurred at request " + repr(request) + ": " + repr(error)
-        print(error_message)
         self.log.error(error_message)
         return str(error).encode("utf-8")
 
-    @log_replies
+    @log_traffic
     @conditional_reply("connected")
     def any_command(self, command):
-        self.log.info(command)
         transaction_id = command[0:2] if self.device.send_ok_transid else urandom(2)
         protocol_id = command[2:4]
         length = int.from_bytes(command[4:6], "big")
@@ -78,68 +88,83 @@ class SKFChopperModbusInterface(StreamInterface):
         else:
             raise ValueError(f"Unknown modbus function code: {function_code}")
 
-    def handle_read(self, transaction_id, protocol_id, unit, function_code, data):
-        mem_address = raw_bytes_to_int(data[0:2], False)
-        words_to_read = raw_bytes_to_int(data[2:4], False)
-        self.log.info(f"Attempting to read {words_to_read} words from mem address: {mem_address}")
-        if mem_address in self.read_commands.keys():
+    def read_parameter(self, mem_address, words):
+        """Reads the value at an address as it is laid out in a read reply.
+        Addresses without a getter read as zero.
+
+        :param mem_address: the address of the parameter
+        :param words: the number of 16 bit words the parameter takes up, 1 or 2
+        :return: the raw bytes of the parameter
+        """
+        if mem_address in self.read_commands:
             reply_data = self.read_commands[mem_address]()
         else:
             reply_data = 0
 
-        self.log.info(f"reply_data = {reply_data}")
-
-        if isinstance(reply_data, float) and words_to_read == 2:
-            data_length = 4
-            littleendian_bytes = bytearray(float_to_raw_bytes(reply_data, low_byte_first=True))
-            # split up in 2-byte words, then swap endianness respectively to big endian.
-            # The device represents float32s in 2 words, little endian, but each of these words respectively are big endian.
-
-            # Get the first 2 bytes, then flip endianness
-            first_word = littleendian_bytes[:2][::-1]
-
-            # Do the same for the remainder
-            second_word = littleendian_bytes[2:][::-1]
-
-            # Concatenate the two bytes/words
-            reply_data_bytes = first_word + second_word
+        if isinstance(reply_data, float) and words == 2:
+            return _swap_words(_BIG_ENDIAN_FLOAT.pack(reply_data))
         elif isinstance(reply_data, int):
-            if words_to_read == 2:
-                data_length = 4
-                littleendian_bytes = bytearray(
-                    int_to_raw_bytes(reply_data, data_length, low_byte_first=True)
-                )
-                first_word = littleendian_bytes[:2][::-1]
-                second_word = littleendian_bytes[2:][::-1]
-                reply_data_bytes = first_word + second_word
-            else:
-                data_length = 2
-                reply_data_bytes = int_to_raw_bytes(reply_data, data_length, low_byte_first=False)
+            if words == 2:
+                return _swap_words(reply_data.to_bytes(4, byteorder="big", signed=reply_data < 0))
+            return reply_data.to_bytes(2, byteorder="big", signed=reply_data < 0)
         else:
             raise ValueError("Unknown data type or data length")
 
-        function_code_bytes = function_code.to_bytes(1, byteorder="big")
-        unit_bytes = unit.to_bytes(1, byteorder="big")
-        data_length_bytes = data_length.to_bytes(1, byteorder="big")
-        length = int(3 + data_length).to_bytes(2, byteorder="big")
-
-        reply = (
-            transaction_id
-            + protocol_id
-            + length
-            + unit_bytes
-            + function_code_bytes
-            + data_length_bytes
-            + reply_data_bytes
+    def handle_read(self, transaction_id, protocol_id, unit, function_code, data):
+        """Reads a block of words. Every parameter of the device is 32 bits wide and takes up
+        2 words, so a read of 2 * N words returns the N parameters from the start address onwards.
+        A read of a single word returns the parameter at the start address as a 16 bit integer.
+        """
+        mem_address = raw_bytes_to_int(data[0:2], False)
+        words_to_read = raw_bytes_to_int(data[2:4], False)
+        self.log.debug(
+            "Attempting to read %d words from mem address: %d", words_to_read, mem_address
         )
 
-        return reply
+        if words_to_read == 1:
+            reply_data_bytes = self.read_parameter(mem_address, 1)
+        elif words_to_read % 2 == 0 and 0 < words_to_read <= MAX_READ_REGISTERS:
+            reply_data_bytes = b"".join(
+                self.read_parameter(address, 2)
+                for address in range(mem_address, mem_address + words_to_read // 2)
+            )
+        else:
+            raise ValueError(f"Invalid number of words to read: {words_to_read}")
+
+        data_length = len(reply_data_bytes)
+        header = struct.pack(">HBBB", 3 + data_length, unit, function_code, data_length)
+        return transaction_id + protocol_id + header + reply_data_bytes
 
     def handle_write(self, command, data):
-        mem_address = raw_bytes_to_int(data[0:2], False)
-        value = raw_bytes_to_int(data[2:4], False)
-        self.write_commands[mem_address](value)
-        return command
+        """Writes a block of words. As for reads, 2 * N words are written to the N parameters from
+        the start address onwards, each as a 32 bit float, and a single word is written to the
+        parameter at the start address as an unsigned 16 bit integer.
+        """
+        mem_address, words_to_write, byte_count = struct.unpack_from(">HHB", data)
+        if byte_count != 2 * words_to_write or len(data) != 5 + byte_count:
+            raise ValueError(f"Invalid message length {len(data)}")
+
+        values = data[5:]
+        if words_to_write == 1:
+            writes = [(mem_address, raw_bytes_to_int(values, False))]
+        elif words_to_write % 2 == 0 and 0 < words_to_write <= MAX_WRITE_REGISTERS:
+            writes = [
+                (mem_address + index, _BIG_ENDIAN_FLOAT.unpack(_swap_words(values[i : i + 4]))[0])
+                for index, i in enumerate(range(0, byte_count, 4))
+            ]
+        else:
+            raise ValueError(f"Invalid number of words to write: {words_to_write}")
+
+        # Check every parameter up front so that a bad address does not leave a partial write
+        for address, _ in writes:
+            if address not in self.write_commands:
+                raise ValueError(f"Can not write to mem address {address}")
+
+        for address, value in writes:
+            self.write_commands[address](value)
+
+        # Reply with the header, function code, start address and number of words written
+        return command[0:4] + struct.pack(">H", 6) + command[6:12]
 
     def get_freq(self):
         return float(self.device.freq)
@@ -2,10 +2,12 @@ from collections import OrderedDict
 
 from lewis.devices import StateMachineDevice
 
+from emulator_utils.simulation_clock import SimulationClockMixin
+
 from .states import DefaultState, GoingState, StoppingState
 
 
-class SimulatedSkfMb350Chopper(StateMachineDevice):
+class SimulatedSkfMb350Chopper(SimulationClockMixin, StateMachineDevice):
     def _initialize_data(self):
         """Initialize all of the device's attributes.
         """
@@ -13,6 +15,8 @@ class SimulatedSkfMb350Chopper(StateMachineDevice):
         self.phase = 0
         self.frequency = 0
         self.frequency_setpoint = 0
+        # Rate the frequency changes at in Hz/s
+        self.acceleration = 50.0
         self.phase_percent_ok = 100.0
         self.phase_repeatability = 100.0
 
@@ -1,6 +1,6 @@
 from lewis.utils.byte_conversions import float_to_raw_bytes, int_to_raw_bytes
 
-from .crc16 import crc16
+from emulator_utils.checksums import crc16
 
 
 def build_interlock_status(device):
@@ -2,7 +2,8 @@ from lewis.adapters.stream import Cmd, StreamInterface
 from lewis.core.logging import has_log
 from lewis.utils.byte_conversions import raw_bytes_to_int
 
-from .crc16 import crc16, crc16_matches
+from emulator_utils.checksums import crc16, crc16_matches
+
 from .response_utilities import (
     general_status_response_packet,
     phase_information_response_packet,
@@ -23,7 +24,6 @@ class SkfMb350ChopperStreamInterface(StreamInterface):
 
     def handle_error(self, request, error):
         error_message = "An error occurred at request " + repr(request) + ": " + repr(error)
-        print(error_message)
         self.log.error(error_message)
         return str(error)
 
@@ -9,10 +9,12 @@ class DefaultState(State):
 class StoppingState(State):
     def in_state(self, dt):
         device = self._context
-        device.frequency = approaches.linear(device.frequency, 0, 50, dt)
+        device.frequency = approaches.linear(device.frequency, 0, device.acceleration, dt)
 
 
 class GoingState(State):
     def in_state(self, dt):
         device = self._context
-        device.frequency = approaches.linear(device.frequency, device.frequency_setpoint, 50, dt)
+        device.frequency = approaches.linear(
+            device.frequency, device.frequency_setpoint, device.acceleration, dt
+        )
@@ -76,7 +76,7 @@ class Sp2XXStreamInterface(StreamInterface):
     Stopped = "\r\n:"
 
     def handle_error(self, request, error):
-        """Prints an error message if a command is not recognised.
+        """Logs an error message if a command is not recognised.
 
         Args:
             request : Request.
@@ -87,7 +87,6 @@ class Sp2XXStreamInterface(StreamInterface):
         """
         self.log.error("An error occurred at request " + repr(request) + ": " + repr(error))
 
-        print("An error occurred at request {}: {}".format(request, error))
 
     @if_error
     @if_connected
@@ -22,7 +22,6 @@ class TDKLambdaGenesysStreamInterface(StreamInterface):
 
     def handle_error(self, request, error):
         self.log.error("Beep boop. Error occurred at " + repr(request) + ": " + repr(error))
-        print("Beep boop. Error occurred at " + repr(request) + ": " + repr(error))
 
     @conditional_reply("comms_initialized")
     def read_voltage(self):
@@ -6,6 +6,8 @@ from lewis.utils.command_builder import CmdBuilder
 from lewis.utils.constants import ACK
 from lewis.utils.replies import conditional_reply
 
+from emulator_utils.command_index import IndexedCommandsMixin
+
 from ..device import CircuitAssignment
 
 
@@ -326,7 +328,7 @@ class Tpgx00StreamInterfaceBase(object):
         return self.get_error_status_val(self.device.error_status)
 
 
-class Tpg300StreamInterface(Tpgx00StreamInterfaceBase, StreamInterface):
+class Tpg300StreamInterface(IndexedCommandsMixin, Tpgx00StreamInterfaceBase, StreamInterface):
     protocol = "tpg300"
 
     class SFStatus300(Enum):
@@ -427,7 +429,7 @@ class Tpg300StreamInterface(Tpgx00StreamInterfaceBase, StreamInterface):
         return self.ReadState300[readstate_enum.name].value
 
 
-class Tpg500StreamInterface(Tpgx00StreamInterfaceBase, StreamInterface):
+class Tpg500StreamInterface(IndexedCommandsMixin, Tpgx00StreamInterfaceBase, StreamInterface):
     protocol = "tpg500"
 
     class SFStatus500(Enum):
@@ -7,6 +7,7 @@ from .error_states import ErrorStates
 from .ethernet_device import EthernetDevice
 from .gas import Gas
 from .hmi_device import HmiDevice
+from .pressure_network import PressureNetwork
 from .pressure_sensor import PressureSensor
 from .seed_gas_data import SeedGasData
 from .sensor import Sensor
@@ -56,6 +57,7 @@ class SimulatedVolumetricRig(StateMachineDevice):
         # Set up sensors
         self._temperature_sensors = [Sensor() for _ in range(9)]
         self._pressure_sensors = [PressureSensor() for _ in range(5)]
+        self._pressures = PressureNetwork(len(self._buffers), len(self._pressure_sensors))
 
         # Set up special valves
         self._supply_valve = Valve()
@@ -229,33 +231,40 @@ class SimulatedVolumetricRig(StateMachineDevice):
         return self._mixer
 
     def update_pressures(self, dt):
-        # This is a custom behaviour designed to cycle through various valve behaviours. It will ramp up the pressure
-        # to the maximum, close and disable all valves, then let the pressure drop and enable and subsequently reopen
-        # the valves
+        # This is a custom behaviour designed to cycle through various valve behaviours. The buffers fill the system
+        # from the gas supplies to above the target pressure, which closes and disables all buffer valves. The vacuum
+        # extract then pumps the system down, and the buffer valves are enabled and subsequently reopened
         if self._cycle_pressures:
-            number_of_open_buffers = sum(1 for b in self._buffers if b.valve_is_open())
-            for p in self._pressure_sensors:
-                base_rate = 10.0
-                if number_of_open_buffers > 0:
-                    # Approach a pressure above target pressure so we intentionally go over the limit
-                    from random import random
-
-                    p.approach_value(
-                        dt,
-                        1.1 * self._target_pressure,
-                        base_rate * float(number_of_open_buffers) / self.buffer_count() * random(),
-                    )
-                else:
-                    p.approach_value(dt, 0.0, base_rate)
-                if self._overall_pressure() < 0.5 * self._target_pressure:
-                    for b in self._buffers:
-                        b.enable_valve()
-                        if self._overall_pressure() < 0.1 * self._target_pressure:
-                            b.open_valve(self._mixer)
+            # Supply gas above the target pressure so that we intentionally go over the limit
+            self._pressures.step(
+                dt,
+                [b.valve_is_open() for b in self._buffers],
+                self._cell_valve.is_open(),
+                self._vacuum_extract_valve.is_open(),
+                1.1 * self._target_pressure,
+            )
+            for sensor, value in zip(self._pressure_sensors, self._pressures.readings().tolist()):
+                sensor.set_value(value, self._target_pressure)
+            self._cycle_valves()
 
         # Check if system pressure is over the maximum and disable valves if necessary
         self._check_pressure()
 
+    def _cycle_valves(self):
+        if any(b.valve_is_open() for b in self._buffers):
+            return
+
+        if self._overall_pressure() < 0.1 * self._target_pressure:
+            self._vacuum_extract_valve.close()
+            for b in self._buffers:
+                b.enable_valve()
+                b.open_valve(self._mixer)
+        else:
+            if self._overall_pressure() < 0.5 * self._target_pressure:
+                for b in self._buffers:
+                    b.enable_valve()
+            self._vacuum_extract_valve.open()
+
     def _overall_pressure(self):
         # This calculates the pressure based on the 5 readings from the pressure sensor. At the moment this is done in
         # an ad hoc fashion. The actual behaviour hasn't been set on the real device, and it is likely the output from
@@ -273,7 +282,8 @@ class SimulatedVolumetricRig(StateMachineDevice):
         self._cycle_pressures = on
 
     def set_pressures(self, value):
-        # Sets all pressure sensors to have the same value
+        # Sets all pressure sensors, and the pressure of every volume, to have the same value
+        self._pressures.set_pressures(value)
         for p in self._pressure_sensors:
             p.set_value(value, self._target_pressure)
 
@@ -282,3 +292,7 @@ class SimulatedVolumetricRig(StateMachineDevice):
 
     def system_gases(self):
         return self._system_gases
+
+    def seed_pressure_noise(self, seed):
+        # Restarts the noise on the pressure readings from a seed, for reproducible pressure cycles
+        self._pressures.seed(seed)
@@ -0,0 +1,140 @@
+import numpy as np
+
+
+class PressureNetwork(object):
+    """The pressures of the gas volumes of the rig: the buffers, the system manifold the pressure
+    sensors are on and the cell. Each buffer is filled from its gas supply through its valve and is
+    always connected to the system, which is connected to the cell and the vacuum extract through
+    their valves.
+
+    Gas flows through every open connection at a rate proportional to the pressure difference across
+    it, and changes the pressure of a volume in inverse proportion to its size. All pressures are
+    advanced together with one implicit step, which stays stable however long the step is, so the
+    rig can be simulated at any speed. The modes of the network only change with the valves and the
+    supply pressure, so they are kept until one of them does, and a step of any length is then a
+    couple of small matrix-vector products.
+    """
+
+    BUFFER_VOLUME = 1.0
+    SYSTEM_VOLUME = 0.5
+    CELL_VOLUME = 2.0
+
+    # Volume per second flowing through a connection per unit of pressure difference
+    SUPPLY_CONDUCTANCE = 0.5
+    BUFFER_CONDUCTANCE = 2.0
+    CELL_CONDUCTANCE = 1.0
+    VACUUM_CONDUCTANCE = 5.0
+
+    # Standard deviation of the noise on the sensor readings
+    SENSOR_NOISE = 0.05
+
+    def __init__(self, buffer_count, sensor_count, seed=0):
+        """:param buffer_count: The number of buffers
+        :param sensor_count: The number of pressure sensors on the system
+        :param seed: The seed of the sensor noise, so that runs can be reproduced
+        """
+        self._buffer_count = buffer_count
+        self._sensor_count = sensor_count
+
+        buffers = np.arange(buffer_count)
+        system, cell = buffer_count, buffer_count + 1
+        # The gas supply and the vacuum are at a fixed pressure, after the volumes
+        supply, vacuum = buffer_count + 2, buffer_count + 3
+
+        self._volumes = np.array(
+            [self.BUFFER_VOLUME] * buffer_count + [self.SYSTEM_VOLUME, self.CELL_VOLUME]
+        )
+        self.pressures = np.zeros(len(self._volumes))
+        self._system = system
+
+        # The connections in order: buffer valves, buffers to system, cell valve, vacuum valve
+        from_nodes = np.concatenate((np.full(buffer_count, supply), buffers, [system, system]))
+        to_nodes = np.concatenate((buffers, np.full(buffer_count, system), [cell, vacuum]))
+        self._conductances = np.concatenate(
+            (
+                np.full(buffer_count, self.SUPPLY_CONDUCTANCE),
+                np.full(buffer_count, self.BUFFER_CONDUCTANCE),
+                [self.CELL_CONDUCTANCE, self.VACUUM_CONDUCTANCE],
+            )
+        )
+        self._always_open = np.ones(buffer_count, dtype=bool)
+
+        # Incidence matrix of the connections, with the supply and vacuum as the last two nodes
+        connections = np.arange(len(self._conductances))
+        self._incidence = np.zeros((len(connections), len(self.pressures) + 2))
+        self._incidence[connections, from_nodes] = 1.0
+        self._incidence[connections, to_nodes] = -1.0
+        self._reservoirs = np.zeros(2)
+
+        self._step_key = None
+        self._inflow = None
+        self._rates = None
+        self._to_modes = None
+        self._from_modes = None
+
+        self.seed(seed)
+
+    def seed(self, seed):
+        """Restarts the sensor noise from a seed.
+
+        :param seed: The seed
+        """
+        self._rng = np.random.default_rng(seed)
+
+    def set_pressures(self, value):
+        """Sets all volumes to the same pressure.
+
+        :param value: The pressure
+        """
+        self.pressures.fill(value)
+
+    def system_pressure(self):
+        return float(self.pressures[self._system])
+
+    def _decompose(self, key):
+        """Works out the modes of the network for a setting of the valves and supply pressure. With
+        V the diagonal matrix of the volumes and A the flows between the volumes, V^-1/2 A V^-1/2 is
+        symmetric, so it has real eigenvalues (the decay rates of the modes) and orthogonal
+        eigenvectors.
+        """
+        is_open = np.array(key[0] + key[1:3], dtype=bool)
+        is_open = np.concatenate((is_open[:-2], self._always_open, is_open[-2:]))
+        incidence = self._incidence[is_open]
+        laplacian = (incidence.T * self._conductances[is_open]) @ incidence
+
+        count = len(self.pressures)
+        self._reservoirs[0] = key[3]
+        self._inflow = -laplacian[:count, count:] @ self._reservoirs
+
+        scale = 1.0 / np.sqrt(self._volumes)
+        self._rates, eigenvectors = np.linalg.eigh(
+            scale[:, np.newaxis] * laplacian[:count, :count] * scale
+        )
+        self._to_modes = eigenvectors.T * scale
+        self._from_modes = scale[:, np.newaxis] * eigenvectors
+        self._step_key = key
+
+    def step(self, dt, buffer_valves_open, cell_valve_open, vacuum_valve_open, supply_pressure):
+        """Advances all pressures by a time step with the given valves open.
+
+        :param dt: The time step in seconds
+        :param buffer_valves_open: Whether the valve of each buffer is open, in buffer order
+        :param cell_valve_open: Whether the cell valve is open
+        :param vacuum_valve_open: Whether the vacuum extract valve is open
+        :param supply_pressure: The pressure of the gas supplies
+        """
+        if dt <= 0:
+            return
+
+        key = (tuple(buffer_valves_open), cell_valve_open, vacuum_valve_open, supply_pressure)
+        if key != self._step_key:
+            self._decompose(key)
+
+        # Implicit step (V + dt * A) p' = V p + dt * inflow, solved in the modes of the network
+        modes = self._to_modes @ (self._volumes * self.pressures + dt * self._inflow)
+        self.pressures = self._from_modes @ (modes / (1.0 + dt * self._rates))
+
+    def readings(self):
+        """:return: The readings of the pressure sensors on the system, with noise"""
+        noise = self._rng.normal(0.0, self.SENSOR_NOISE, self._sensor_count)
+        return np.maximum(self.system_pressure() + noise, 0.0)
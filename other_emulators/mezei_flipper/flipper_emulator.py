@@ -76,6 +76,21 @@ if __name__ == "__main__":
         description="Test an IOC under emulation by running tests against it"
     )
     parser.add_argument("-p", "--port", type=int, help="The TCP port to run the server on.")
+    parser.add_argument(
+        "--threaded",
+        action="store_true",
+        help="Handle each client in its own thread rather than all of them in one thread.",
+    )
+    parser.add_argument(
+        "--max-clients", type=int, default=64, help="Most clients connected at once."
+    )
+    parser.add_argument(
+        "-s",
+        "--stats-interval",
+        type=float,
+        default=None,
+        help="Seconds between printing connection counts and command latencies.",
+    )
     arguments = parser.parse_args()
 
     parent = _Parent()
@@ -96,4 +111,9 @@ if __name__ == "__main__":
 
     server = SignalServer("localhost", arguments.port, parent)
 
-    server.listen()
+    if arguments.threaded:
+        server.listen()
+    else:
+        server.listen_nonblocking(
+            max_clients=arguments.max_clients, stats_interval=arguments.stats_interval
+        )
@@ -1,4 +1,5 @@
 import re
+import selectors
 import socket
 import sys
 import threading
@@ -49,11 +50,67 @@ class SignalServer(object):
     dt_a = QtCore.pyqtSignal(float)
     dt_p = QtCore.pyqtSignal(float)
 
+    # Keywords of the commands setting or querying a number, the signal emitted when setting it
+    # and the attribute of the parent holding its current value, in the order they are matched.
+    value_commands = (
+        ("comp_p", "comp_p", "comp_spin_P"),
+        ("comp_a", "comp_a", "comp_spin_A"),
+        ("amp_p", "amp_p", "amplitude_spin_P"),
+        ("amp_a", "amp_a", "amplitude_spin_A"),
+        ("const_p", "const_p", "decay_spin_P"),
+        ("const_a", "const_a", "decay_spin_A"),
+        ("dt_p", "dt_p", "DeltaT_P"),
+        ("dt_a", "dt_a", "DeltaT_A"),
+    )
+
+    # Keywords of the commands setting or querying a file name, as above.
+    file_commands = (
+        ("file_p", "fn_p", "filename_P"),
+        ("file_a", "fn_a", "filename_A"),
+    )
+
     def __init__(self, host, port, parent=None):
         super(SignalServer, self).__init__()
         self.host = host  # : Hostname on which to listen
         self.port = port  # : Port on which to listen
         self.parent = parent  # Need a hook to the main class to retrieve settings
+        self._statistics_lock = threading.Lock()
+        self.reset_statistics()
+
+    def reset_statistics(self):
+        """Zero the connection counts and command latencies reported by statistics()."""
+        with self._statistics_lock:
+            self.connections = {"open": 0, "accepted": 0, "refused": 0, "dropped": 0}
+            self._latencies = {}
+
+    def _record_latency(self, keyword, latency):
+        with self._statistics_lock:
+            count, total, longest = self._latencies.get(keyword, (0, 0.0, 0.0))
+            self._latencies[keyword] = (count + 1, total + latency, max(longest, latency))
+
+    def _count_connection(self, event, change=1):
+        with self._statistics_lock:
+            self.connections[event] += change
+
+    def statistics(self):
+        """Connection counts and the latency of each command handled since the last reset.
+
+        Returns:
+            dict: "connections" holds the number of open, accepted, refused and dropped
+            connections, "commands" the count, mean and max latency in ms for each keyword.
+        """
+        with self._statistics_lock:
+            return {
+                "connections": dict(self.connections),
+                "commands": {
+                    keyword: {
+                        "count": count,
+                        "mean_ms": 1000 * total / count,
+                        "max_ms": 1000 * longest,
+                    }
+                    for keyword, (count, total, longest) in self._latencies.items()
+                },
+            }
 
     def listen(self):
         """Listen for incoming connection requests.
@@ -73,9 +130,119 @@ class SignalServer(object):
         while True:
             client, addr = sock.accept()
             client.settimeout(60)
+            self._count_connection("accepted")
+            self._count_connection("open")
             thread = threading.Thread(target=self.listenToClient, args=(client, addr))
             thread.start()
 
+    def listen_nonblocking(
+        self, max_clients=64, max_buffer=65536, idle_timeout=60, stats_interval=None
+    ):
+        """Serve any number of clients from the calling thread until it is interrupted.
+
+        Unlike listen(), no thread is started per client: all connections are non-blocking and
+        handled by one selector loop, so reconnect storms from the IOC do not pile up threads.
+        Messages are handled exactly as by listenToClient().
+
+        Args:
+            max_clients (int): Connections beyond this many are refused.
+            max_buffer (int): A client whose unsent replies exceed this many bytes is dropped.
+            idle_timeout (float): A client that sends nothing for this many seconds is dropped.
+            stats_interval (float): Seconds between printing statistics(), None not to print.
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(max(5, max_clients))
+        sock.setblocking(False)
+
+        selector = selectors.DefaultSelector()
+        selector.register(sock, selectors.EVENT_READ)
+        clients = {}  # client socket -> [unsent replies, time of last message]
+
+        def close(client, event=None):
+            selector.unregister(client)
+            client.close()
+            del clients[client]
+            self._count_connection("open", -1)
+            if event is not None:
+                self._count_connection(event)
+
+        def send(client, reply):
+            clients[client][0] += reply
+
+        last_report = time()
+        try:
+            while True:
+                timeout = idle_timeout
+                if stats_interval is not None:
+                    timeout = min(timeout, max(0.0, last_report + stats_interval - time()))
+
+                for key, mask in selector.select(timeout):
+                    if key.fileobj is sock:
+                        try:
+                            client, addr = sock.accept()
+                        except BlockingIOError:
+                            continue
+                        if len(clients) >= max_clients:
+                            client.close()
+                            self._count_connection("refused")
+                            continue
+                        client.setblocking(False)
+                        clients[client] = [bytearray(), time()]
+                        selector.register(client, selectors.EVENT_READ)
+                        self._count_connection("accepted")
+                        self._count_connection("open")
+                        continue
+
+                    client = key.fileobj
+                    pending = clients[client][0]
+                    try:
+                        if mask & selectors.EVENT_READ:
+                            data = client.recv(1024)
+                            if not data:
+                                close(client)
+                                continue
+                            clients[client][1] = time()
+                            self.handle_message(data, lambda reply: send(client, reply))
+                        if pending:
+                            del pending[: client.send(pending)]
+                    except BlockingIOError:
+                        pass
+                    except Exception:
+                        import traceback
+
+                        traceback.print_exc()
+                        try:
+                            # Send what was replied before the failing command, as listen() does
+                            client.send(pending)
+                        except OSError:
+                            pass
+                        close(client)
+                        continue
+
+                    if len(pending) > max_buffer:
+                        close(client, "dropped")
+                        continue
+                    events = selectors.EVENT_READ
+                    if pending:
+                        events |= selectors.EVENT_WRITE
+                    if key.events != events:
+                        selector.modify(client, events)
+
+                now = time()
+                for client in [c for c, (_, last) in clients.items() if now - last > idle_timeout]:
+                    close(client, "dropped")
+
+                if stats_interval is not None and now - last_report >= stats_interval:
+                    print(self.statistics())
+                    last_report = now
+        finally:
+            for client in list(clients):
+                close(client)
+            selector.close()
+            sock.close()
+
     def listenToClient(self, client, addr):
         """Recieve message from accepted connection, parse, and close.
 
@@ -87,133 +254,74 @@ class SignalServer(object):
         while True:
             try:
                 data = client.recv(size)
-                if data and "*IDN?" in str(data):
-                    client.send(("Flipper Control" + ":").encode("utf-8"))
-                if data and "comp_p" in str(data):
-                    if "?" in str(data):
-                        client.send(
-                            ("comp_p " + str(self.parent.comp_spin_P.value()) + ":").encode("utf-8")
-                        )
-                    else:
-                        self.comp_p.emit(float(re.findall(r"[-+]?\d*\.\d+|\d+", str(data))[0]))
-                        client.send("comp_p:".encode("utf-8"))
-                if data and "comp_a" in str(data):
-                    if "?" in str(data):
-                        client.send(
-                            ("comp_a " + str(self.parent.comp_spin_A.value()) + ":").encode("utf-8")
-                        )
-                    else:
-                        self.comp_a.emit(float(re.findall(r"[-+]?\d*\.\d+|\d+", str(data))[0]))
-                        client.send("comp_a:".encode("utf-8"))
-                if data and "amp_p" in str(data):
-                    # print("Amplitude")
-                    if "?" in str(data):
-                        client.send(
-                            ("amp_p " + str(self.parent.amplitude_spin_P.value()) + ":").encode(
-                                "utf-8"
-                            )
-                        )
-                        # client.send("amp query received".encode('utf-8'))
-                    else:
-                        self.amp_p.emit(float(re.findall(r"[-+]?\d*\.\d+|\d+", str(data))[0]))
-                        client.send("amp_p:".encode("utf-8"))
-                if data and "amp_a" in str(data):
-                    # print("Amplitude")
-                    if "?" in str(data):
-                        client.send(
-                            ("amp_a " + str(self.parent.amplitude_spin_A.value()) + ":").encode(
-                                "utf-8"
-                            )
-                        )
-                        # client.send("amp query received".encode('utf-8'))
-                    else:
-                        self.amp_a.emit(float(re.findall(r"[-+]?\d*\.\d+|\d+", str(data))[0]))
-                        client.send("amp_a:".encode("utf-8"))
-                if data and "const_p" in str(data):
-                    if "?" in str(data):
-                        client.send(
-                            ("const_p " + str(self.parent.decay_spin_P.value()) + ":").encode(
-                                "utf-8"
-                            )
-                        )
-                    else:
-                        self.const_p.emit(float(re.findall(r"[-+]?\d*\.\d+|\d+", str(data))[0]))
-                        client.send("const_p:".encode("utf-8"))
-                if data and "const_a" in str(data):
-                    if "?" in str(data):
-                        client.send(
-                            ("const_a " + str(self.parent.decay_spin_A.value()) + ":").encode(
-                                "utf-8"
-                            )
-                        )
-                    else:
-                        self.const_a.emit(float(re.findall(r"[-+]?\d*\.\d+|\d+", str(data))[0]))
-                        client.send("const_a:".encode("utf-8"))
-                if data and "dt_p" in str(data):
-                    if "?" in str(data):
-                        client.send(
-                            ("dt_p " + str(self.parent.DeltaT_P.value()) + ":").encode("utf-8")
-                        )
-                    else:
-                        self.dt_p.emit(float(re.findall(r"[-+]?\d*\.\d+|\d+", str(data))[0]))
-                        client.send("dt_p:".encode("utf-8"))
-                if data and "dt_a" in str(data):
-                    if "?" in str(data):
-                        client.send(
-                            ("dt_a " + str(self.parent.DeltaT_A.value()) + ":").encode("utf-8")
-                        )
-                    else:
-                        self.dt_a.emit(float(re.findall(r"[-+]?\d*\.\d+|\d+", str(data))[0]))
-                        client.send("dt_a:".encode("utf-8"))
-                if data and "file_p" in str(data):
-                    if "?" in str(data):
-                        client.send(("file_p " + str(self.parent.filename_P) + ":").encode("utf-8"))
-                    else:
-                        data = str(data, "utf-8").replace(" ", "")
-                        self.fn_p.emit(data.replace("file_p", ""))
-                        client.send("file_p:".encode("utf-8"))
-                if data and "file_a" in str(data):
-                    if "?" in str(data):
-                        client.send(("file_a " + str(self.parent.filename_A) + ":").encode("utf-8"))
-                    else:
-                        data = str(data, "utf-8").replace(" ", "")
-                        self.fn_a.emit(data.replace("file_a", ""))
-                        client.send("file_a:".encode("utf-8"))
-                if data and "toggle" in str(data):
-                    if "?" in str(data):
-                        client.send(("toggle " + str(self.parent.running) + ":").encode("utf-8"))
-                    elif "0" in str(data):
-                        self.toggle.emit(0)
-                        client.send("toggle0:".encode("utf-8"))
-                    elif "1" in str(data):
-                        self.toggle.emit(1)
-                        client.send("toggle1:".encode("utf-8"))
-                    elif "2" in str(data):
-                        self.toggle.emit(2)
-                        client.send("toggle2:".encode("utf-8"))
-                    elif "3" in str(data):
-                        self.toggle.emit(3)
-                        client.send("toggle3:".encode("utf-8"))
-                    else:
-                        self.toggle.emit(-1)
-                        client.send("toggle:".encode("utf-8"))
-                if data and "exit" in str(data):
-                    raise Exception("Client disconnected")
-                # else:
-                #    client.send("?".encode('utf-8'))
-                #    return True
-                #    raise Exception('Client disconnected')
-                # client.shutdown(socket.SHUT_RDWR)
-                # client.close()
-                # return True
-            except BaseException:
+                self.handle_message(data, client.send)
+            except Exception:
                 # client.shutdown(socket.SHUT_RDWR)
                 import traceback
 
                 traceback.print_exc()
                 client.close()
+                self._count_connection("open", -1)
                 return False
 
+    def handle_message(self, data, send):
+        """Scan a received packet for commands, emit their signals and send the replies.
+
+        Args:
+            data (bytes): The packet received from the client.
+            send (callable): Called with each encoded reply.
+
+        Raises:
+            Exception: If the client asked to exit, or a command could not be parsed.
+        """
+        if not data:
+            return
+        if "*IDN?" in str(data):
+            send(("Flipper Control" + ":").encode("utf-8"))
+
+        for keyword, signal, value in self.value_commands:
+            if keyword in str(data):
+                start = time()
+                if "?" in str(data):
+                    reply = keyword + " " + str(getattr(self.parent, value).value()) + ":"
+                else:
+                    getattr(self, signal).emit(
+                        float(re.findall(r"[-+]?\d*\.\d+|\d+", str(data))[0])
+                    )
+                    reply = keyword + ":"
+                send(reply.encode("utf-8"))
+                self._record_latency(keyword, time() - start)
+
+        for keyword, signal, value in self.file_commands:
+            if data and keyword in str(data):
+                start = time()
+                if "?" in str(data):
+                    reply = keyword + " " + str(getattr(self.parent, value)) + ":"
+                else:
+                    data = str(data, "utf-8").replace(" ", "")
+                    getattr(self, signal).emit(data.replace(keyword, ""))
+                    reply = keyword + ":"
+                send(reply.encode("utf-8"))
+                self._record_latency(keyword, time() - start)
+
+        if data and "toggle" in str(data):
+            start = time()
+            if "?" in str(data):
+                reply = "toggle " + str(self.parent.running) + ":"
+            else:
+                state = next((s for s in (0, 1, 2, 3) if str(s) in str(data)), None)
+                if state is None:
+                    self.toggle.emit(-1)
+                    reply = "toggle:"
+                else:
+                    self.toggle.emit(state)
+                    reply = "toggle{}:".format(state)
+            send(reply.encode("utf-8"))
+            self._record_latency("toggle", time() - start)
+
+        if data and "exit" in str(data):
+            raise Exception("Client disconnected")
+
 
 class Flippr:
     """Main window implementation